@@ -0,0 +1,560 @@
+"""
+2계층 결과 캐시 데코레이터
+프로세스 내 LRU(TTL)와 공유 Redis 계층을 함께 사용하고, 만료가 가까운 키는 확률적으로 미리 갱신하며
+키별 잠금으로 같은 키의 재계산을 한 번만 수행 (캐시 스탬피드 방지)
+
+사용법:
+    from common.cache import cached, args_key_builder
+
+    @cached(ttl=300, namespace="crawler:ranking")
+    async def get_ranking(category: str) -> dict: ...
+
+    @cached(ttl=60, key_builder=args_key_builder("user_id"), redis_enabled=False)
+    def load_profile(self, user_id: int) -> dict: ...
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 사용
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성: serializer="msgpack" 사용 시 필요
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cache"
+
+# 캐시 항목: (값, 만료 시각(epoch 초), 계산 소요 시간(초))
+Entry = Tuple[Any, float, float]
+KeyBuilder = Callable[[Callable, tuple, dict], str]
+
+
+def default_key_builder(func: Callable, args: tuple, kwargs: dict) -> str:
+    """모든 인자의 repr 해시 (인자의 repr이 값을 나타내는 경우에 사용)"""
+    raw = repr((args, sorted(kwargs.items())))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def args_key_builder(*names: str) -> KeyBuilder:
+    """
+    지정한 파라미터 값으로만 키 생성 (self, 세션, 클라이언트 같은 인자 제외)
+
+    Args:
+        names: 키에 포함할 파라미터 이름
+    """
+
+    def build(func: Callable, args: tuple, kwargs: dict) -> str:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        raw = repr([(name, bound.arguments.get(name)) for name in names])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    return build
+
+
+def _serializer(name: str) -> Tuple[Callable[[Entry], bytes], Callable[[bytes], Entry]]:
+    """직렬화 방식별 (dumps, loads)"""
+    if name == "msgpack":
+        if msgpack is None:
+            raise ImportError("serializer='msgpack'를 사용하려면 msgpack 패키지가 필요합니다.")
+        return (
+            lambda entry: msgpack.packb(list(entry), use_bin_type=True),
+            lambda raw: tuple(msgpack.unpackb(raw, raw=False))
+        )
+    if name != "orjson":
+        raise ValueError(f"알 수 없는 직렬화 방식입니다: {name} (orjson | msgpack)")
+    if orjson is not None:
+        return (lambda entry: orjson.dumps(list(entry)), lambda raw: tuple(orjson.loads(raw)))
+    return (
+        lambda entry: json.dumps(list(entry), ensure_ascii=False).encode("utf-8"),
+        lambda raw: tuple(json.loads(raw))
+    )
+
+
+class _LocalTTLCache:
+    """프로세스 내 LRU + TTL 캐시 (스레드 안전)"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._items: "OrderedDict[str, Tuple[Entry, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, now: float) -> Optional[Entry]:
+        """유효한 항목 반환 (로컬 TTL 또는 항목 만료 시각이 지났으면 삭제 후 None)"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            entry, local_expires = item
+            if now >= local_expires or now >= entry[1]:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Entry, now: float) -> None:
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = (entry, min(entry[1], now + self._ttl))
+            self._items.move_to_end(key)
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class _KeyLocks:
+    """키별 잠금 (사용 중인 키만 보관하도록 참조 수로 정리)"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._locks: Dict[str, Any] = {}
+        self._counts: Dict[str, int] = {}
+        self._guard = threading.Lock()
+
+    def acquire_ref(self, key: str):
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = self._factory()
+            self._counts[key] = self._counts.get(key, 0) + 1
+            return lock
+
+    def release_ref(self, key: str) -> None:
+        with self._guard:
+            count = self._counts.get(key, 0) - 1
+            if count > 0:
+                self._counts[key] = count
+            else:
+                self._counts.pop(key, None)
+                self._locks.pop(key, None)
+
+
+class TwoTierCache:
+    """
+    함수 결과 2계층 캐시 (cached 데코레이터가 함수마다 하나 생성)
+
+    조회 순서는 로컬 LRU -> Redis이며, Redis에서 찾은 값은 로컬에도 저장합니다.
+    유효한 항목이라도 XFetch 방식으로 만료가 가까울수록(계산이 오래 걸릴수록) 높은 확률로
+    미리 재계산하고, 그동안 다른 요청은 기존 값을 그대로 받습니다.
+    재계산은 프로세스 내 키별 잠금과 Redis 잠금(SET NX)으로 키마다 한 번만 실행하며,
+    값이 없어 잠금을 기다리는 요청은 lock_timeout 동안 다른 프로세스의 결과를 기다립니다.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        ttl: float,
+        local_ttl: Optional[float],
+        maxsize: int,
+        key_builder: KeyBuilder,
+        namespace: Optional[str],
+        serializer: str,
+        redis_enabled: bool,
+        early_refresh_beta: float,
+        lock_timeout: float
+    ):
+        self._func = func
+        self._ttl = ttl
+        self._key_builder = key_builder
+        self._namespace = namespace or f"{func.__module__}.{func.__qualname__}"
+        self._dumps, self._loads = _serializer(serializer)
+        self._redis_enabled = redis_enabled
+        self._beta = early_refresh_beta
+        self._lock_timeout = lock_timeout
+        self._local = _LocalTTLCache(maxsize, local_ttl if local_ttl is not None else ttl)
+        self._is_async = inspect.iscoroutinefunction(func)
+        self._locks = _KeyLocks(asyncio.Lock if self._is_async else threading.Lock)
+        self._redis = None
+
+        # 통계 (여러 스레드에서 갱신하므로 _stats_lock 안에서만 변경)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "early_refreshes": 0,
+            "stale_served": 0,
+            "remote_waits": 0,
+            "redis_errors": 0
+        }
+
+    def make_key(self, args: tuple, kwargs: dict) -> str:
+        """캐시 키 (접두사 + 네임스페이스 + 키 생성기 결과)"""
+        return f"{KEY_PREFIX}:{self._namespace}:{self._key_builder(self._func, args, kwargs)}"
+
+    def _should_refresh(self, entry: Entry, now: float) -> bool:
+        """XFetch 조기 갱신 판단: now - delta * beta * ln(rand) >= expiry"""
+        if self._beta <= 0:
+            return False
+        return now - entry[2] * self._beta * math.log(random.random() or 1e-12) >= entry[1]
+
+    def _new_entry(self, value: Any, delta: float) -> Entry:
+        return (value, time.time() + self._ttl, delta)
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _redis_failed(self, action: str, error: Exception) -> None:
+        self._count("redis_errors")
+        logger.warning(f"캐시 Redis {action} 실패 ({self._namespace}): {str(error)}")
+
+    # ---- 동기 함수 ----
+
+    def _sync_client(self):
+        if not self._redis_enabled:
+            return None
+        if self._redis is None:
+            try:
+                from .redis_client import get_sync_redis
+                self._redis = get_sync_redis(decode_responses=False)
+            except Exception as e:
+                self._redis_failed("클라이언트 생성", e)
+                self._redis_enabled = False
+                return None
+        return self._redis
+
+    def _sync_redis_get(self, key: str) -> Optional[Entry]:
+        client = self._sync_client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(key)
+            return self._loads(raw) if raw is not None else None
+        except Exception as e:
+            self._redis_failed("조회", e)
+            return None
+
+    def _sync_redis_set(self, key: str, entry: Entry) -> None:
+        client = self._sync_client()
+        if client is None:
+            return
+        try:
+            client.set(key, self._dumps(entry), px=max(1, int((entry[1] - time.time()) * 1000)))
+        except Exception as e:
+            self._redis_failed("저장", e)
+
+    def _sync_lookup(self, key: str) -> Optional[Entry]:
+        now = time.time()
+        entry = self._local.get(key, now)
+        if entry is not None:
+            self._count("local_hits")
+            return entry
+        entry = self._sync_redis_get(key)
+        if entry is not None and entry[1] > now:
+            self._count("redis_hits")
+            self._local.set(key, entry, now)
+            return entry
+        return None
+
+    def call_sync(self, args: tuple, kwargs: dict) -> Any:
+        key = self.make_key(args, kwargs)
+        entry = self._sync_lookup(key)
+        if entry is not None and not self._should_refresh(entry, time.time()):
+            return entry[0]
+
+        lock = self._locks.acquire_ref(key)
+        try:
+            if entry is not None:
+                # 조기 갱신: 다른 스레드가 이미 갱신 중이면 기존 값 반환
+                if not lock.acquire(blocking=False):
+                    self._count("stale_served")
+                    return entry[0]
+                self._count("early_refreshes")
+            else:
+                lock.acquire()
+                # 잠금을 기다리는 동안 다른 스레드가 계산했으면 그 결과 사용
+                entry = self._sync_lookup(key)
+                if entry is not None:
+                    lock.release()
+                    return entry[0]
+                self._count("misses")
+            try:
+                return self._sync_compute(key, args, kwargs, entry)
+            finally:
+                lock.release()
+        finally:
+            self._locks.release_ref(key)
+
+    def _sync_compute(self, key: str, args: tuple, kwargs: dict, stale: Optional[Entry]) -> Any:
+        """Redis 잠금을 얻어 재계산 (다른 프로세스가 계산 중이면 기존 값 또는 그 결과 사용)"""
+        client = self._sync_client()
+        token = uuid.uuid4().hex
+        locked = True
+        if client is not None:
+            try:
+                locked = bool(client.set(f"{key}:lock", token, nx=True, px=int(self._lock_timeout * 1000)))
+            except Exception as e:
+                self._redis_failed("잠금", e)
+        if not locked:
+            if stale is not None:
+                self._count("stale_served")
+                return stale[0]
+            self._count("remote_waits")
+            deadline = time.monotonic() + self._lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                entry = self._sync_redis_get(key)
+                if entry is not None:
+                    self._local.set(key, entry, time.time())
+                    return entry[0]
+
+        try:
+            started = time.perf_counter()
+            value = self._func(*args, **kwargs)
+            entry = self._new_entry(value, time.perf_counter() - started)
+            self._local.set(key, entry, time.time())
+            self._sync_redis_set(key, entry)
+            return value
+        finally:
+            if client is not None and locked:
+                try:
+                    from .redis_client import compare_and_delete_sync
+                    compare_and_delete_sync(f"{key}:lock", token, client)
+                except Exception as e:
+                    self._redis_failed("잠금 해제", e)
+
+    # ---- 비동기 함수 ----
+
+    def _async_client(self):
+        if not self._redis_enabled:
+            return None
+        if self._redis is None:
+            try:
+                from .redis_client import get_async_redis
+                self._redis = get_async_redis(decode_responses=False)
+            except Exception as e:
+                self._redis_failed("클라이언트 생성", e)
+                self._redis_enabled = False
+                return None
+        return self._redis
+
+    async def _async_redis_get(self, key: str) -> Optional[Entry]:
+        client = self._async_client()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(key)
+            return self._loads(raw) if raw is not None else None
+        except Exception as e:
+            self._redis_failed("조회", e)
+            return None
+
+    async def _async_redis_set(self, key: str, entry: Entry) -> None:
+        client = self._async_client()
+        if client is None:
+            return
+        try:
+            await client.set(key, self._dumps(entry), px=max(1, int((entry[1] - time.time()) * 1000)))
+        except Exception as e:
+            self._redis_failed("저장", e)
+
+    async def _async_lookup(self, key: str) -> Optional[Entry]:
+        now = time.time()
+        entry = self._local.get(key, now)
+        if entry is not None:
+            self._count("local_hits")
+            return entry
+        entry = await self._async_redis_get(key)
+        if entry is not None and entry[1] > now:
+            self._count("redis_hits")
+            self._local.set(key, entry, now)
+            return entry
+        return None
+
+    async def call_async(self, args: tuple, kwargs: dict) -> Any:
+        key = self.make_key(args, kwargs)
+        entry = await self._async_lookup(key)
+        if entry is not None and not self._should_refresh(entry, time.time()):
+            return entry[0]
+
+        lock = self._locks.acquire_ref(key)
+        try:
+            if entry is not None and lock.locked():
+                # 조기 갱신: 다른 작업이 이미 갱신 중이면 기존 값 반환
+                self._count("stale_served")
+                return entry[0]
+            async with lock:
+                if entry is None:
+                    # 잠금을 기다리는 동안 다른 작업이 계산했으면 그 결과 사용
+                    entry = await self._async_lookup(key)
+                    if entry is not None:
+                        return entry[0]
+                    self._count("misses")
+                else:
+                    self._count("early_refreshes")
+                return await self._async_compute(key, args, kwargs, entry)
+        finally:
+            self._locks.release_ref(key)
+
+    async def _async_compute(self, key: str, args: tuple, kwargs: dict, stale: Optional[Entry]) -> Any:
+        """Redis 잠금을 얻어 재계산 (다른 프로세스가 계산 중이면 기존 값 또는 그 결과 사용)"""
+        client = self._async_client()
+        token = uuid.uuid4().hex
+        locked = True
+        if client is not None:
+            try:
+                locked = bool(await client.set(f"{key}:lock", token, nx=True, px=int(self._lock_timeout * 1000)))
+            except Exception as e:
+                self._redis_failed("잠금", e)
+        if not locked:
+            if stale is not None:
+                self._count("stale_served")
+                return stale[0]
+            self._count("remote_waits")
+            deadline = time.monotonic() + self._lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                entry = await self._async_redis_get(key)
+                if entry is not None:
+                    self._local.set(key, entry, time.time())
+                    return entry[0]
+
+        try:
+            started = time.perf_counter()
+            value = await self._func(*args, **kwargs)
+            entry = self._new_entry(value, time.perf_counter() - started)
+            self._local.set(key, entry, time.time())
+            await self._async_redis_set(key, entry)
+            return value
+        finally:
+            if client is not None and locked:
+                try:
+                    from .redis_client import compare_and_delete
+                    await compare_and_delete(f"{key}:lock", token, client)
+                except Exception as e:
+                    self._redis_failed("잠금 해제", e)
+
+    # ---- 관리 ----
+
+    def invalidate_local(self, args: tuple, kwargs: dict) -> str:
+        """로컬 항목 삭제 후 키 반환"""
+        key = self.make_key(args, kwargs)
+        self._local.delete(key)
+        return key
+
+    def invalidate_sync(self, args: tuple, kwargs: dict) -> None:
+        """로컬/Redis 항목 삭제 (Redis 오류는 redis_errors로 집계하고 무시)"""
+        key = self.invalidate_local(args, kwargs)
+        client = self._sync_client()
+        if client is None:
+            return
+        try:
+            client.delete(key)
+        except Exception as e:
+            self._redis_failed("삭제", e)
+
+    async def invalidate_async(self, args: tuple, kwargs: dict) -> None:
+        """invalidate_sync의 비동기 버전"""
+        key = self.invalidate_local(args, kwargs)
+        client = self._async_client()
+        if client is None:
+            return
+        try:
+            await client.delete(key)
+        except Exception as e:
+            self._redis_failed("삭제", e)
+
+    def get_stats(self) -> Dict:
+        """
+        캐시 통계 조회
+
+        Returns:
+            계층별 적중 수, 미스/조기 갱신/기존 값 반환 수, 적중률, 로컬 항목 수
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        hits = stats["local_hits"] + stats["redis_hits"]
+        total = hits + stats["misses"]
+        stats.update(
+            namespace=self._namespace,
+            local_entries=len(self._local),
+            hit_rate=round(hits / total, 4) if total else 0.0
+        )
+        return stats
+
+
+def cached(
+    ttl: float = 300,
+    local_ttl: Optional[float] = None,
+    maxsize: int = 1024,
+    key_builder: KeyBuilder = default_key_builder,
+    namespace: Optional[str] = None,
+    serializer: str = "orjson",
+    redis_enabled: bool = True,
+    early_refresh_beta: float = 1.0,
+    lock_timeout: float = 10.0
+) -> Callable[[Callable], Callable]:
+    """
+    동기/비동기 함수 결과 캐시 데코레이터
+
+    Args:
+        ttl: 항목 유효 시간 (초, Redis 만료 시간)
+        local_ttl: 로컬 LRU 항목 유효 시간 (초, None이면 ttl과 같음, 짧게 두면 다른 프로세스의 갱신을 빨리 반영)
+        maxsize: 로컬 LRU 최대 항목 수 (0이면 로컬 계층 사용 안 함)
+        key_builder: (func, args, kwargs) -> 키 문자열 (기본: 전체 인자 repr 해시)
+        namespace: 키 네임스페이스 (기본: 모듈.함수 이름)
+        serializer: Redis 저장 직렬화 방식 ("orjson" | "msgpack", orjson이 없으면 표준 json)
+        redis_enabled: 공유 Redis 계층 사용 여부 (common.redis_client 설정 사용)
+        early_refresh_beta: 조기 갱신 강도 (클수록 일찍 갱신, 0이면 만료 후에만 재계산)
+        lock_timeout: 재계산 잠금 유지/대기 최대 시간 (초)
+
+    Returns:
+        데코레이터 (감싼 함수에 cache_stats(), cache_invalidate(*args, **kwargs) 추가)
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache = TwoTierCache(
+            func, ttl, local_ttl, maxsize, key_builder, namespace,
+            serializer, redis_enabled, early_refresh_beta, lock_timeout
+        )
+
+        if cache._is_async:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                return await cache.call_async(args, kwargs)
+
+            async def invalidate(*args, **kwargs) -> None:
+                await cache.invalidate_async(args, kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                return cache.call_sync(args, kwargs)
+
+            def invalidate(*args, **kwargs) -> None:
+                cache.invalidate_sync(args, kwargs)
+
+        wrapper.cache_stats = cache.get_stats
+        wrapper.cache_invalidate = invalidate
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
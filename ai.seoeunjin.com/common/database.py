@@ -2,13 +2,23 @@
 AI 서비스용 데이터베이스 연결 설정
 Railway PostgreSQL 연동
 """
+import asyncio
+import logging
 import os
-from sqlalchemy import create_engine, MetaData
+import threading
+import time
+from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 import redis
-from typing import Generator
+from typing import AsyncGenerator, Dict, Generator, Optional
+
+from .db_metrics import instrument_engine
+
+logger = logging.getLogger(__name__)
 
 # 환경 변수에서 데이터베이스 설정 읽기
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -19,33 +29,124 @@ DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 REDIS_URL = os.getenv("REDIS_URL")
 
-# PostgreSQL 연결 엔진 생성
-if DATABASE_URL:
-    # Railway에서 제공하는 DATABASE_URL 사용
-    engine = create_engine(
-        DATABASE_URL,
-        poolclass=QueuePool,
-        pool_size=5,
-        max_overflow=10,
-        pool_pre_ping=True,
-        pool_recycle=300,
-        echo=True  # SQL 쿼리 로깅
-    )
-else:
-    # 개별 환경 변수로 연결 문자열 구성
-    database_url = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    engine = create_engine(
-        database_url,
-        poolclass=QueuePool,
-        pool_size=5,
-        max_overflow=10,
-        pool_pre_ping=True,
-        pool_recycle=300,
-        echo=True
-    )
-
-# 세션 팩토리 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 쿼리 로깅 설정 (전체 SQL 로깅 대신 느린 쿼리와 일부 샘플만 기록)
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"  # 전체 SQL 로깅 (개발용)
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))  # 느린 쿼리 기준 (ms)
+DB_QUERY_SAMPLE_RATE = float(os.getenv("DB_QUERY_SAMPLE_RATE", "0"))  # 느리지 않은 쿼리 중 로깅할 비율 (0~1)
+
+# 연결 풀/시작 설정 (모듈 import 시에는 네트워크 연결을 만들지 않음)
+DB_POOL_SIZE = 5
+DB_MAX_OVERFLOW = 10
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", "5"))  # init_database에서 미리 열어둘 연결 수
+HEALTH_CHECK_TTL = float(os.getenv("HEALTH_CHECK_TTL", "10"))  # 상태 확인 결과 재사용 시간 (초)
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "3"))  # 상태 확인 타임아웃 (초)
+REDIS_SSL_ENABLED = os.getenv("REDIS_SSL_ENABLED", "true").lower() == "true"
+
+
+def to_async_url(url: str) -> str:
+    """
+    동기 PostgreSQL 연결 문자열을 asyncpg 드라이버용으로 변환
+    (asyncpg는 sslmode 대신 ssl 쿼리 파라미터 사용)
+    """
+    parsed = make_url(url.replace("postgres://", "postgresql://", 1))
+    query = dict(parsed.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return parsed.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+
+def database_url() -> str:
+    """PostgreSQL 연결 문자열 (Railway DATABASE_URL 우선, 없으면 개별 환경 변수로 구성)"""
+    if DATABASE_URL:
+        return DATABASE_URL
+    return f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# 엔진/세션 팩토리/Redis 클라이언트는 처음 사용할 때(또는 init_database에서) 생성
+_engine = None
+_session_factory = None
+_async_engine = None
+_async_session_factory = None
+_redis_client = None
+_redis_checked = False
+_init_lock = threading.Lock()
+
+# 상태 확인 결과 캐시
+_health: Optional[Dict] = None
+_health_checked_at = 0.0
+_health_lock: Optional[asyncio.Lock] = None
+
+def get_engine():
+    """
+    PostgreSQL 동기 엔진 반환 (최초 호출 시 생성)
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        with _init_lock:
+            if _engine is None:
+                engine = create_engine(
+                    database_url(),
+                    poolclass=QueuePool,
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_MAX_OVERFLOW,
+                    pool_pre_ping=True,
+                    pool_recycle=300,
+                    echo=DB_ECHO
+                )
+                # 쿼리 지연 시간 계측 (느린 쿼리 로깅 및 /metrics/db 통계)
+                instrument_engine(engine, slow_query_ms=DB_SLOW_QUERY_MS, sample_rate=DB_QUERY_SAMPLE_RATE)
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+def get_session_factory():
+    """
+    동기 세션 팩토리 반환
+    """
+    get_engine()
+    return _session_factory
+
+def get_async_engine():
+    """
+    비동기 PostgreSQL 엔진 반환 (asyncpg, async def 핸들러에서 이벤트 루프를 막지 않음)
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        with _init_lock:
+            if _async_engine is None:
+                engine = create_async_engine(
+                    to_async_url(database_url()),
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_MAX_OVERFLOW,
+                    pool_pre_ping=True,
+                    pool_recycle=300,
+                    echo=DB_ECHO
+                )
+                instrument_engine(engine.sync_engine, slow_query_ms=DB_SLOW_QUERY_MS, sample_rate=DB_QUERY_SAMPLE_RATE)
+                # 커밋 후에도 응답 직렬화에서 속성 접근이 가능하도록 만료하지 않음
+                _async_session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+                _async_engine = engine
+    return _async_engine
+
+def get_async_session_factory():
+    """
+    비동기 세션 팩토리 반환
+    """
+    get_async_engine()
+    return _async_session_factory
+
+# 기존 모듈 속성(engine, SessionLocal 등) 접근도 지연 생성으로 연결
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "SessionLocal": get_session_factory,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": get_async_session_factory,
+    "redis_client": lambda: get_redis(),
+}
+
+def __getattr__(name: str):
+    """engine, SessionLocal, async_engine, AsyncSessionLocal, redis_client 모듈 속성 지연 생성"""
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Base 클래스 생성
 Base = declarative_base()
@@ -53,59 +154,171 @@ Base = declarative_base()
 # 메타데이터 설정
 metadata = MetaData()
 
-# Upstash Redis 연결 (TLS 필수)
-redis_client = None
-REDIS_SSL_ENABLED = os.getenv("REDIS_SSL_ENABLED", "true").lower() == "true"
+def get_db() -> Generator:
+    """
+    데이터베이스 세션 의존성
+    FastAPI에서 Depends()로 사용
+    """
+    db = get_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    비동기 데이터베이스 세션 의존성
+    async def 엔드포인트에서 Depends()로 사용 (쿼리는 await session.execute(...))
+    """
+    async with get_async_session_factory()() as db:
+        yield db
+
+def get_redis():
+    """
+    Redis 클라이언트 반환 (최초 호출 시 생성, REDIS_URL이 없거나 생성 실패 시 None)
+    연결 확인은 init_database / check_health에서 수행
+    """
+    global _redis_client, _redis_checked
+    if not _redis_checked:
+        with _init_lock:
+            if not _redis_checked:
+                _redis_client = _create_redis_client()
+                _redis_checked = True
+    return _redis_client
 
-if REDIS_URL:
+def _create_redis_client():
+    """Upstash Redis 클라이언트 생성 (TLS 필수, 연결은 첫 명령 실행 시 생성)"""
+    if not REDIS_URL:
+        return None
     try:
         # Upstash Redis는 TLS가 필수이므로 ssl_cert_reqs 설정
         if REDIS_SSL_ENABLED:
             import ssl
-            redis_client = redis.from_url(
+            return redis.from_url(
                 REDIS_URL,
                 decode_responses=True,
                 ssl_cert_reqs=ssl.CERT_REQUIRED,
                 ssl=True
             )
-        else:
-            redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-        
-        # 연결 테스트
-        redis_client.ping()
-        print("Upstash Redis 연결 성공")
+        return redis.from_url(REDIS_URL, decode_responses=True)
     except Exception as e:
-        print(f"Upstash Redis 연결 실패: {e}")
-        redis_client = None
+        logger.error(f"Upstash Redis 클라이언트 생성 실패: {e}")
+        return None
 
-def get_db() -> Generator:
+async def _warmup_connection(opened: asyncio.Queue, hold: asyncio.Event) -> None:
+    """풀 연결 하나를 열고 다른 워밍업 연결이 모두 열릴 때까지 유지 (같은 연결 재사용 방지)"""
+    try:
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await opened.put(None)
+            await hold.wait()
+    except Exception as e:
+        await opened.put(e)
+
+async def init_database(warmup_connections: int = DB_WARMUP_CONNECTIONS, timeout: float = 10.0) -> Dict:
     """
-    데이터베이스 세션 의존성
-    FastAPI에서 Depends()로 사용
+    애플리케이션 시작 훅: 엔진 생성 후 풀 연결 N개를 병렬로 미리 열고 DB/Redis 상태 확인
+    실패해도 예외를 올리지 않고 상태만 기록 (서비스 기동을 막지 않음)
+    
+    Args:
+        warmup_connections: 미리 열어둘 비동기 풀 연결 수 (pool_size 이하)
+        timeout: 워밍업 전체 타임아웃 (초)
+        
+    Returns:
+        check_health와 같은 형식의 상태
     """
-    db = SessionLocal()
+    started = time.perf_counter()
+    count = max(0, min(warmup_connections, DB_POOL_SIZE))
+    if count:
+        opened: asyncio.Queue = asyncio.Queue()
+        hold = asyncio.Event()
+        tasks = [asyncio.create_task(_warmup_connection(opened, hold)) for _ in range(count)]
+        errors = []
+        try:
+            # 모든 연결이 SELECT 1을 마칠 때까지 유지한 뒤 함께 풀로 반환
+            for _ in range(count):
+                remaining = timeout - (time.perf_counter() - started)
+                result = await asyncio.wait_for(opened.get(), max(0.0, remaining))
+                if result is not None:
+                    errors.append(result)
+        except asyncio.TimeoutError:
+            logger.warning(f"데이터베이스 연결 워밍업 타임아웃 ({timeout}초)")
+        finally:
+            hold.set()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if errors:
+            logger.warning(f"데이터베이스 연결 워밍업 실패 {len(errors)}/{count}: {errors[0]}")
+        logger.info(f"데이터베이스 연결 워밍업 완료: {count - len(errors)}개, {time.perf_counter() - started:.3f}초")
+    return await check_health(max_age=0)
+
+async def _select_one() -> None:
+    async with get_async_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+async def _check_database() -> Dict:
+    """SELECT 1 응답 시간 확인 (연결 생성 포함 HEALTH_CHECK_TIMEOUT 제한)"""
+    started = time.perf_counter()
     try:
-        yield db
-    finally:
-        db.close()
+        await asyncio.wait_for(_select_one(), HEALTH_CHECK_TIMEOUT)
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+    except Exception as e:
+        return {"status": "error", "error": str(e) or type(e).__name__}
 
-def get_redis():
+async def _check_redis() -> Dict:
+    """Redis PING 응답 시간 확인 (동기 클라이언트는 스레드에서 실행)"""
+    client = get_redis()
+    if client is None:
+        return {"status": "disabled"}
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(asyncio.to_thread(client.ping), HEALTH_CHECK_TIMEOUT)
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+    except Exception as e:
+        return {"status": "error", "error": str(e) or type(e).__name__}
+
+async def check_health(max_age: float = HEALTH_CHECK_TTL) -> Dict:
+    """
+    데이터베이스/Redis 상태 확인 (max_age초 이내 결과는 캐시 재사용, 동시 요청은 한 번만 확인)
+    
+    Returns:
+        {"database": {...}, "redis": {...}, "checked_at": 확인 시각(epoch 초)}
+    """
+    global _health, _health_checked_at, _health_lock
+    if _health is not None and time.monotonic() - _health_checked_at < max_age:
+        return _health
+    if _health_lock is None:
+        _health_lock = asyncio.Lock()
+    async with _health_lock:
+        if _health is not None and time.monotonic() - _health_checked_at < max_age:
+            return _health
+        database, redis_status = await asyncio.gather(_check_database(), _check_redis())
+        _health = {"database": database, "redis": redis_status, "checked_at": time.time()}
+        _health_checked_at = time.monotonic()
+    return _health
+
+async def close_database() -> None:
     """
-    Redis 클라이언트 반환
+    애플리케이션 종료 훅: 연결 풀 정리
     """
-    return redis_client
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
 
 def create_tables():
     """
     테이블 생성
     """
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
 
 def drop_tables():
     """
     테이블 삭제 (개발용)
     """
-    Base.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=get_engine())
 
 # AI 서비스별 스키마 설정
 SCHEMAS = {
@@ -124,7 +337,7 @@ def create_schema_if_not_exists(schema_name: str):
     """
     스키마가 존재하지 않으면 생성
     """
-    with engine.connect() as conn:
+    with get_engine().connect() as conn:
         conn.execute(f"CREATE SCHEMA IF NOT EXISTS {schema_name}")
         conn.commit()
 
@@ -141,10 +354,11 @@ if __name__ == "__main__":
     # 테스트 실행
     print("데이터베이스 연결 테스트...")
     try:
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             result = conn.execute("SELECT version()")
             print(f"PostgreSQL 버전: {result.fetchone()[0]}")
         
+        redis_client = get_redis()
         if redis_client:
             redis_client.set("test", "connection_ok")
             test_value = redis_client.get("test")
@@ -0,0 +1,167 @@
+"""
+데이터베이스 쿼리 계측
+SQLAlchemy 이벤트로 쿼리 실행 시간을 측정하여 느린 쿼리와 일부 샘플만 로깅하고,
+정규화된 문장별 지연 시간 통계를 집계 (HTTP 노출은 common.db_metrics_router)
+"""
+import logging
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("common.database.query")
+
+# 문장 정규화 패턴 (리터럴 값을 ?로 치환하여 같은 형태의 쿼리를 하나로 집계)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_BIND = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+")
+_SPACE = re.compile(r"\s+")
+
+MAX_STATEMENT_LENGTH = 500
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    SQL 문장 정규화 (공백 정리, 리터럴/바인드 파라미터를 ?로 치환, IN 목록 축약)
+
+    Args:
+        statement: 드라이버에 전달되는 SQL 문장
+
+    Returns:
+        집계 키로 사용할 정규화 문장 (최대 MAX_STATEMENT_LENGTH자)
+    """
+    normalized = _STRING.sub("?", statement)
+    normalized = _BIND.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("(...)", normalized)
+    normalized = _SPACE.sub(" ", normalized).strip()
+    return normalized[:MAX_STATEMENT_LENGTH]
+
+
+def count_parameters(parameters, executemany: bool) -> int:
+    """바인드 파라미터 수 (executemany는 행 수 x 행별 파라미터 수)"""
+    if not parameters:
+        return 0
+    if executemany:
+        return sum(len(row) for row in parameters)
+    return len(parameters)
+
+
+class QueryStats:
+    """정규화 문장별 실행 횟수/총 시간/최대 시간/느린 쿼리 수 집계 (스레드 안전)"""
+
+    def __init__(self, max_statements: int = 1000):
+        """
+        Args:
+            max_statements: 집계할 최대 문장 종류 수 (초과 분은 "<other>"로 합산)
+        """
+        self._max_statements = max_statements
+        self._stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration_ms: float, slow: bool) -> None:
+        """쿼리 실행 1회 기록"""
+        with self._lock:
+            if statement not in self._stats and len(self._stats) >= self._max_statements:
+                statement = "<other>"
+            entry = self._stats.get(statement)
+            if entry is None:
+                entry = self._stats[statement] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "slow": 0}
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["slow"] += int(slow)
+
+    def reset(self) -> None:
+        """통계 초기화"""
+        with self._lock:
+            self._stats.clear()
+
+    def get_stats(self, top: Optional[int] = 20, order_by: str = "total_ms") -> Dict:
+        """
+        문장별 통계 조회
+
+        Args:
+            top: 반환할 문장 수 (None이면 전체)
+            order_by: 정렬 기준 (total_ms, count, max_ms, avg_ms, slow)
+
+        Returns:
+            전체 쿼리 수/시간과 정렬된 문장별 통계
+        """
+        with self._lock:
+            rows: List[Dict] = [
+                {
+                    "statement": statement,
+                    "count": entry["count"],
+                    "total_ms": round(entry["total_ms"], 2),
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 2),
+                    "max_ms": round(entry["max_ms"], 2),
+                    "slow": entry["slow"]
+                }
+                for statement, entry in self._stats.items()
+            ]
+        if order_by not in ("total_ms", "count", "max_ms", "avg_ms", "slow"):
+            order_by = "total_ms"
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return {
+            "queries": sum(row["count"] for row in rows),
+            "total_ms": round(sum(row["total_ms"] for row in rows), 2),
+            "slow_queries": sum(row["slow"] for row in rows),
+            "statements": rows[:top] if top else rows
+        }
+
+
+# 프로세스 내 모든 계측 엔진이 공유하는 통계
+query_stats = QueryStats()
+
+
+def instrument_engine(
+    engine: Engine,
+    slow_query_ms: float = 200.0,
+    sample_rate: float = 0.0,
+    stats: QueryStats = query_stats
+) -> None:
+    """
+    엔진에 쿼리 계측 이벤트 등록 (비동기 엔진은 async_engine.sync_engine 전달)
+
+    Args:
+        engine: 계측할 동기 엔진
+        slow_query_ms: 이 시간(ms) 이상 걸린 쿼리는 WARNING으로 로깅
+        sample_rate: 느리지 않은 쿼리 중 INFO로 로깅할 비율 (0~1)
+        stats: 문장별 통계 저장소
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        slow = duration_ms >= slow_query_ms
+        normalized = normalize_statement(statement)
+        stats.record(normalized, duration_ms, slow)
+
+        if slow:
+            logger.warning(
+                f"Slow query: {duration_ms:.1f}ms - {normalized} "
+                f"(params: {count_parameters(parameters, executemany)})"
+            )
+        elif sample_rate > 0 and random.random() < sample_rate:
+            logger.info(
+                f"Query: {duration_ms:.1f}ms - {normalized} "
+                f"(params: {count_parameters(parameters, executemany)})"
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # 실패한 쿼리는 after_cursor_execute가 호출되지 않으므로 시작 시각만 정리
+        started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+        if started:
+            started.pop()
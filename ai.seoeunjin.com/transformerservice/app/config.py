@@ -2,7 +2,7 @@
 Transformer Service 설정
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class TransformerServiceConfig(BaseSettings):
@@ -14,7 +14,78 @@ class TransformerServiceConfig(BaseSettings):
     
     # 모델 설정
     model_path: Optional[str] = None  # 로컬 모델 경로 (기본값: app/koelectra/koelectra_model)
+    default_model: str = "koelectra"  # 기본 모델 이름 (model_path 사용, 요청에 model이 없을 때 선택)
+    models: Dict[str, str] = {}  # 추가 모델 이름 -> 경로 (예: {"emotion": "/models/koelectra-emotion"}), ?model=이름으로 선택
+    model_memory_budget_mb: float = 2048  # 상주 모델 가중치 총량 한도 (초과 시 LRU 모델 언로드, 0 이하면 무제한)
+    admin_token: Optional[str] = None  # 관리 API(/koelectra/admin/*) 토큰 (X-Admin-Token 헤더 필요, 미설정 시 관리 API 비활성화)
+    model_swap_root: Optional[str] = None  # 모델 교체 시 허용할 모델 디렉토리 루트 (이 경로 아래 또는 model_path/models 경로만 허용)
+    model_version: Optional[str] = None  # 모델 버전 (기본값: 모델 파일 지문)
     use_gpu: bool = False  # GPU 사용 여부
+    weights_mmap: bool = False  # model.safetensors를 메모리 매핑으로 로드 (워커 간 가중치 페이지 공유)
+    backend: str = "pytorch"  # 추론 백엔드: "pytorch" | "onnxruntime"
+    onnx_model_file: str = "model.onnx"  # 모델 경로 내 ONNX 파일명 (export_onnx.py로 생성)
+    onnx_intra_op_threads: int = 0  # ONNX Runtime intra-op 스레드 수 (0이면 자동)
+    quantization: str = "none"  # 양자화 모드: "none" | "dynamic_int8" (CPU 전용, Linear 레이어 INT8)
+    execution_mode: str = "eager"  # PyTorch 실행 모드: "eager" | "torchscript" | "compile" (고정 형태 버킷 패딩)
+    compile_seq_buckets: List[int] = [32, 64, 128, 256, 512]  # torchscript/compile 시퀀스 길이 버킷
+    compile_cache_dir: Optional[str] = None  # 추적/컴파일 산출물 캐시 경로 (기본값: 모델 경로 내 compiled)
+    
+    # 시작 시 워밍업 설정 (완료 후 /koelectra/ready 200 응답)
+    warmup_enabled: bool = True  # 모델 로드 후 더미 추론 워밍업 여부
+    warmup_seq_lengths: List[int] = [16, 64, 128, 256]  # 워밍업할 시퀀스 길이
+    warmup_batch_size: int = 8  # 워밍업 배치 크기 (배치 크기 1과 함께 실행)
+    warmup_rounds: int = 2  # 길이/배치 조합별 반복 횟수
+    
+    # 추론 설정
+    batch_size: int = 32  # 배치 추론 시 한 번의 forward pass에 넣을 최대 텍스트 수
+    max_seq_length: int = 512  # 토크나이징 최대 시퀀스 길이 (초과분은 잘림)
+    length_bucketing: bool = True  # 배치 추론 시 토큰 길이순 버킷 패딩 사용 여부
+    
+    # CPU 자동 튜닝 설정 (python -m app.koelectra.koelectra_autotune)
+    autotune_mode: str = "off"  # "off" | "load" (저장된 결과만 적용) | "startup" (결과가 없으면 시작 시 측정)
+    autotune_file: Optional[str] = None  # 결과 파일 경로 (기본값: 모델 경로 내 autotune.json)
+    autotune_batch_sizes: List[int] = [8, 16, 32, 64]  # 시작 시 측정할 배치 크기 후보
+    autotune_samples: int = 256  # 시작 시 측정에 사용할 입력 텍스트 수
+    
+    # 긴 문서 슬라이딩 윈도우 설정 (/koelectra/sentiment/long)
+    long_doc_stride: int = 128  # 인접 윈도우 간 겹치는 토큰 수
+    long_doc_max_windows: int = 64  # 문서당 최대 윈도우 수 (초과분은 분석하지 않음)
+    
+    # 마이크로 배칭 설정 (/koelectra/sentiment 동시 요청 집계)
+    micro_batch_enabled: bool = True  # 단일 요청 마이크로 배칭 사용 여부
+    micro_batch_max_size: int = 32  # 한 번에 모을 최대 요청 수
+    micro_batch_max_wait_ms: float = 5.0  # 첫 요청 이후 추가 요청을 기다리는 최대 시간
+    micro_batch_max_pending: int = 256  # 배치 큐에서 대기할 수 있는 최대 요청 수
+    
+    # 캐스케이드 사전 분류기 설정 (python -m app.koelectra.koelectra_cascade로 학습)
+    cascade_enabled: bool = False  # 확신하는 입력은 해시 n-gram 선형 분류기로 바로 응답
+    cascade_file: str = "cascade.npz"  # 모델 경로 내 분류기 파일명
+    cascade_threshold: float = 0.95  # 캐스케이드가 직접 응답할 최소 신뢰도 (max(p, 1-p))
+    cascade_audit_rate: float = 0.05  # 캐스케이드 응답 중 KoELECTRA로도 추론하여 일치율을 측정할 비율
+    
+    # 동일 입력 합류 설정 (/koelectra/sentiment 진행 중인 같은 텍스트 추론 결과 공유)
+    coalesce_enabled: bool = True  # 진행 중인 동일 요청 합류 사용 여부 (배치 내 중복 제거는 항상 적용)
+
+    # 단일 모델 서버 설정 (python -m app.koelectra.koelectra_model_server)
+    model_server_socket: Optional[str] = None  # 설정 시 API 워커는 토크나이저만 로드하고 이 Unix 소켓의 모델 서버로 추론
+    model_server_timeout: float = 30.0  # 모델 서버 요청 타임아웃 (초)
+    model_server_max_batch_size: int = 64  # 모델 서버가 워커 요청을 모아 처리할 최대 시퀀스 수
+    model_server_max_wait_ms: float = 5.0  # 모델 서버가 배치를 모으기 위해 기다리는 최대 시간 (밀리초)
+
+    # 추론 실행기 설정 (이벤트 루프 밖에서 추론 실행)
+    inference_workers: int = 1  # 추론 전용 스레드 수
+    inference_queue_size: int = 64  # 실행을 기다릴 수 있는 최대 추론 작업 수
+    inference_retry_after: int = 1  # 대기열 초과 시 Retry-After 헤더 값 (초)
+    
+    # NDJSON 스트리밍 설정 (/koelectra/sentiment/stream)
+    stream_batch_size: int = 64  # 스트리밍 입력을 모아 추론할 내부 배치 크기
+    stream_max_line_bytes: int = 65536  # NDJSON 한 줄의 최대 크기 (초과 시 해당 줄만 에러)
+    
+    # 감성 분석 결과 캐시 설정
+    sentiment_cache_enabled: bool = True  # 결과 캐시 사용 여부
+    sentiment_cache_max_entries: int = 10000  # 프로세스 내 LRU 최대 항목 수
+    sentiment_cache_ttl_seconds: int = 3600  # 캐시 항목 유효 시간 (초)
+    sentiment_cache_redis_enabled: bool = False  # 공유 Redis 계층 사용 여부 (common.redis_client, REDIS_* 환경 변수)
     
     class Config:
         env_file = ".env"
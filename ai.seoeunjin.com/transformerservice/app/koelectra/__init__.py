@@ -2,6 +2,24 @@
 KoELECTRA 감성 분석 모듈
 """
 from .koelectra_service import KoELECTRAService
+from .koelectra_batcher import KoELECTRABatcher
+from .koelectra_executor import InferenceExecutor, InferenceQueueFullError
+from .koelectra_model_server import ModelServer, ModelServerClient
+from .koelectra_registry import ModelRegistry, UnknownModelError
+from .koelectra_singleflight import SingleFlight
+from . import koelectra_metrics
 from . import koelectra_router
 
-__all__ = ["KoELECTRAService", "koelectra_router"]
+__all__ = [
+    "KoELECTRAService",
+    "KoELECTRABatcher",
+    "InferenceExecutor",
+    "InferenceQueueFullError",
+    "ModelServer",
+    "ModelServerClient",
+    "ModelRegistry",
+    "UnknownModelError",
+    "SingleFlight",
+    "koelectra_metrics",
+    "koelectra_router",
+]
@@ -0,0 +1,292 @@
+"""
+KoELECTRA CPU 추론 자동 튜닝
+intra-op/inter-op 스레드 수와 배치 크기 조합을 벤치마크하여 최적 설정을 파일로 저장
+
+inter-op 스레드 수는 프로세스에서 병렬 작업이 시작되기 전에 한 번만 설정할 수 있으므로
+inter-op 값마다 별도 프로세스를 띄워 측정합니다.
+"""
+import argparse
+import fcntl
+import json
+import logging
+import multiprocessing
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import torch
+
+from .koelectra_corpus import load_reviews
+
+logger = logging.getLogger(__name__)
+
+# 코퍼스가 없을 때 사용할 합성 한국어 문장
+_SYNTHETIC_SENTENCES = [
+    "정말 재미있었어요",
+    "배우들 연기가 너무 좋았고 음악도 잘 어울렸습니다",
+    "기대보다 별로였어요. 스토리가 너무 뻔하고 지루했습니다",
+    "두 번 봐도 좋은 영화입니다. 강력 추천합니다!",
+    "중반부터 전개가 느려져서 아쉬웠지만 결말은 만족스러웠어요",
+]
+
+
+def available_cpus() -> Dict[str, Optional[float]]:
+    """
+    컨테이너에서 사용 가능한 CPU 정보
+
+    Returns:
+        affinity: 프로세스에 할당된 코어 수, quota: cgroup CPU 할당량 (없으면 None)
+    """
+    try:
+        affinity = len(os.sched_getaffinity(0))
+    except AttributeError:
+        affinity = os.cpu_count() or 1
+
+    quota = None
+    try:
+        # cgroup v2: "max 100000" 또는 "200000 100000"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            limit, period = f.read().split()
+        if limit != "max":
+            quota = round(int(limit) / int(period), 2)
+    except (OSError, ValueError):
+        pass
+
+    return {"affinity": affinity, "quota": quota}
+
+
+def execution_profile() -> Dict[str, str]:
+    """
+    튜닝 결과에 영향을 주는 추론 실행 설정 (백엔드, 양자화, 실행 모드)
+
+    측정 프로세스와 서비스가 같은 설정 객체를 보도록 koelectra_service.config를 사용합니다.
+    """
+    from . import koelectra_service
+    service_config = koelectra_service.config
+    return {
+        "backend": service_config.backend,
+        "quantization": service_config.quantization,
+        "execution_mode": service_config.execution_mode
+    }
+
+
+def _default_thread_candidates() -> List[int]:
+    """1, 2, 4, ... 사용 가능한 코어 수까지의 스레드 후보"""
+    cpus = available_cpus()
+    limit = cpus["affinity"]
+    if cpus["quota"] is not None:
+        limit = max(1, min(limit, int(round(cpus["quota"]))))
+    candidates = {limit}
+    n = 1
+    while n < limit:
+        candidates.add(n)
+        n *= 2
+    return sorted(candidates)
+
+
+def synthetic_texts(count: int) -> List[str]:
+    """벤치마크용 한국어 입력 (코퍼스 리뷰 우선, 없으면 합성 문장)"""
+    texts = load_reviews(limit=count)
+    while len(texts) < count:
+        texts.append(_SYNTHETIC_SENTENCES[len(texts) % len(_SYNTHETIC_SENTENCES)])
+    return texts
+
+
+def _benchmark_worker(
+    model_path: Optional[str],
+    interop_threads: int,
+    thread_candidates: List[int],
+    batch_candidates: List[int],
+    texts: List[str],
+    rounds: int,
+    queue
+) -> None:
+    """하나의 inter-op 값에 대해 intra-op 스레드 수 x 배치 크기 조합 측정"""
+    try:
+        torch.set_num_interop_threads(interop_threads)
+
+        from . import koelectra_service
+        from .koelectra_service import KoELECTRAService
+
+        # 측정 프로세스에서는 자동 튜닝/캐시/워밍업 비활성화
+        koelectra_service.config.autotune_mode = "off"
+        koelectra_service.config.sentiment_cache_enabled = False
+        service = KoELECTRAService()
+        service.load_model(model_path)
+
+        results = []
+        for threads in thread_candidates:
+            torch.set_num_threads(threads)
+            for batch_size in batch_candidates:
+                service.analyze_sentiment_batch(texts[:batch_size], batch_size=batch_size)
+                started = time.perf_counter()
+                for _ in range(rounds):
+                    service.analyze_sentiment_batch(texts, batch_size=batch_size)
+                elapsed = time.perf_counter() - started
+                results.append({
+                    "num_threads": threads,
+                    "num_interop_threads": interop_threads,
+                    "batch_size": batch_size,
+                    "seconds": round(elapsed, 4),
+                    "texts_per_second": round(len(texts) * rounds / elapsed, 2)
+                })
+                logger.info(f"autotune: {results[-1]}")
+        queue.put(results)
+    except Exception as e:
+        queue.put(e)
+
+
+def run_autotune(
+    model_path: Optional[str] = None,
+    thread_candidates: Optional[List[int]] = None,
+    interop_candidates: Optional[List[int]] = None,
+    batch_candidates: Optional[List[int]] = None,
+    samples: int = 256,
+    rounds: int = 3
+) -> Dict:
+    """
+    스레드 수/배치 크기 조합 벤치마크 (PyTorch 백엔드)
+
+    Args:
+        model_path: 모델 경로 (None이면 설정값 또는 기본 경로)
+        thread_candidates: intra-op 스레드 후보 (None이면 1, 2, 4, ... 코어 수)
+        interop_candidates: inter-op 스레드 후보
+        batch_candidates: 배치 크기 후보
+        samples: 벤치마크 입력 텍스트 수
+        rounds: 조합별 반복 횟수
+
+    Returns:
+        최적 조합과 전체 측정 결과
+    """
+    thread_candidates = thread_candidates or _default_thread_candidates()
+    interop_candidates = interop_candidates or [1, 2]
+    batch_candidates = batch_candidates or [8, 16, 32, 64]
+    texts = synthetic_texts(samples)
+
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for interop in interop_candidates:
+        queue = ctx.Queue()
+        process = ctx.Process(
+            target=_benchmark_worker,
+            args=(model_path, interop, thread_candidates, batch_candidates, texts, rounds, queue)
+        )
+        process.start()
+        output = queue.get()
+        process.join()
+        if isinstance(output, Exception):
+            raise output
+        results.extend(output)
+
+    best = max(results, key=lambda r: r["texts_per_second"])
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "cpu": available_cpus(),
+        "execution": execution_profile(),
+        "torch_version": torch.__version__,
+        "samples": len(texts),
+        "rounds": rounds,
+        "best": best,
+        "results": results
+    }
+
+
+def save_tuning(report: Dict, path: str) -> None:
+    """튜닝 결과를 JSON 파일로 저장 (임시 파일에 쓴 뒤 교체하여 읽는 쪽이 쓰다 만 파일을 보지 않음)"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    logger.info(f"자동 튜닝 결과 저장: {path}")
+
+
+@contextmanager
+def tuning_lock(path: str) -> Iterator[None]:
+    """
+    튜닝 파일 프로세스 간 배타 잠금 (path + ".lock" 파일에 flock)
+
+    여러 uvicorn 워커가 동시에 시작할 때 벤치마크는 잠금을 잡은 워커 하나만 실행하고,
+    나머지 워커는 잠금이 풀릴 때까지 기다린 뒤 저장된 결과를 읽습니다.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def load_tuning(path: str) -> Optional[Dict]:
+    """
+    저장된 튜닝 결과 로드
+
+    CPU 구성(코어 수/할당량)이나 실행 설정(백엔드/양자화/실행 모드)이 측정 당시와 다르면
+    결과를 사용하지 않습니다 (startup 모드에서는 다시 측정).
+
+    Returns:
+        최적 조합 (없거나 CPU 구성/실행 설정이 다르면 None)
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+    except Exception as e:
+        logger.warning(f"자동 튜닝 파일을 읽을 수 없습니다: {path} - {str(e)}")
+        return None
+
+    if report.get("cpu") != available_cpus():
+        logger.warning(f"CPU 구성이 달라 자동 튜닝 결과를 사용하지 않습니다: {report.get('cpu')} -> {available_cpus()}")
+        return None
+    if report.get("execution") != execution_profile():
+        logger.warning(
+            f"실행 설정이 달라 자동 튜닝 결과를 사용하지 않습니다: {report.get('execution')} -> {execution_profile()}"
+        )
+        return None
+    return report.get("best")
+
+
+def apply_tuning(best: Dict) -> None:
+    """튜닝 결과의 스레드 수를 현재 프로세스에 적용 (배치 크기는 호출자가 적용)"""
+    try:
+        torch.set_num_interop_threads(best["num_interop_threads"])
+    except RuntimeError:
+        # 이미 병렬 작업이 시작된 프로세스에서는 inter-op 스레드 수를 바꿀 수 없음
+        logger.warning("inter-op 스레드 수는 이미 고정되어 적용하지 않습니다.")
+    torch.set_num_threads(best["num_threads"])
+    logger.info(
+        f"자동 튜닝 적용: threads={best['num_threads']}, "
+        f"interop={best['num_interop_threads']}, batch_size={best['batch_size']}"
+    )
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+if __name__ == "__main__":
+    # 사용법: python -m app.koelectra.koelectra_autotune --threads 1,2,4 --batch-sizes 8,16,32
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="KoELECTRA CPU 추론 자동 튜닝")
+    parser.add_argument("--model-path", default=None, help="모델 경로 (기본: 설정값 또는 app/koelectra/koelectra_model)")
+    parser.add_argument("--threads", type=_int_list, default=None, help="intra-op 스레드 후보 (예: 1,2,4)")
+    parser.add_argument("--interop", type=_int_list, default=None, help="inter-op 스레드 후보 (예: 1,2)")
+    parser.add_argument("--batch-sizes", type=_int_list, default=None, help="배치 크기 후보 (예: 8,16,32,64)")
+    parser.add_argument("--samples", type=int, default=256, help="벤치마크 입력 텍스트 수")
+    parser.add_argument("--rounds", type=int, default=3, help="조합별 반복 횟수")
+    parser.add_argument("--output", default=None, help="결과 저장 경로 (기본: 설정의 autotune_file)")
+    args = parser.parse_args()
+
+    from .koelectra_service import KoELECTRAService
+
+    report = run_autotune(
+        args.model_path, args.threads, args.interop, args.batch_sizes, args.samples, args.rounds
+    )
+    output = args.output or KoELECTRAService.resolve_autotune_file(args.model_path)
+    save_tuning(report, output)
+    print(json.dumps(report["best"], ensure_ascii=False, indent=2))
@@ -0,0 +1,221 @@
+"""
+KoELECTRA 동적 마이크로 배칭 스케줄러
+동시에 들어오는 단일 텍스트 요청을 짧은 시간 동안 모아 한 번의 forward pass로 처리
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from .koelectra_executor import InferenceExecutor, InferenceQueueFullError
+from .koelectra_metrics import MICROBATCH_PENDING, QUEUE_REJECTED
+from .koelectra_service import KoELECTRAService
+
+logger = logging.getLogger(__name__)
+
+
+class KoELECTRABatcher:
+    """
+    단일 감성 분석 요청을 모아서 배치 추론하는 비동기 집계기
+
+    첫 요청이 들어온 뒤 max_wait_ms 동안(또는 max_batch_size개가 찰 때까지)
+    대기 중인 요청을 모아 analyze_sentiment_batch를 한 번 실행하고,
+    각 요청의 future에 해당 결과를 전달합니다.
+    대기 중인 요청이 max_pending을 넘으면 InferenceQueueFullError로 즉시 거절합니다.
+    모은 배치는 별도 태스크로 실행하므로 추론 스레드 수(executor.max_workers)만큼의 배치가 겹쳐 실행되고,
+    스레드가 모두 사용 중이면 그동안 들어온 요청은 다음 배치로 모입니다.
+    """
+
+    def __init__(
+        self,
+        service: KoELECTRAService,
+        executor: InferenceExecutor,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_pending: int = 256,
+        retry_after: int = 1
+    ):
+        """
+        Args:
+            service: 추론에 사용할 KoELECTRA 서비스
+            executor: 배치 추론을 실행할 추론 전용 실행기
+            max_batch_size: 한 번에 모을 최대 요청 수
+            max_wait_ms: 첫 요청 이후 추가 요청을 기다리는 최대 시간 (밀리초)
+            max_pending: 배치 큐에서 대기할 수 있는 최대 요청 수
+            retry_after: 대기열 초과 시 안내할 재시도 대기 시간 (초)
+        """
+        self._service = service
+        self._executor = executor
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._max_pending = max(1, max_pending)
+        self._retry_after = retry_after
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+        # 통계
+        self._batches = 0
+        self._items = 0
+        self._max_observed_batch = 0
+
+    @property
+    def service(self) -> KoELECTRAService:
+        """배치 추론에 사용하는 서비스"""
+        return self._service
+
+    def rebind(self, service: KoELECTRAService) -> None:
+        """
+        모델 교체 후 새 서비스로 전환 (이후 실행하는 배치부터 적용)
+
+        이미 실행 중인 배치는 교체 전 서비스로 끝까지 처리됩니다.
+        """
+        self._service = service
+
+    def _ensure_started(self) -> None:
+        """실행 중인 이벤트 루프에서 워커 태스크 시작 (최초 요청 시)"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(maxsize=self._max_pending)
+            self._slots = asyncio.Semaphore(self._executor.max_workers)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+            logger.info(
+                f"마이크로 배칭 시작 (max_batch_size={self._max_batch_size}, "
+                f"max_wait_ms={self._max_wait * 1000:.1f})"
+            )
+
+    async def submit(self, text: str) -> Dict:
+        """
+        단일 텍스트를 배치 큐에 넣고 결과를 기다림
+
+        Args:
+            text: 분석할 텍스트
+
+        Returns:
+            analyze_sentiment와 동일한 형식의 감성 분석 결과
+        """
+        if not text or not text.strip():
+            raise ValueError("텍스트가 비어있습니다.")
+
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((text, future))
+            MICROBATCH_PENDING.set(self._queue.qsize())
+        except asyncio.QueueFull:
+            QUEUE_REJECTED.labels(queue="microbatch").inc()
+            raise InferenceQueueFullError(self._retry_after, self._queue.qsize())
+        return await future
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        """첫 요청을 기다린 뒤 대기 시간/최대 크기 범위 안에서 요청을 모음"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self._max_wait
+
+        while len(batch) < self._max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # 이미 큐에 쌓여 있는 요청은 기다리지 않고 함께 처리
+        while len(batch) < self._max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        MICROBATCH_PENDING.set(self._queue.qsize())
+
+        return batch
+
+    async def _run(self) -> None:
+        """요청 수집 루프 (추론 스레드에 자리가 있을 때만 배치를 모아 태스크로 실행)"""
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+
+            # 대기 중 취소된 요청은 제외
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                self._slots.release()
+                continue
+
+            self._batches += 1
+            self._items += len(batch)
+            self._max_observed_batch = max(self._max_observed_batch, len(batch))
+
+            task = asyncio.get_running_loop().create_task(self._dispatch(self._service, batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, service: KoELECTRAService, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """배치 추론 후 각 요청의 future에 결과 전달 (완료 시 추론 자리 반납)"""
+        try:
+            texts = [text for text, _ in batch]
+            try:
+                # forward pass가 이벤트 루프를 막지 않도록 추론 스레드에서 실행
+                output = await self._executor.run(service.analyze_sentiment_batch, texts)
+            except Exception as e:
+                logger.error(f"마이크로 배치 추론 실패: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, future), result in zip(batch, output["results"]):
+                if future.done():
+                    continue
+                if result.get("sentiment") == "error":
+                    future.set_exception(RuntimeError(result.get("error", "감성 분석 실패")))
+                else:
+                    future.set_result(result)
+        finally:
+            # 중단(stop) 등으로 결과를 받지 못한 요청은 취소
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+            self._slots.release()
+
+    async def stop(self) -> None:
+        """워커 종료 및 대기 중인 요청 취소"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        for task in list(self._inflight):
+            task.cancel()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+
+    def get_stats(self) -> Dict:
+        """
+        마이크로 배칭 통계 조회
+
+        Returns:
+            처리한 배치 수, 요청 수, 평균/최대 배치 크기
+        """
+        return {
+            "max_batch_size": self._max_batch_size,
+            "max_wait_ms": self._max_wait * 1000,
+            "max_pending": self._max_pending,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "max_observed_batch_size": self._max_observed_batch,
+            "pending": self._queue.qsize() if self._queue is not None else 0
+        }
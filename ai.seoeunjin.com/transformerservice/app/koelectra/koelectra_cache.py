@@ -0,0 +1,219 @@
+"""
+KoELECTRA 감성 분석 결과 캐시
+프로세스 내 LRU(TTL) + 선택적 공유 Redis 2단 캐시
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .koelectra_metrics import CACHE_HIT_RATIO, CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentCache:
+    """
+    감성 분석 결과 2단 캐시
+
+    키는 정규화된 텍스트와 모델 식별자(경로 + 버전)의 해시이므로
+    모델이 바뀌면 이전 결과는 자동으로 조회되지 않습니다.
+    저장 값에는 원본 텍스트를 포함하지 않으며, 조회 시 호출자의 텍스트를 다시 붙입니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: int = 3600,
+        redis_enabled: bool = False,
+        redis_prefix: str = "koelectra:sentiment:"
+    ):
+        """
+        Args:
+            max_entries: 프로세스 내 LRU 최대 항목 수
+            ttl_seconds: 캐시 항목 유효 시간 (초, LRU와 Redis 공통)
+            redis_enabled: 공유 Redis 계층 사용 여부
+            redis_prefix: Redis 키 접두사
+        """
+        self._max_entries = max(1, max_entries)
+        self._ttl = max(1, ttl_seconds)
+        self._redis_enabled = redis_enabled
+        self._redis_prefix = redis_prefix
+        self._redis = None
+        self._redis_checked = False
+        self._model_identity: Optional[str] = None
+
+        self._local: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._redis_errors = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """캐시 키용 텍스트 정규화 (유니코드 NFC + 공백 정리)"""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    def bind_model(self, model_identity: str) -> None:
+        """
+        현재 모델 식별자 설정 (모델이 바뀌면 로컬 캐시 비움)
+
+        Args:
+            model_identity: 모델 경로와 버전으로 구성된 식별자
+        """
+        with self._lock:
+            if self._model_identity is not None and self._model_identity != model_identity:
+                self._local.clear()
+                self._invalidations += 1
+                logger.info(f"모델 변경으로 감성 분석 캐시 초기화: {model_identity}")
+            self._model_identity = model_identity
+
+    def make_key(self, text: str) -> str:
+        """정규화된 텍스트와 모델 식별자로 캐시 키 생성"""
+        raw = f"{self._model_identity}\x00{self.normalize(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _get_redis(self):
+        """공유 Redis 클라이언트 반환 (비활성화 또는 연결 불가 시 None)"""
+        if not self._redis_enabled:
+            return None
+        if not self._redis_checked:
+            self._redis_checked = True
+            try:
+                from common.redis_client import get_sync_redis
+                self._redis = get_sync_redis()
+            except Exception as e:
+                logger.warning(f"Redis 캐시 계층을 사용할 수 없습니다: {str(e)}")
+                self._redis = None
+        return self._redis
+
+    def get_many(self, keys: List[str]) -> List[Optional[Dict]]:
+        """
+        여러 키를 한 번에 조회 (로컬 LRU 우선, 없으면 Redis MGET)
+
+        Args:
+            keys: make_key로 생성한 캐시 키 리스트
+
+        Returns:
+            키 순서대로 캐시된 결과 (없으면 None)
+        """
+        now = time.monotonic()
+        values: List[Optional[Dict]] = [None] * len(keys)
+        missing = []
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._local.get(key)
+                if entry is not None and entry[0] > now:
+                    self._local.move_to_end(key)
+                    values[i] = entry[1]
+                    self._local_hits += 1
+                else:
+                    if entry is not None:
+                        del self._local[key]
+                    missing.append(i)
+        CACHE_REQUESTS.labels(result="local_hit").inc(len(keys) - len(missing))
+
+        redis_client = self._get_redis()
+        if missing and redis_client is not None:
+            try:
+                raw_values = redis_client.mget([self._redis_prefix + keys[i] for i in missing])
+                still_missing = []
+                for i, raw in zip(missing, raw_values):
+                    if raw is None:
+                        still_missing.append(i)
+                        continue
+                    values[i] = json.loads(raw)
+                    self._store_local(keys[i], values[i])
+                with self._lock:
+                    self._redis_hits += len(missing) - len(still_missing)
+                CACHE_REQUESTS.labels(result="redis_hit").inc(len(missing) - len(still_missing))
+                missing = still_missing
+            except Exception as e:
+                with self._lock:
+                    self._redis_errors += 1
+                logger.warning(f"Redis 캐시 조회 실패: {str(e)}")
+
+        with self._lock:
+            self._misses += len(missing)
+            hits = self._local_hits + self._redis_hits
+            CACHE_HIT_RATIO.set(hits / (hits + self._misses) if hits + self._misses else 0.0)
+        CACHE_REQUESTS.labels(result="miss").inc(len(missing))
+        return values
+
+    def get(self, key: str) -> Optional[Dict]:
+        """단일 키 조회"""
+        return self.get_many([key])[0]
+
+    def _store_local(self, key: str, value: Dict) -> None:
+        """로컬 LRU에 저장하고 최대 크기를 넘으면 오래된 항목 제거"""
+        with self._lock:
+            self._local[key] = (time.monotonic() + self._ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+
+    def set_many(self, items: List[Tuple[str, Dict]]) -> None:
+        """
+        여러 결과를 한 번에 저장 (Redis는 파이프라인으로 SETEX)
+
+        Args:
+            items: (캐시 키, 텍스트를 제외한 결과) 리스트
+        """
+        if not items:
+            return
+        for key, value in items:
+            self._store_local(key, value)
+
+        redis_client = self._get_redis()
+        if redis_client is not None:
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                for key, value in items:
+                    pipe.setex(self._redis_prefix + key, self._ttl, json.dumps(value))
+                pipe.execute()
+            except Exception as e:
+                with self._lock:
+                    self._redis_errors += 1
+                logger.warning(f"Redis 캐시 저장 실패: {str(e)}")
+
+    def set(self, key: str, value: Dict) -> None:
+        """단일 결과 저장"""
+        self.set_many([(key, value)])
+
+    def clear(self) -> None:
+        """로컬 캐시 비우기 (Redis 항목은 TTL 만료 또는 모델 식별자 변경으로 무효화)"""
+        with self._lock:
+            self._local.clear()
+
+    def get_stats(self) -> Dict:
+        """
+        캐시 통계 조회
+
+        Returns:
+            계층별 적중 수, 미스 수, 적중률, 로컬 캐시 크기
+        """
+        with self._lock:
+            hits = self._local_hits + self._redis_hits
+            total = hits + self._misses
+            return {
+                "model_identity": self._model_identity,
+                "size": len(self._local),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "redis_enabled": self._redis is not None,
+                "local_hits": self._local_hits,
+                "redis_hits": self._redis_hits,
+                "misses": self._misses,
+                "hit_ratio": round(hits / total, 4) if total else 0.0,
+                "redis_errors": self._redis_errors,
+                "invalidations": self._invalidations
+            }
@@ -0,0 +1,269 @@
+"""
+KoELECTRA 캐스케이드 사전 분류기
+해시된 문자 n-gram 선형(로지스틱) 분류기가 확신하는 입력은 바로 응답하고 나머지만 KoELECTRA로 추론
+
+분류기는 KoELECTRA의 예측을 정답으로 학습(증류)하므로, 임계값별 응답 비율과
+KoELECTRA와의 일치율을 보고 평균 추론 비용을 줄일 임계값을 정할 수 있습니다.
+"""
+import argparse
+import json
+import logging
+import random
+import time
+import unicodedata
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .koelectra_corpus import load_reviews
+
+logger = logging.getLogger(__name__)
+
+
+class HashedNgramClassifier:
+    """
+    해시된 문자 n-gram 로지스틱 회귀 이진 분류기 (positive 확률 출력)
+
+    띄어쓰기가 불규칙한 한국어 리뷰에 맞도록 형태소 분석 없이 문자 n-gram을 사용하며,
+    crc32 해시로 고정 크기 가중치 벡터에 매핑하므로 어휘 사전이 필요 없습니다.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 2 ** 18,
+        ngram_min: int = 1,
+        ngram_max: int = 3,
+        weights: Optional[np.ndarray] = None,
+        bias: float = 0.0
+    ):
+        """
+        Args:
+            n_features: 해시 버킷 수
+            ngram_min: 최소 n-gram 길이
+            ngram_max: 최대 n-gram 길이
+            weights: 학습된 가중치 (None이면 0으로 초기화)
+            bias: 학습된 편향
+        """
+        self.n_features = n_features
+        self.ngram_min = ngram_min
+        self.ngram_max = ngram_max
+        self.weights = weights if weights is not None else np.zeros(n_features, dtype=np.float32)
+        self.bias = float(bias)
+
+    def features(self, text: str) -> np.ndarray:
+        """텍스트의 문자 n-gram 해시 인덱스 (중복 제거)"""
+        text = " ".join(unicodedata.normalize("NFC", text).lower().split())
+        padded = f" {text} "
+        indices = set()
+        for n in range(self.ngram_min, self.ngram_max + 1):
+            for i in range(len(padded) - n + 1):
+                indices.add(zlib.crc32(padded[i:i + n].encode("utf-8")) % self.n_features)
+        return np.fromiter(indices, dtype=np.int64, count=len(indices))
+
+    def _score(self, indices: np.ndarray) -> float:
+        """positive 확률 (특성 수로 정규화한 선형 점수의 시그모이드)"""
+        if len(indices) == 0:
+            return 1.0 / (1.0 + np.exp(-self.bias))
+        z = float(self.weights[indices].sum()) / np.sqrt(len(indices)) + self.bias
+        return float(1.0 / (1.0 + np.exp(-z)))
+
+    def predict_proba(self, text: str) -> float:
+        """
+        positive 확률 예측
+
+        Args:
+            text: 입력 텍스트
+
+        Returns:
+            0~1 사이의 positive 확률
+        """
+        return self._score(self.features(text))
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        targets: Sequence[float],
+        epochs: int = 5,
+        learning_rate: float = 0.5,
+        l2: float = 1e-6,
+        seed: int = 42
+    ) -> "HashedNgramClassifier":
+        """
+        SGD로 로지스틱 손실 최소화 (targets는 0/1 또는 KoELECTRA positive 확률 같은 soft label)
+
+        Args:
+            texts: 학습 텍스트
+            targets: 텍스트별 positive 확률
+            epochs: 학습 반복 횟수
+            learning_rate: 학습률
+            l2: L2 정규화 계수
+            seed: 샘플 순서 셔플 시드
+        """
+        rng = np.random.default_rng(seed)
+        samples = [self.features(text) for text in texts]
+        targets = np.asarray(targets, dtype=np.float32)
+        for epoch in range(epochs):
+            loss = 0.0
+            for i in rng.permutation(len(samples)):
+                indices = samples[i]
+                p = self._score(indices)
+                y = targets[i]
+                loss -= y * np.log(max(p, 1e-7)) + (1 - y) * np.log(max(1 - p, 1e-7))
+                grad = p - y
+                scale = 1.0 / np.sqrt(len(indices)) if len(indices) else 0.0
+                self.weights[indices] -= learning_rate * (grad * scale + l2 * self.weights[indices])
+                self.bias -= learning_rate * grad * 0.1
+            logger.info(f"캐스케이드 학습 epoch {epoch + 1}/{epochs}: loss={loss / max(1, len(samples)):.4f}")
+        return self
+
+    def save(self, path: str) -> None:
+        """가중치를 npz 파일로 저장"""
+        np.savez_compressed(
+            path,
+            weights=self.weights,
+            bias=np.float32(self.bias),
+            n_features=np.int64(self.n_features),
+            ngram_range=np.array([self.ngram_min, self.ngram_max], dtype=np.int64)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNgramClassifier":
+        """npz 파일에서 분류기 로드"""
+        with np.load(path) as data:
+            ngram_min, ngram_max = (int(v) for v in data["ngram_range"])
+            return cls(
+                n_features=int(data["n_features"]),
+                ngram_min=ngram_min,
+                ngram_max=ngram_max,
+                weights=data["weights"].astype(np.float32),
+                bias=float(data["bias"])
+            )
+
+
+def _teacher_predictions(texts: List[str], model_path: Optional[str]) -> List[float]:
+    """KoELECTRA positive 확률 (캐스케이드/캐시 없이 전체 모델로 추론)"""
+    from . import koelectra_service
+    from .koelectra_service import KoELECTRAService
+
+    koelectra_service.config.cascade_enabled = False
+    koelectra_service.config.sentiment_cache_enabled = False
+    service = KoELECTRAService()
+    service.load_model(model_path)
+    results = service.analyze_sentiment_batch(texts)["results"]
+    return [r["confidence"].get("positive", 0.0) for r in results]
+
+
+def evaluate(
+    classifier: HashedNgramClassifier,
+    texts: List[str],
+    teacher: List[float],
+    thresholds: Sequence[float],
+    full_model_ms: Optional[float] = None
+) -> List[Dict]:
+    """
+    임계값별 캐스케이드 응답 비율과 KoELECTRA 일치율
+
+    Args:
+        classifier: 캐스케이드 분류기
+        texts: 평가 텍스트
+        teacher: 텍스트별 KoELECTRA positive 확률
+        thresholds: 평가할 신뢰도 임계값
+        full_model_ms: 텍스트당 KoELECTRA 추론 시간 (주어지면 예상 평균 비용 계산)
+
+    Returns:
+        임계값별 coverage(응답 비율), agreement(응답한 항목의 일치율), relative_cost
+    """
+    started = time.perf_counter()
+    probs = np.array([classifier.predict_proba(text) for text in texts])
+    cascade_ms = (time.perf_counter() - started) * 1000 / max(1, len(texts))
+    teacher_labels = np.array(teacher) > 0.5
+    cascade_labels = probs > 0.5
+    confidence = np.maximum(probs, 1 - probs)
+
+    report = []
+    for threshold in thresholds:
+        answered = confidence >= threshold
+        coverage = float(answered.mean()) if len(texts) else 0.0
+        agreement = float((cascade_labels[answered] == teacher_labels[answered]).mean()) if answered.any() else None
+        row = {
+            "threshold": threshold,
+            "coverage": round(coverage, 4),
+            "agreement": round(agreement, 4) if agreement is not None else None,
+            # 전체 정확도: 캐스케이드 응답분은 분류기, 나머지는 KoELECTRA 결과 사용
+            "overall_agreement": round(
+                float(np.where(answered, cascade_labels == teacher_labels, True).mean()), 4
+            ) if len(texts) else None,
+            "cascade_ms_per_text": round(cascade_ms, 4)
+        }
+        if full_model_ms:
+            row["relative_cost"] = round((cascade_ms + (1 - coverage) * full_model_ms) / full_model_ms, 4)
+        report.append(row)
+    return report
+
+
+def train_cascade(
+    model_path: Optional[str] = None,
+    samples: Optional[int] = None,
+    holdout: float = 0.2,
+    epochs: int = 5,
+    thresholds: Sequence[float] = (0.8, 0.85, 0.9, 0.95, 0.98)
+) -> Dict:
+    """
+    코퍼스 리뷰로 KoELECTRA 예측을 증류하여 캐스케이드 분류기 학습 후 모델 경로에 저장
+
+    Args:
+        model_path: KoELECTRA 모델 경로 (None이면 설정값 또는 기본 경로)
+        samples: 사용할 리뷰 수 (None이면 전체)
+        holdout: 평가용으로 떼어둘 비율
+        epochs: 학습 반복 횟수
+        thresholds: 평가할 신뢰도 임계값
+
+    Returns:
+        저장 경로와 홀드아웃 임계값별 평가 결과
+    """
+    from .koelectra_service import KoELECTRAService, config
+
+    texts = load_reviews(limit=samples)
+    random.Random(42).shuffle(texts)
+    if len(texts) < 10:
+        raise ValueError(f"학습할 리뷰가 부족합니다: {len(texts)}건")
+
+    started = time.perf_counter()
+    teacher = _teacher_predictions(texts, model_path)
+    full_model_ms = (time.perf_counter() - started) * 1000 / len(texts)
+
+    split = int(len(texts) * (1 - holdout))
+    classifier = HashedNgramClassifier().fit(texts[:split], teacher[:split], epochs=epochs)
+
+    path = Path(KoELECTRAService.resolve_model_path(model_path)) / config.cascade_file
+    classifier.save(str(path))
+    logger.info(f"캐스케이드 분류기 저장: {path}")
+
+    return {
+        "path": str(path),
+        "train_samples": split,
+        "holdout_samples": len(texts) - split,
+        "full_model_ms_per_text": round(full_model_ms, 4),
+        "holdout": evaluate(classifier, texts[split:], teacher[split:], thresholds, full_model_ms)
+    }
+
+
+def _float_list(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+if __name__ == "__main__":
+    # 사용법: python -m app.koelectra.koelectra_cascade --epochs 5 --thresholds 0.85,0.9,0.95
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="KoELECTRA 캐스케이드 분류기 학습/평가")
+    parser.add_argument("--model-path", default=None, help="모델 경로 (기본: 설정값 또는 app/koelectra/koelectra_model)")
+    parser.add_argument("--samples", type=int, default=None, help="사용할 리뷰 수 (기본: 전체)")
+    parser.add_argument("--holdout", type=float, default=0.2, help="평가용 비율")
+    parser.add_argument("--epochs", type=int, default=5, help="학습 반복 횟수")
+    parser.add_argument("--thresholds", type=_float_list, default=[0.8, 0.85, 0.9, 0.95, 0.98], help="평가할 임계값")
+    args = parser.parse_args()
+
+    report = train_cascade(args.model_path, args.samples, args.holdout, args.epochs, args.thresholds)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
@@ -0,0 +1,357 @@
+"""
+KoELECTRA 최적화 실행 모드 (TorchScript / torch.compile)
+입력을 고정 형태 버킷으로 패딩하여 재컴파일 없이 추적/컴파일된 모델을 실행하고, 산출물은 디스크에 캐시
+
+- torchscript: 시퀀스 길이 버킷별로 torch.jit.trace한 모듈을 <cache_dir>/<모델 식별자>-seq<길이>.pt로 저장하고
+  다음 시작 시 추적 없이 로드합니다. 로드한 모듈의 가중치는 원본 모델 파라미터로 교체하여 중복 메모리를 피합니다.
+- compile: torch.compile(dynamic=False)로 컴파일하며 Inductor FX 그래프 캐시를 <cache_dir>/inductor에 저장합니다.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import torch
+
+from .koelectra_corpus import load_reviews
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_MODES = ("eager", "torchscript", "compile")
+
+
+class _LogitsModule(torch.nn.Module):
+    """추적/컴파일용 래퍼 (텐서 입력 3개 -> logits 텐서)"""
+
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            token_type_ids=token_type_ids
+        ).logits
+
+
+def bucket_length(length: int, buckets: Sequence[int]) -> int:
+    """length 이상인 가장 작은 시퀀스 길이 버킷 (없으면 가장 큰 버킷)"""
+    for bucket in buckets:
+        if length <= bucket:
+            return bucket
+    return buckets[-1]
+
+
+def bucket_batch(size: int) -> int:
+    """size 이상인 가장 작은 2의 거듭제곱 배치 버킷"""
+    bucket = 1
+    while bucket < size:
+        bucket *= 2
+    return bucket
+
+
+class CompiledClassifier:
+    """
+    고정 형태 버킷으로 입력을 패딩하여 TorchScript/torch.compile 모델을 실행
+
+    시퀀스 길이는 seq_buckets 중 하나로, 배치 크기는 2의 거듭제곱으로 패딩하므로
+    가능한 입력 형태가 (배치 버킷 수 x 시퀀스 버킷 수)로 제한됩니다.
+    패딩 토큰은 attention_mask 0으로 가려지고 패딩 행은 결과에서 제외됩니다.
+    """
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        mode: str,
+        seq_buckets: Sequence[int],
+        cache_dir: str,
+        artifact_key: str,
+        pad_token_id: int = 0
+    ):
+        """
+        Args:
+            model: 평가 모드의 AutoModelForSequenceClassification
+            mode: "torchscript" 또는 "compile"
+            seq_buckets: 시퀀스 길이 버킷 (오름차순, 마지막 값이 max_seq_length)
+            cache_dir: 산출물 캐시 디렉토리
+            artifact_key: 캐시 파일 이름에 쓰는 모델 식별자 (모델 버전/양자화 모드 등)
+            pad_token_id: 패딩 토큰 ID
+        """
+        if mode not in ("torchscript", "compile"):
+            raise ValueError(f"지원하지 않는 실행 모드입니다: {mode}")
+        self.mode = mode
+        self._wrapper = _LogitsModule(model).eval()
+        self._device = next(model.parameters()).device
+        self._seq_buckets = sorted(set(seq_buckets))
+        self._cache_dir = Path(cache_dir)
+        self._artifact_key = artifact_key
+        self._pad_token_id = pad_token_id
+        self._traced: Dict[int, torch.jit.ScriptModule] = {}
+        self._compiled = None
+
+        # 통계
+        self._shapes = set()
+        self._artifacts_loaded = 0
+        self._artifacts_built = 0
+        self._build_seconds = 0.0
+
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        if mode == "compile":
+            self._setup_compile()
+
+    def _setup_compile(self) -> None:
+        """torch.compile 준비 (Inductor 디스크 캐시 + 버킷 수만큼 그래프 캐시 허용)"""
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(self._cache_dir / "inductor"))
+        try:
+            import torch._inductor.config as inductor_config
+            inductor_config.fx_graph_cache = True
+        except (ImportError, AttributeError):
+            logger.warning("Inductor FX 그래프 캐시를 사용할 수 없어 시작 시마다 컴파일합니다.")
+        import torch._dynamo
+        shapes = len(self._seq_buckets) * 16
+        torch._dynamo.config.cache_size_limit = max(torch._dynamo.config.cache_size_limit, shapes)
+        self._compiled = torch.compile(self._wrapper, dynamic=False)
+
+    def _pad(self, inputs: Dict[str, torch.Tensor]) -> List[torch.Tensor]:
+        """입력을 (배치 버킷, 시퀀스 버킷) 형태로 패딩"""
+        input_ids = inputs["input_ids"]
+        attention_mask = inputs["attention_mask"]
+        token_type_ids = inputs.get("token_type_ids")
+        if token_type_ids is None:
+            token_type_ids = torch.zeros_like(input_ids)
+
+        batch, length = input_ids.shape
+        target_batch = bucket_batch(batch)
+        target_length = bucket_length(length, self._seq_buckets)
+        if (target_batch, target_length) == (batch, length):
+            return [input_ids, attention_mask, token_type_ids]
+
+        padded = []
+        for tensor, fill in ((input_ids, self._pad_token_id), (attention_mask, 0), (token_type_ids, 0)):
+            out = torch.full((target_batch, target_length), fill, dtype=tensor.dtype, device=tensor.device)
+            out[:batch, :length] = tensor
+            padded.append(out)
+        # 패딩 행도 첫 토큰은 attention 대상으로 두어 전부 가려진 행이 생기지 않도록 함
+        padded[1][batch:, 0] = 1
+        return padded
+
+    def _artifact_path(self, length: int) -> Path:
+        return self._cache_dir / f"{self._artifact_key}-seq{length}.pt"
+
+    def _share_weights(self, module: torch.jit.ScriptModule) -> None:
+        """디스크에서 로드한 모듈의 파라미터를 원본 모델 파라미터로 교체 (가중치 중복 제거)"""
+        shared = dict(self._wrapper.named_parameters())
+        for name, _ in list(module.named_parameters()):
+            if name not in shared:
+                continue
+            owner_name, _, attr = name.rpartition(".")
+            owner = module.get_submodule(owner_name) if owner_name else module
+            setattr(owner, attr, shared[name])
+
+    def _torchscript_module(self, length: int) -> torch.jit.ScriptModule:
+        """시퀀스 길이 버킷의 추적 모듈 (디스크 캐시 우선, 없으면 추적 후 저장)"""
+        module = self._traced.get(length)
+        if module is not None:
+            return module
+
+        started = time.perf_counter()
+        path = self._artifact_path(length)
+        if path.exists():
+            module = torch.jit.load(str(path), map_location=self._device)
+            try:
+                self._share_weights(module)
+            except Exception as e:
+                logger.warning(f"추적 모듈 가중치 공유 실패 (별도 사본 사용): {str(e)}")
+            self._artifacts_loaded += 1
+            logger.info(f"TorchScript 산출물 로드: {path}")
+        else:
+            # 배치 차원이 고정되지 않도록 배치 크기 2로 추적
+            example = [
+                torch.full((2, length), self._pad_token_id, dtype=torch.long, device=self._device),
+                torch.ones((2, length), dtype=torch.long, device=self._device),
+                torch.zeros((2, length), dtype=torch.long, device=self._device)
+            ]
+            with torch.no_grad():
+                module = torch.jit.trace(self._wrapper, example, check_trace=False)
+            torch.jit.save(module, str(path))
+            self._artifacts_built += 1
+            logger.info(f"TorchScript 추적 및 저장: {path}")
+        self._build_seconds += time.perf_counter() - started
+        self._traced[length] = module
+        return module
+
+    def __call__(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        """
+        버킷 패딩 후 추론
+
+        Args:
+            inputs: 토크나이저 출력 (디바이스로 이동된 텐서)
+
+        Returns:
+            실제 배치 크기만큼의 logits
+        """
+        batch = inputs["input_ids"].shape[0]
+        padded = self._pad(inputs)
+        shape = tuple(padded[0].shape)
+        first = shape not in self._shapes
+        started = time.perf_counter()
+
+        if self.mode == "torchscript":
+            logits = self._torchscript_module(shape[1])(*padded)
+        else:
+            logits = self._compiled(*padded)
+
+        if first:
+            self._shapes.add(shape)
+            if self.mode == "compile":
+                self._build_seconds += time.perf_counter() - started
+        return logits[:batch]
+
+    def verify(self, atol: float = 1e-3) -> float:
+        """
+        배치/길이가 버킷과 다른 입력으로 eager 결과와 비교
+
+        Returns:
+            eager 대비 최대 logits 절대 오차
+
+        Raises:
+            RuntimeError: 오차가 atol을 넘는 경우 (추적 시 형태가 고정된 경우 등)
+        """
+        length = max(1, self._seq_buckets[0] - 3)
+        inputs = {
+            "input_ids": torch.randint(5, 1000, (3, length), device=self._device),
+            "attention_mask": torch.ones((3, length), dtype=torch.long, device=self._device),
+            "token_type_ids": torch.zeros((3, length), dtype=torch.long, device=self._device)
+        }
+        with torch.no_grad():
+            expected = self._wrapper(**inputs)
+            actual = self(inputs)
+        diff = float((expected - actual).abs().max())
+        if diff > atol:
+            raise RuntimeError(f"{self.mode} 결과가 eager와 다릅니다 (최대 오차 {diff:.6f})")
+        return diff
+
+    def get_stats(self) -> Dict:
+        """
+        실행 모드 통계
+
+        Returns:
+            모드, 버킷, 사용한 입력 형태 수, 캐시 로드/신규 생성 수, 추적/컴파일 누적 시간
+        """
+        return {
+            "mode": self.mode,
+            "seq_buckets": self._seq_buckets,
+            "cache_dir": str(self._cache_dir),
+            "shapes_seen": len(self._shapes),
+            "artifacts_loaded": self._artifacts_loaded,
+            "artifacts_built": self._artifacts_built,
+            "build_seconds": round(self._build_seconds, 3)
+        }
+
+
+def benchmark_modes(
+    model_path: str,
+    modes: Sequence[str] = EXECUTION_MODES,
+    seq_buckets: Sequence[int] = (32, 64, 128, 256, 512),
+    samples: int = 256,
+    batch_size: int = 32,
+    rounds: int = 3,
+    cache_dir: Optional[str] = None
+) -> Dict:
+    """
+    CPU에서 eager와 최적화 실행 모드의 처리량/지연 시간/정확도 비교
+
+    Args:
+        model_path: 모델 경로
+        modes: 비교할 실행 모드
+        seq_buckets: 시퀀스 길이 버킷
+        samples: 코퍼스에서 사용할 리뷰 수
+        batch_size: 배치 크기
+        rounds: 측정 반복 횟수 (첫 실행은 추적/컴파일 시간으로 별도 기록)
+        cache_dir: 산출물 캐시 디렉토리 (기본: <모델 경로>/compiled)
+
+    Returns:
+        모드별 준비 시간, 처리량, 배치 지연 시간 분위수, eager 대비 최대 확률 오차
+    """
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path).eval()
+    texts = load_reviews(limit=samples) or ["정말 재미있었어요", "별로였어요"] * (samples // 2)
+    batches = [
+        tokenizer(texts[i:i + batch_size], return_tensors="pt", padding=True, truncation=True, max_length=seq_buckets[-1])
+        for i in range(0, len(texts), batch_size)
+    ]
+    cache_dir = cache_dir or str(Path(model_path) / "compiled")
+
+    report = {"model_path": model_path, "samples": len(texts), "batch_size": batch_size, "rounds": rounds, "modes": {}}
+    reference = None
+    for mode in modes:
+        started = time.perf_counter()
+        if mode == "eager":
+            def run(inputs):
+                return model(**inputs).logits
+        else:
+            run = CompiledClassifier(model, mode, seq_buckets, cache_dir, f"benchmark-{mode}", tokenizer.pad_token_id)
+
+        with torch.no_grad():
+            # 첫 실행: 모든 입력 형태의 추적/컴파일 포함
+            probs = [torch.softmax(run(dict(b)), dim=-1) for b in batches]
+            prepare = time.perf_counter() - started
+
+            latencies = []
+            for _ in range(rounds):
+                for b in batches:
+                    t = time.perf_counter()
+                    run(dict(b))
+                    latencies.append((time.perf_counter() - t) * 1000)
+
+        probs = torch.cat(probs)
+        if reference is None:
+            reference = probs
+        total = sum(latencies) / 1000
+        report["modes"][mode] = {
+            "prepare_seconds": round(prepare, 3),
+            "texts_per_second": round(len(texts) * rounds / total, 2),
+            "batch_latency_ms": {
+                "p50": round(statistics.median(latencies), 2),
+                "p95": round(sorted(latencies)[int(len(latencies) * 0.95) - 1], 2),
+                "max": round(max(latencies), 2)
+            },
+            "max_prob_diff_vs_first": round(float((probs - reference).abs().max()), 6)
+        }
+        logger.info(f"{mode}: {report['modes'][mode]}")
+    return report
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+if __name__ == "__main__":
+    # 사용법: python -m app.koelectra.koelectra_compile --modes eager,torchscript,compile
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="KoELECTRA 실행 모드 벤치마크 (CPU)")
+    parser.add_argument("--model-path", default=str(Path(__file__).parent / "koelectra_model"))
+    parser.add_argument("--modes", default=",".join(EXECUTION_MODES), help="비교할 실행 모드")
+    parser.add_argument("--seq-buckets", type=_int_list, default=[32, 64, 128, 256, 512], help="시퀀스 길이 버킷")
+    parser.add_argument("--samples", type=int, default=256, help="코퍼스 리뷰 수")
+    parser.add_argument("--batch-size", type=int, default=32, help="배치 크기")
+    parser.add_argument("--rounds", type=int, default=3, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    torch.set_grad_enabled(False)
+    report = benchmark_modes(
+        args.model_path,
+        [m for m in args.modes.split(",") if m],
+        args.seq_buckets,
+        args.samples,
+        args.batch_size,
+        args.rounds
+    )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
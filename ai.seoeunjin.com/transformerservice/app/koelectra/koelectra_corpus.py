@@ -0,0 +1,42 @@
+"""
+KoELECTRA 리뷰 코퍼스 로더
+corpus/*.json 영화 리뷰를 검증/벤치마크용 샘플 텍스트로 제공
+"""
+import json
+import logging
+import random
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+
+def load_reviews(limit: Optional[int] = None, seed: int = 42) -> List[str]:
+    """
+    코퍼스의 리뷰 텍스트 로드
+
+    Args:
+        limit: 반환할 최대 리뷰 수 (None이면 전체)
+        seed: 샘플링 시드 (같은 시드는 항상 같은 샘플 반환)
+
+    Returns:
+        비어있지 않은 리뷰 텍스트 리스트
+    """
+    reviews = []
+    for path in sorted(CORPUS_DIR.glob("*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                items = json.load(f)
+        except Exception as e:
+            logger.warning(f"코퍼스 파일 읽기 실패: {path.name} - {str(e)}")
+            continue
+        for item in items:
+            review = (item.get("review") or "").strip()
+            if review:
+                reviews.append(review)
+
+    if limit is not None and limit < len(reviews):
+        reviews = random.Random(seed).sample(reviews, limit)
+    return reviews
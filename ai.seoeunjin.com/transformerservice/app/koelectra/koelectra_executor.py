@@ -0,0 +1,149 @@
+"""
+KoELECTRA 추론 전용 실행기
+블로킹 PyTorch 추론을 이벤트 루프 밖의 전용 스레드에서 실행하고 대기열 길이를 제한
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from .koelectra_metrics import QUEUE_DEPTH, QUEUE_REJECTED, QUEUE_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFullError(Exception):
+    """추론 대기열이 가득 차 요청을 받을 수 없음"""
+
+    def __init__(self, retry_after: int, queue_depth: int):
+        self.retry_after = retry_after
+        self.queue_depth = queue_depth
+        super().__init__(
+            f"추론 대기열이 가득 찼습니다 (대기 {queue_depth}건). {retry_after}초 후 다시 시도하세요."
+        )
+
+
+class InferenceExecutor:
+    """
+    대기열 길이가 제한된 추론 전용 스레드 풀
+
+    실행 중 + 대기 중인 작업 수가 max_workers + max_queue_size를 넘으면
+    새 작업을 큐에 넣지 않고 즉시 InferenceQueueFullError를 발생시킵니다.
+    """
+
+    def __init__(self, max_workers: int = 1, max_queue_size: int = 64, retry_after: int = 1):
+        """
+        Args:
+            max_workers: 동시에 추론을 실행할 스레드 수
+            max_queue_size: 실행을 기다릴 수 있는 최대 작업 수
+            retry_after: 대기열 초과 시 클라이언트에 안내할 재시도 대기 시간 (초)
+        """
+        self._max_workers = max(1, max_workers)
+        self._max_queue_size = max(0, max_queue_size)
+        self._retry_after = retry_after
+        self._pool = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix="koelectra-inference"
+        )
+        self._lock = threading.Lock()
+
+        # 상태 및 통계
+        self._inflight = 0
+        self._running = 0
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._last_wait = 0.0
+
+    @property
+    def max_workers(self) -> int:
+        """동시에 추론을 실행할 수 있는 스레드 수"""
+        return self._max_workers
+
+    @property
+    def queue_depth(self) -> int:
+        """실행을 기다리는 작업 수"""
+        with self._lock:
+            return self._inflight - self._running
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        함수를 추론 스레드에서 실행하고 결과를 기다림
+
+        Args:
+            fn: 실행할 블로킹 함수
+            *args: 함수 인자
+
+        Returns:
+            함수 반환값
+
+        Raises:
+            InferenceQueueFullError: 대기열이 가득 찬 경우
+        """
+        with self._lock:
+            if self._inflight >= self._max_workers + self._max_queue_size:
+                self._rejected += 1
+                QUEUE_REJECTED.labels(queue="executor").inc()
+                raise InferenceQueueFullError(self._retry_after, self._inflight - self._running)
+            self._inflight += 1
+            self._submitted += 1
+            QUEUE_DEPTH.set(self._inflight - self._running)
+
+        enqueued_at = time.perf_counter()
+
+        def task() -> Any:
+            wait = time.perf_counter() - enqueued_at
+            with self._lock:
+                self._running += 1
+                self._started += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+                self._last_wait = wait
+                QUEUE_DEPTH.set(self._inflight - self._running)
+            QUEUE_WAIT_SECONDS.observe(wait)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        def done(_future) -> None:
+            # 호출자가 취소되더라도 실제 작업이 끝난 시점에 슬롯 반환
+            with self._lock:
+                self._inflight -= 1
+                self._completed += 1
+                QUEUE_DEPTH.set(self._inflight - self._running)
+
+        future = self._pool.submit(task)
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """스레드 풀 종료"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict:
+        """
+        실행기 상태 조회
+
+        Returns:
+            대기열 길이, 실행 중 작업 수, 대기 시간 통계
+        """
+        with self._lock:
+            return {
+                "max_workers": self._max_workers,
+                "max_queue_size": self._max_queue_size,
+                "queue_depth": self._inflight - self._running,
+                "running": self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / self._started * 1000, 3) if self._started else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "last_wait_ms": round(self._last_wait * 1000, 3)
+            }
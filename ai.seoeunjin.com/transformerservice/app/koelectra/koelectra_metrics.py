@@ -0,0 +1,127 @@
+"""
+KoELECTRA 추론 지표 (Prometheus)
+단계별 지연 시간, 배치 크기, 대기열 길이, 캐시 적중률, 상주 모델 메모리를 /metrics로 노출
+"""
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Response
+from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+router = APIRouter(tags=["metrics"])
+
+# 단계: tokenize(토크나이징/패딩), forward(모델 실행), postprocess(소프트맥스/CPU 전송), serialize(JSON 직렬화)
+STAGE_SECONDS = Histogram(
+    "koelectra_stage_duration_seconds",
+    "KoELECTRA 추론 단계별 소요 시간",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+BATCH_SIZE = Histogram(
+    "koelectra_batch_size",
+    "forward pass 한 번에 처리한 시퀀스 수",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+
+TOKENS = Counter(
+    "koelectra_tokens_total",
+    "forward pass에 들어간 토큰 수 (real: 실제 토큰, padded: 패딩 포함)",
+    ["kind"]
+)
+
+QUEUE_DEPTH = Gauge(
+    "koelectra_inference_queue_depth",
+    "추론 실행기에서 실행을 기다리는 작업 수"
+)
+
+QUEUE_WAIT_SECONDS = Histogram(
+    "koelectra_inference_queue_wait_seconds",
+    "추론 작업이 실행기 대기열에서 기다린 시간",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+QUEUE_REJECTED = Counter(
+    "koelectra_inference_rejected_total",
+    "대기열 초과로 거절된 추론 요청 수",
+    ["queue"]
+)
+
+MICROBATCH_PENDING = Gauge(
+    "koelectra_microbatch_pending",
+    "마이크로 배칭 큐에서 대기 중인 단일 요청 수"
+)
+
+CACHE_REQUESTS = Counter(
+    "koelectra_cache_requests_total",
+    "감성 분석 결과 캐시 조회 수",
+    ["result"]
+)
+
+CACHE_HIT_RATIO = Gauge(
+    "koelectra_cache_hit_ratio",
+    "감성 분석 결과 캐시 누적 적중률"
+)
+
+DEDUPLICATED = Counter(
+    "koelectra_deduplicated_total",
+    "중복 입력으로 추론을 생략한 수 (batch: 배치 내 중복, in_flight: 진행 중인 동일 요청에 합류)",
+    ["kind"]
+)
+
+CASCADE_REQUESTS = Counter(
+    "koelectra_cascade_requests_total",
+    "캐스케이드 사전 분류기 판정 수 (answered: 바로 응답, deferred: KoELECTRA로 추론)",
+    ["result"]
+)
+
+CASCADE_AGREEMENT = Gauge(
+    "koelectra_cascade_agreement_ratio",
+    "표본 추출한 캐스케이드 응답과 KoELECTRA 결과의 누적 일치율"
+)
+
+RESIDENT_MODELS_MB = Gauge(
+    "koelectra_resident_models_mb",
+    "모델 레지스트리에 상주 중인 모델 가중치 총량 (MB)"
+)
+
+MODEL_EVICTIONS = Counter(
+    "koelectra_model_evictions_total",
+    "메모리 한도 초과로 언로드된 모델 수",
+    ["model"]
+)
+
+
+def process_memory() -> Dict[str, Optional[float]]:
+    """
+    현재 프로세스 메모리 사용량 (MB)
+
+    rss: 상주 메모리 (공유 페이지 포함), pss: 공유 페이지를 프로세스 수로 나눈 비례 메모리,
+    shared: 다른 프로세스와 공유 중인 페이지. Linux가 아니면 최대 RSS만 반환합니다.
+    """
+    fields = {"Rss": "rss_mb", "Pss": "pss_mb", "Shared_Clean": "shared_mb", "Private_Dirty": "private_mb"}
+    memory: Dict[str, Optional[float]] = {name: None for name in fields.values()}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in fields:
+                    memory[fields[key]] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        import resource
+        memory["rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return memory
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON 직렬화 시간을 serialize 단계로 기록하는 응답 클래스"""
+
+    def render(self, content) -> bytes:
+        with STAGE_SECONDS.labels(stage="serialize").time():
+            return super().render(content)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 텍스트 형식 지표"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,184 @@
+"""
+KoELECTRA safetensors 메모리 매핑 로딩
+가중치를 파일 매핑 메모리로 직접 참조하여 여러 uvicorn 워커가 같은 물리 페이지를 공유
+"""
+import argparse
+import json
+import logging
+import mmap
+import multiprocessing
+import struct
+from math import prod
+from pathlib import Path
+from typing import Dict, Tuple
+
+import torch
+from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+
+from .koelectra_metrics import process_memory
+
+logger = logging.getLogger(__name__)
+
+SAFETENSORS_FILE = "model.safetensors"
+
+_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+
+def load_mmap_state_dict(path: str) -> Tuple[Dict[str, torch.Tensor], mmap.mmap]:
+    """
+    safetensors 파일을 복사 없이 메모리 매핑된 텐서로 로드
+
+    ACCESS_COPY(MAP_PRIVATE) 매핑이므로 쓰기 전까지는 페이지 캐시의 같은 물리 페이지를
+    모든 프로세스가 공유합니다. 추론은 가중치를 수정하지 않으므로 공유 상태가 유지됩니다.
+
+    Args:
+        path: safetensors 파일 경로
+
+    Returns:
+        (state_dict, 매핑 객체) - 매핑 객체는 모델이 살아있는 동안 유지해야 함
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    header_len = struct.unpack("<Q", mm[:8])[0]
+    header = json.loads(mm[8:8 + header_len])
+    base = 8 + header_len
+
+    state_dict = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = _DTYPES[info["dtype"]]
+        shape = info["shape"]
+        begin, _ = info["data_offsets"]
+        numel = prod(shape)
+        if numel == 0:
+            state_dict[name] = torch.empty(shape, dtype=dtype)
+        else:
+            state_dict[name] = torch.frombuffer(
+                mm, dtype=dtype, count=numel, offset=base + begin
+            ).view(shape)
+    return state_dict, mm
+
+
+def load_mmap_model(model_path: str) -> Tuple[torch.nn.Module, mmap.mmap]:
+    """
+    모델 구조를 만든 뒤 가중치를 메모리 매핑 텐서로 교체 (load_state_dict assign)
+
+    Args:
+        model_path: config.json과 model.safetensors가 있는 모델 경로
+
+    Returns:
+        (평가 모드 모델, 매핑 객체)
+    """
+    weights_path = Path(model_path) / SAFETENSORS_FILE
+    if not weights_path.exists():
+        raise FileNotFoundError(
+            f"safetensors 가중치를 찾을 수 없습니다: {weights_path}. "
+            "python -m app.koelectra.koelectra_mmap --convert로 변환하세요."
+        )
+
+    model_config = AutoConfig.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_config(model_config)
+    state_dict, mm = load_mmap_state_dict(str(weights_path))
+
+    result = model.load_state_dict(state_dict, strict=False, assign=True)
+    if result.missing_keys:
+        logger.warning(f"체크포인트에 없는 가중치 (초기값 사용): {result.missing_keys}")
+    if result.unexpected_keys:
+        logger.warning(f"모델에 없는 체크포인트 가중치 (무시): {result.unexpected_keys}")
+
+    model.eval()
+    return model, mm
+
+
+def convert_to_safetensors(model_path: str) -> Path:
+    """
+    기존 모델 가중치를 safetensors 형식으로 다시 저장
+
+    Args:
+        model_path: 모델 경로
+
+    Returns:
+        저장된 safetensors 파일 경로
+    """
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.save_pretrained(model_path, safe_serialization=True)
+    return Path(model_path) / SAFETENSORS_FILE
+
+
+def _worker(model_path: str, use_mmap: bool, barrier, queue) -> None:
+    """측정용 워커: 모델 로드 + 추론 1회 후 모든 워커가 살아있는 상태에서 메모리 측정"""
+    torch.set_num_threads(1)
+    if use_mmap:
+        model, _mm = load_mmap_model(model_path)
+    else:
+        model = AutoModelForSequenceClassification.from_pretrained(model_path).eval()
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    with torch.no_grad():
+        model(**tokenizer(["메모리 측정용 문장입니다."], return_tensors="pt"))
+
+    barrier.wait()
+    queue.put(process_memory())
+    barrier.wait()
+
+
+def measure_worker_memory(model_path: str, workers: int = 4) -> Dict:
+    """
+    워커 수만큼 프로세스를 띄워 일반 로딩과 mmap 로딩의 워커당 메모리 비교
+
+    Args:
+        model_path: 모델 경로 (model.safetensors 필요)
+        workers: 동시에 띄울 워커 프로세스 수
+
+    Returns:
+        로딩 방식별 워커당 평균 RSS/PSS/공유 메모리
+    """
+    ctx = multiprocessing.get_context("spawn")
+    report = {"model_path": model_path, "workers": workers}
+    for mode, use_mmap in (("copy", False), ("mmap", True)):
+        barrier = ctx.Barrier(workers)
+        queue = ctx.Queue()
+        processes = [
+            ctx.Process(target=_worker, args=(model_path, use_mmap, barrier, queue))
+            for _ in range(workers)
+        ]
+        for p in processes:
+            p.start()
+        samples = [queue.get() for _ in processes]
+        for p in processes:
+            p.join()
+
+        report[mode] = {
+            key: round(sum(s[key] for s in samples) / len(samples), 1)
+            if all(s[key] is not None for s in samples) else None
+            for key in samples[0]
+        }
+    return report
+
+
+if __name__ == "__main__":
+    # 사용법:
+    #   python -m app.koelectra.koelectra_mmap --convert          # safetensors 변환
+    #   python -m app.koelectra.koelectra_mmap --workers 4        # 워커당 메모리 측정
+    parser = argparse.ArgumentParser(description="KoELECTRA safetensors mmap 로딩 도구")
+    parser.add_argument("--model-path", default=str(Path(__file__).parent / "koelectra_model"))
+    parser.add_argument("--convert", action="store_true", help="가중치를 model.safetensors로 변환")
+    parser.add_argument("--workers", type=int, default=4, help="메모리 측정 워커 수")
+    args = parser.parse_args()
+
+    if args.convert:
+        print(f"safetensors 변환 완료: {convert_to_safetensors(args.model_path)}")
+    else:
+        print(json.dumps(measure_worker_memory(args.model_path, args.workers), ensure_ascii=False, indent=2))
@@ -0,0 +1,357 @@
+"""
+KoELECTRA 단일 프로세스 모델 서버 (로컬 Unix 소켓 IPC)
+모델과 배칭 루프는 모델 서버 프로세스 하나만 소유하고, uvicorn API 워커는 토크나이징한 입력을 보내 확률을 받음
+
+모든 워커의 요청이 한 배칭 루프로 모이므로 워커 수가 늘수록 배치 효율이 좋아지고,
+워커는 토크나이저만 로드하므로 워커 수와 무관하게 모델 메모리는 한 벌만 사용합니다.
+
+프레임 형식: [헤더 길이 u32][페이로드 길이 u32][헤더 JSON][페이로드]
+- 요청 헤더: {"id", "op": "infer" | "ping", "model", "lengths": [시퀀스별 토큰 수]}
+  페이로드: int32 input_ids 전체 + int32 token_type_ids 전체 (패딩 없이 이어 붙임)
+- 응답 헤더: {"id", "shape": [시퀀스 수, 라벨 수], "errors": {인덱스: 메시지}, "model_version"}
+  페이로드: float32 확률
+
+사용법:
+    MODEL_SERVER_SOCKET=/tmp/koelectra.sock python -m app.koelectra.koelectra_model_server
+    MODEL_SERVER_SOCKET=/tmp/koelectra.sock uvicorn app.main:app --workers 4
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_FRAME = struct.Struct("!II")
+
+
+def encode_frame(header: Dict, payload: bytes = b"") -> bytes:
+    """헤더와 페이로드를 하나의 프레임으로 직렬화"""
+    raw = json.dumps(header).encode("utf-8")
+    return _FRAME.pack(len(raw), len(payload)) + raw + payload
+
+
+def encode_sequences(input_ids: List[List[int]], token_type_ids: List[List[int]]) -> Tuple[List[int], bytes]:
+    """가변 길이 시퀀스를 (길이 리스트, int32 페이로드)로 변환"""
+    lengths = [len(ids) for ids in input_ids]
+    ids = np.fromiter((t for seq in input_ids for t in seq), dtype=np.int32, count=sum(lengths))
+    types = np.fromiter((t for seq in token_type_ids for t in seq), dtype=np.int32, count=sum(lengths))
+    return lengths, ids.tobytes() + types.tobytes()
+
+
+def decode_sequences(lengths: List[int], payload: bytes) -> List[Dict[str, List[int]]]:
+    """encode_sequences의 역변환 (패딩 전 토크나이저 출력 형식의 features)"""
+    total = sum(lengths)
+    flat = np.frombuffer(payload, dtype=np.int32)
+    ids, types = flat[:total], flat[total:2 * total]
+    features, offset = [], 0
+    for length in lengths:
+        features.append({
+            "input_ids": ids[offset:offset + length].tolist(),
+            "token_type_ids": types[offset:offset + length].tolist(),
+            "attention_mask": [1] * length
+        })
+        offset += length
+    return features
+
+
+class ModelServer:
+    """
+    Unix 소켓으로 추론 요청을 받아 모델별 전역 배치로 처리하는 서버
+
+    여러 연결에서 들어온 요청의 시퀀스를 max_wait_ms 동안(또는 max_batch_size개가 찰 때까지) 모아
+    한 번의 infer_features로 처리한 뒤 요청별로 나누어 응답합니다.
+    모델 로딩/상주 관리는 ModelRegistry를 그대로 사용합니다.
+    """
+
+    def __init__(self, socket_path: str, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        """
+        Args:
+            socket_path: Unix 소켓 경로
+            max_batch_size: 한 번에 모을 최대 시퀀스 수
+            max_wait_ms: 첫 요청 이후 추가 요청을 기다리는 최대 시간 (밀리초)
+        """
+        from .koelectra_router import get_model_registry
+
+        self._socket_path = socket_path
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._registry = get_model_registry()
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+
+        # 통계
+        self._connections = 0
+        self._requests = 0
+        self._batches = 0
+        self._sequences = 0
+
+    async def serve(self) -> None:
+        """기본 모델을 준비한 뒤 소켓 요청 처리 (종료될 때까지 실행)"""
+        await self._registry.ensure_loaded()
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+        server = await asyncio.start_unix_server(self._handle, path=self._socket_path)
+        logger.info(f"KoELECTRA 모델 서버 시작: {self._socket_path}")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """연결별 요청 수신 (요청마다 태스크로 처리하여 한 연결에서도 동시 요청 허용)"""
+        self._connections += 1
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                head = await reader.readexactly(_FRAME.size)
+                header_len, payload_len = _FRAME.unpack(head)
+                header = json.loads(await reader.readexactly(header_len))
+                payload = await reader.readexactly(payload_len) if payload_len else b""
+                task = asyncio.create_task(self._respond(header, payload, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections -= 1
+            writer.close()
+
+    async def _respond(self, header: Dict, payload: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        """요청 하나를 처리하고 응답 프레임 전송"""
+        response: Dict = {"id": header.get("id")}
+        body = b""
+        try:
+            if header.get("op") == "ping":
+                response["stats"] = self.get_stats()
+                response["models"] = {
+                    m["name"]: m["model_version"] for m in self._registry.get_stats()["models"]
+                }
+            else:
+                self._requests += 1
+                probs, errors, version = await self._submit(
+                    header.get("model"), decode_sequences(header["lengths"], payload)
+                )
+                response.update(shape=list(probs.shape), errors=errors, model_version=version)
+                body = probs.astype(np.float32).tobytes()
+        except Exception as e:
+            response["error"] = str(e)
+        async with write_lock:
+            writer.write(encode_frame(response, body))
+            await writer.drain()
+
+    async def _submit(self, model: Optional[str], features: List[Dict]) -> Tuple[np.ndarray, Dict[str, str], str]:
+        """모델별 배치 큐에 넣고 결과 대기"""
+        name = self._registry.resolve(model)
+        queue = self._queues.get(name)
+        if queue is None:
+            queue = self._queues[name] = asyncio.Queue()
+            self._workers[name] = asyncio.create_task(self._run(name, queue))
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((features, future))
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue) -> List[Tuple[List[Dict], asyncio.Future]]:
+        """첫 요청을 기다린 뒤 대기 시간/최대 시퀀스 수 범위 안에서 요청을 모음"""
+        loop = asyncio.get_running_loop()
+        batch = [await queue.get()]
+        size = len(batch[0][0])
+        deadline = loop.time() + self._max_wait
+        while size < self._max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    async def _run(self, name: str, queue: asyncio.Queue) -> None:
+        """모델별 배칭 루프"""
+        while True:
+            batch = await self._collect(queue)
+            features = [f for item, _ in batch for f in item]
+            self._batches += 1
+            self._sequences += len(features)
+            try:
+                async with self._registry.lease(name) as service:
+                    outputs = await asyncio.to_thread(service.infer_features, features)
+                    labels, version = len(service.labels), service.model_version
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for item, future in batch:
+                chunk = outputs[offset:offset + len(item)]
+                offset += len(item)
+                probs = np.zeros((len(chunk), labels), dtype=np.float32)
+                errors = {}
+                for i, output in enumerate(chunk):
+                    if isinstance(output, Exception):
+                        errors[str(i)] = str(output)
+                    else:
+                        probs[i] = output
+                if not future.done():
+                    future.set_result((probs, errors, version))
+
+    def get_stats(self) -> Dict:
+        """
+        모델 서버 통계
+
+        Returns:
+            연결 수, 요청 수, 배치 수, 평균 배치 크기(시퀀스 수)
+        """
+        return {
+            "connections": self._connections,
+            "requests": self._requests,
+            "batches": self._batches,
+            "sequences": self._sequences,
+            "avg_batch_size": round(self._sequences / self._batches, 2) if self._batches else 0.0
+        }
+
+
+class ModelServerClient:
+    """
+    API 워커용 모델 서버 클라이언트
+
+    추론 스레드마다 별도 연결을 사용하므로 동기 코드(KoELECTRAService)에서 그대로 호출할 수 있습니다.
+    요청을 보내기 전에 연결이 끊긴 경우에만 한 번 다시 연결하여 재시도합니다.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        """
+        Args:
+            socket_path: 모델 서버 Unix 소켓 경로
+            timeout: 요청 타임아웃 (초)
+        """
+        self._socket_path = socket_path
+        self._timeout = timeout
+        self._local = threading.local()
+        self._ids = 0
+        self._ids_lock = threading.Lock()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self._timeout)
+            sock.connect(self._socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, size: int) -> bytes:
+        chunks, remaining = [], size
+        while remaining:
+            chunk = sock.recv(remaining)
+            if not chunk:
+                raise ConnectionError("모델 서버 연결이 끊어졌습니다.")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def _call(self, header: Dict, payload: bytes = b"") -> Tuple[Dict, bytes]:
+        """
+        요청 전송 후 응답 수신
+
+        연결/전송 단계의 오류만 1회 재연결하여 재시도합니다. 전송 이후의 오류(타임아웃 포함)는
+        서버가 이미 요청을 처리 중일 수 있으므로 재시도하지 않고 연결을 닫은 뒤 그대로 올립니다.
+        """
+        with self._ids_lock:
+            self._ids += 1
+            header["id"] = self._ids
+        frame = encode_frame(header, payload)
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                sock.sendall(frame)
+                break
+            except OSError:
+                self._close()
+                if attempt == 1:
+                    raise
+        try:
+            header_len, payload_len = _FRAME.unpack(self._recv_exact(sock, _FRAME.size))
+            response = json.loads(self._recv_exact(sock, header_len))
+            body = self._recv_exact(sock, payload_len) if payload_len else b""
+        except BaseException:
+            # 응답 일부만 읽은 연결은 다음 요청과 응답이 어긋나므로 폐기
+            self._close()
+            raise
+        if response.get("id") != header["id"]:
+            self._close()
+            raise ConnectionError(f"모델 서버 응답 ID 불일치: 요청 {header['id']}, 응답 {response.get('id')}")
+        if response.get("error"):
+            raise RuntimeError(f"모델 서버 오류: {response['error']}")
+        return response, body
+
+    def ping(self) -> Dict:
+        """
+        모델 서버 상태 확인
+
+        Returns:
+            서버 통계와 모델별 버전
+        """
+        response, _ = self._call({"op": "ping"})
+        return {"stats": response.get("stats"), "models": response.get("models", {})}
+
+    def infer(
+        self,
+        model: str,
+        input_ids: List[List[int]],
+        token_type_ids: Optional[List[List[int]]] = None
+    ) -> Tuple[List[List[float]], Dict[int, str], Optional[str]]:
+        """
+        패딩 전 토큰 시퀀스 추론
+
+        Args:
+            model: 모델 이름
+            input_ids: 시퀀스별 토큰 ID
+            token_type_ids: 시퀀스별 토큰 타입 ID (None이면 0)
+
+        Returns:
+            (시퀀스별 확률, 실패한 시퀀스 인덱스 -> 오류 메시지, 서버의 모델 버전)
+        """
+        if token_type_ids is None:
+            token_type_ids = [[0] * len(ids) for ids in input_ids]
+        lengths, payload = encode_sequences(input_ids, token_type_ids)
+        response, body = self._call({"op": "infer", "model": model, "lengths": lengths}, payload)
+        probs = np.frombuffer(body, dtype=np.float32).reshape(response["shape"]).tolist()
+        errors = {int(i): message for i, message in (response.get("errors") or {}).items()}
+        return probs, errors, response.get("model_version")
+
+
+if __name__ == "__main__":
+    from . import koelectra_service
+    from ..config import TransformerServiceConfig
+
+    logging.basicConfig(level=logging.INFO)
+    server_config = TransformerServiceConfig()
+    if not server_config.model_server_socket:
+        raise SystemExit("MODEL_SERVER_SOCKET 환경 변수로 소켓 경로를 지정하세요.")
+
+    # 모델 서버 프로세스는 모델을 직접 로드 (자기 자신에게 원격 요청하지 않도록 비활성화)
+    koelectra_service.config.model_server_socket = None
+    server = ModelServer(
+        server_config.model_server_socket,
+        max_batch_size=server_config.model_server_max_batch_size,
+        max_wait_ms=server_config.model_server_max_wait_ms
+    )
+    asyncio.run(server.serve())
@@ -0,0 +1,131 @@
+"""
+KoELECTRA INT8 동적 양자화 및 정확도 비교
+Linear 레이어를 INT8로 동적 양자화하고 fp32 모델과 결과 일치율을 측정
+"""
+import argparse
+import copy
+import io
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from .koelectra_corpus import load_reviews
+
+logger = logging.getLogger(__name__)
+
+
+def quantize_dynamic_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    모델의 Linear 레이어를 INT8 동적 양자화 (CPU 전용)
+
+    Args:
+        model: 평가 모드의 fp32 모델
+
+    Returns:
+        양자화된 모델
+    """
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def model_size_mb(model: torch.nn.Module) -> float:
+    """state_dict 직렬화 크기 (MB)"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return round(buffer.tell() / (1024 * 1024), 2)
+
+
+def _predict(model, tokenizer, texts: List[str], batch_size: int) -> List[List[float]]:
+    """텍스트별 [negative, positive] 확률 계산"""
+    probs = []
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(
+            texts[start:start + batch_size],
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=512
+        )
+        with torch.no_grad():
+            logits = model(**inputs).logits
+        probs.extend(torch.nn.functional.softmax(logits, dim=-1).tolist())
+    return probs
+
+
+def check_quantization_parity(
+    model_path: Optional[str] = None,
+    sample_size: int = 200,
+    batch_size: int = 32,
+    texts: Optional[List[str]] = None
+) -> Dict:
+    """
+    fp32 모델과 INT8 동적 양자화 모델의 결과 비교
+
+    Args:
+        model_path: 모델 경로 (None이면 기본 경로)
+        sample_size: 코퍼스에서 뽑을 검증 샘플 수
+        batch_size: 추론 배치 크기
+        texts: 검증 텍스트 (지정 시 코퍼스 대신 사용)
+
+    Returns:
+        라벨 일치율, 신뢰도 차이, 지연 시간, 모델 크기 비교 결과
+    """
+    if model_path is None:
+        model_path = str(Path(__file__).parent / "koelectra_model")
+    if texts is None:
+        texts = load_reviews(limit=sample_size)
+    if not texts:
+        raise ValueError("검증 텍스트가 없습니다.")
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    fp32_model = AutoModelForSequenceClassification.from_pretrained(model_path).eval()
+    int8_model = quantize_dynamic_int8(copy.deepcopy(fp32_model))
+
+    started = time.perf_counter()
+    fp32_probs = _predict(fp32_model, tokenizer, texts, batch_size)
+    fp32_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    int8_probs = _predict(int8_model, tokenizer, texts, batch_size)
+    int8_seconds = time.perf_counter() - started
+
+    agree = sum(
+        (a[1] > a[0]) == (b[1] > b[0]) for a, b in zip(fp32_probs, int8_probs)
+    )
+    drifts = [abs(a[1] - b[1]) for a, b in zip(fp32_probs, int8_probs)]
+
+    return {
+        "model_path": model_path,
+        "samples": len(texts),
+        "label_agreement": round(agree / len(texts), 4),
+        "disagreements": len(texts) - agree,
+        "confidence_drift": {
+            "mean": round(sum(drifts) / len(drifts), 6),
+            "max": round(max(drifts), 6)
+        },
+        "latency_seconds": {
+            "fp32": round(fp32_seconds, 3),
+            "int8": round(int8_seconds, 3),
+            "speedup": round(fp32_seconds / int8_seconds, 2) if int8_seconds else None
+        },
+        "model_size_mb": {
+            "fp32": model_size_mb(fp32_model),
+            "int8": model_size_mb(int8_model)
+        }
+    }
+
+
+if __name__ == "__main__":
+    # 사용법: python -m app.koelectra.koelectra_quantization --sample-size 200
+    parser = argparse.ArgumentParser(description="KoELECTRA INT8 동적 양자화 정확도 비교")
+    parser.add_argument("--model-path", default=None, help="모델 경로 (기본: app/koelectra/koelectra_model)")
+    parser.add_argument("--sample-size", type=int, default=200, help="코퍼스 검증 샘플 수")
+    parser.add_argument("--batch-size", type=int, default=32, help="추론 배치 크기")
+    args = parser.parse_args()
+
+    report = check_quantization_parity(args.model_path, args.sample_size, args.batch_size)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
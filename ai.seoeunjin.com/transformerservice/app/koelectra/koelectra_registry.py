@@ -0,0 +1,341 @@
+"""
+KoELECTRA 모델 레지스트리
+이름으로 등록된 분류 모델을 요청 시 로드하고, 메모리 한도 안에서 최근 사용 순(LRU)으로 상주 모델을 관리
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+from .koelectra_metrics import MODEL_EVICTIONS, RESIDENT_MODELS_MB
+from .koelectra_service import KoELECTRAService
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownModelError(Exception):
+    """등록되지 않은 모델 이름"""
+
+    def __init__(self, name: str, available: List[str]):
+        self.name = name
+        self.available = available
+        super().__init__(f"등록되지 않은 모델입니다: {name} (사용 가능: {', '.join(available)})")
+
+
+class SwapInProgressError(Exception):
+    """같은 모델의 교체 작업이 이미 진행 중"""
+
+
+class ModelRegistry:
+    """
+    이름별 KoELECTRAService 상주 관리
+
+    acquire로 모델을 빌려 쓰는 동안(lease)에는 축출하지 않으며, release 후 상주 가중치 총량이
+    memory_budget_mb를 넘으면 가장 오래 사용하지 않은 모델부터 언로드합니다.
+    기본 모델은 준비 상태 체크(/koelectra/ready) 대상이므로 축출하지 않습니다.
+
+    swap은 새 모델을 별도 인스턴스로 로드/워밍업한 뒤 이름의 인스턴스를 원자적으로 교체합니다.
+    교체 전 인스턴스는 빌려 간 요청이 모두 반납된 뒤 언로드됩니다.
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, str],
+        default_model: str,
+        memory_budget_mb: float = 2048,
+        warmup: bool = True
+    ):
+        """
+        Args:
+            models: 추가 모델 이름 -> 경로
+            default_model: 기본 모델 이름 (경로는 model_path 설정 사용)
+            memory_budget_mb: 상주 모델 가중치 총량 한도 (0 이하면 무제한)
+            warmup: 로드 직후 워밍업 실행 여부
+        """
+        self._default = default_model
+        self._names = [default_model] + [name for name in models if name != default_model]
+        self._paths: Dict[str, Optional[str]] = dict(models)
+        self._budget = memory_budget_mb
+        self._warmup = warmup
+
+        self._resident: "OrderedDict[str, None]" = OrderedDict()  # 최근 사용 순 (뒤쪽이 최근)
+        self._leases: Dict[KoELECTRAService, int] = {}  # 인스턴스별 대여 수 (교체 전 인스턴스 포함)
+        self._retiring: List[KoELECTRAService] = []  # 교체되어 반납을 기다리는 인스턴스
+        self._loading: Dict[str, asyncio.Lock] = {}
+        self._swaps: Dict[str, Dict] = {}
+        self._swap_tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self._loads = 0
+        self._evictions = 0
+
+    @property
+    def default_model(self) -> str:
+        """기본 모델 이름"""
+        return self._default
+
+    def resolve(self, name: Optional[str] = None) -> str:
+        """
+        요청의 모델 이름 확인 (None이면 기본 모델)
+
+        Raises:
+            UnknownModelError: 등록되지 않은 이름
+        """
+        name = name or self._default
+        if name not in self._names:
+            raise UnknownModelError(name, self._names)
+        return name
+
+    async def ensure_loaded(self, name: Optional[str] = None) -> KoELECTRAService:
+        """
+        모델을 로드(및 워밍업)한 뒤 서비스 반환
+
+        로딩은 이벤트 루프를 막지 않도록 스레드에서 실행하며, 같은 모델의 동시 로딩은 한 번만 수행합니다.
+        """
+        name = self.resolve(name)
+        lock = self._loading.setdefault(name, asyncio.Lock())
+        async with lock:
+            service = KoELECTRAService(name)
+            if not service.is_ready:
+                await asyncio.to_thread(service.load_model, self._paths.get(name))
+                if self._warmup:
+                    await asyncio.to_thread(service.warmup)
+                with self._lock:
+                    self._loads += 1
+            # 축출(_evict)도 같은 잠금 안에서 상주 여부를 확인하므로 잠금 안에서 갱신
+            self._touch(name)
+        await self._enforce_budget()
+        return service
+
+    async def acquire(self, name: Optional[str] = None) -> KoELECTRAService:
+        """
+        모델을 빌려 옴 (release 전까지 축출/교체 후 언로드 대상에서 제외)
+
+        Returns:
+            로드된 서비스 (요청 처리가 끝날 때까지 같은 인스턴스 사용)
+        """
+        name = self.resolve(name)
+        while True:
+            service = KoELECTRAService(name)
+            with self._lock:
+                self._leases[service] = self._leases.get(service, 0) + 1
+            try:
+                loaded = await self.ensure_loaded(name)
+            except BaseException:
+                await self.release(service)
+                raise
+            if loaded is service:
+                return service
+            # 로딩을 기다리는 동안 모델이 교체된 경우 새 인스턴스로 다시 빌림
+            await self.release(service)
+
+    def retain(self, service: KoELECTRAService) -> None:
+        """
+        이미 빌린 모델의 대여를 하나 더 추가 (요청보다 오래 실행될 수 있는 공유 작업용, release로 반납)
+
+        호출 시점에 호출자가 대여 중이어야 하므로 로딩을 기다리지 않습니다.
+        """
+        with self._lock:
+            self._leases[service] = self._leases.get(service, 0) + 1
+
+    async def release(self, service: KoELECTRAService) -> None:
+        """acquire로 빌린 모델 반납 (교체된 인스턴스는 마지막 반납 시 언로드)"""
+        with self._lock:
+            count = self._leases.get(service, 0) - 1
+            if count > 0:
+                self._leases[service] = count
+            else:
+                self._leases.pop(service, None)
+        await self._release_retired()
+        await self._enforce_budget()
+
+    @asynccontextmanager
+    async def lease(self, name: Optional[str] = None) -> AsyncIterator[KoELECTRAService]:
+        """acquire/release 컨텍스트 매니저"""
+        service = await self.acquire(name)
+        try:
+            yield service
+        finally:
+            await self.release(service)
+
+    def start_swap(self, name: Optional[str], model_path: str) -> Dict:
+        """
+        모델 무중단 교체를 백그라운드로 시작
+
+        Args:
+            name: 교체할 모델 이름 (None이면 기본 모델)
+            model_path: 새 모델 디렉토리
+
+        Returns:
+            교체 작업 상태
+
+        Raises:
+            SwapInProgressError: 같은 모델의 교체가 진행 중인 경우
+        """
+        name = self.resolve(name)
+        task = self._swap_tasks.get(name)
+        if task is not None and not task.done():
+            raise SwapInProgressError(f"모델 교체가 이미 진행 중입니다: {name}")
+
+        current = KoELECTRAService(name)
+        self._swaps[name] = {
+            "name": name,
+            "state": "loading",
+            "model_path": model_path,
+            "previous_version": current.model_version,
+            "model_version": None,
+            "started_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "seconds": None,
+            "error": None
+        }
+        self._swap_tasks[name] = asyncio.get_running_loop().create_task(self._swap(name, model_path))
+        return dict(self._swaps[name])
+
+    def get_swap_status(self, name: Optional[str] = None) -> Optional[Dict]:
+        """최근 교체 작업 상태 (없으면 None)"""
+        status = self._swaps.get(self.resolve(name))
+        return dict(status) if status is not None else None
+
+    async def _swap(self, name: str, model_path: str) -> None:
+        """새 인스턴스 로드/워밍업 후 원자적 교체, 이전 인스턴스는 반납 완료 후 언로드"""
+        status = self._swaps[name]
+        started = time.perf_counter()
+        standby = KoELECTRAService.create_standby(name)
+        try:
+            await asyncio.to_thread(standby.load_model, model_path)
+            if self._warmup:
+                status["state"] = "warming"
+                await asyncio.to_thread(standby.warmup)
+        except Exception as e:
+            logger.error(f"모델 교체 실패 (기존 모델 유지): {name} - {str(e)}")
+            status.update(state="failed", error=str(e), finished_at=datetime.utcnow().isoformat())
+            await asyncio.to_thread(standby.unload)
+            return
+
+        with self._lock:
+            previous = KoELECTRAService.replace(standby)
+            self._paths[name] = model_path
+            self._resident[name] = None
+            self._resident.move_to_end(name)
+            if previous is not None and previous.is_loaded:
+                self._retiring.append(previous)
+            self._loads += 1
+
+        status.update(
+            state="completed",
+            model_version=standby.model_version,
+            finished_at=datetime.utcnow().isoformat(),
+            seconds=round(time.perf_counter() - started, 3)
+        )
+        logger.info(f"모델 교체 완료: {name} {status['previous_version']} -> {standby.model_version}")
+        await self._release_retired()
+        await self._enforce_budget()
+
+    async def _release_retired(self) -> None:
+        """교체된 인스턴스 중 빌려 간 요청이 없는 것을 언로드"""
+        with self._lock:
+            idle = [s for s in self._retiring if self._leases.get(s, 0) == 0]
+            self._retiring = [s for s in self._retiring if s not in idle]
+        for service in idle:
+            logger.info(f"교체 전 모델 언로드: {service.name} ({service.model_version})")
+            await asyncio.to_thread(service.unload)
+
+    def _touch(self, name: str) -> None:
+        """최근 사용 순서 갱신"""
+        with self._lock:
+            self._resident[name] = None
+            self._resident.move_to_end(name)
+
+    def _resident_mb(self) -> float:
+        """상주 모델 가중치 총량 (MB, 언로드 대기 중인 교체 전 인스턴스 포함)"""
+        current = sum(KoELECTRAService(name).memory_footprint_mb or 0.0 for name in self._resident)
+        return current + sum(s.memory_footprint_mb or 0.0 for s in self._retiring)
+
+    async def _enforce_budget(self) -> None:
+        """한도를 넘으면 빌려 간 곳이 없는 LRU 모델부터 언로드"""
+        victims = []
+        with self._lock:
+            # 다른 경로(직접 load/unload)로 상태가 바뀐 모델 정리
+            for name in [n for n in self._resident if not KoELECTRAService(n).is_ready]:
+                del self._resident[name]
+
+            used = self._resident_mb()
+            if self._budget > 0 and used > self._budget:
+                for name in list(self._resident):
+                    if used <= self._budget:
+                        break
+                    service = KoELECTRAService(name)
+                    if name == self._default or self._leases.get(service, 0) > 0:
+                        continue
+                    used -= service.memory_footprint_mb or 0.0
+                    del self._resident[name]
+                    victims.append(service)
+                if used > self._budget:
+                    logger.warning(f"모델 메모리 한도 초과 상태 유지 (사용 중인 모델): {used:.1f}MB / {self._budget}MB")
+
+        for service in victims:
+            await self._evict(service)
+        RESIDENT_MODELS_MB.set(self._resident_mb())
+    
+    async def _evict(self, service: KoELECTRAService) -> None:
+        """
+        축출 대상 언로드
+        
+        모델별 로딩 잠금을 잡은 상태에서 언로드하므로, 그 사이 acquire한 요청은 ensure_loaded에서
+        언로드가 끝나기를 기다린 뒤 다시 로드합니다. 축출 결정 이후 대여되었거나 다시 사용된
+        모델은 언로드하지 않습니다.
+        """
+        name = service.name
+        async with self._loading.setdefault(name, asyncio.Lock()):
+            with self._lock:
+                if KoELECTRAService(name) is not service or name in self._resident:
+                    return
+                if self._leases.get(service, 0) > 0:
+                    logger.info(f"축출 취소 (사용 중인 모델): {name}")
+                    self._resident[name] = None
+                    return
+                self._evictions += 1
+            logger.info(f"메모리 한도 초과로 모델 언로드: {name}")
+            await asyncio.to_thread(service.unload)
+        MODEL_EVICTIONS.labels(model=name).inc()
+
+    def get_stats(self) -> Dict:
+        """
+        레지스트리 상태 조회
+
+        Returns:
+            메모리 한도/사용량, 모델별 상주 여부/크기/버전/대여 수, 언로드 대기 중인 교체 전 모델
+        """
+        with self._lock:
+            resident = list(self._resident)
+            return {
+                "default_model": self._default,
+                "memory_budget_mb": self._budget,
+                "resident_mb": round(self._resident_mb(), 1),
+                "loads": self._loads,
+                "evictions": self._evictions,
+                "models": [
+                    {
+                        "name": name,
+                        "model_path": self._paths.get(name),
+                        "model_version": KoELECTRAService(name).model_version,
+                        "resident": name in resident,
+                        "lru_rank": resident[::-1].index(name) if name in resident else None,
+                        "memory_footprint_mb": KoELECTRAService(name).memory_footprint_mb,
+                        "ready": KoELECTRAService(name).is_ready,
+                        "leases": self._leases.get(KoELECTRAService(name), 0),
+                        "swap": self._swaps.get(name)
+                    }
+                    for name in self._names
+                ],
+                "retiring": [
+                    {"name": s.name, "model_version": s.model_version, "leases": self._leases.get(s, 0)}
+                    for s in self._retiring
+                ]
+            }
@@ -1,42 +1,202 @@
 """
 KoELECTRA 감성 분석 라우터
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from starlette.background import BackgroundTask
+from typing import AsyncIterator, Dict, List, Literal, Optional
+import asyncio
+import hmac
 import logging
+import os
 
+from ..config import TransformerServiceConfig
+from .koelectra_batcher import KoELECTRABatcher
+from .koelectra_cache import SentimentCache
+from .koelectra_executor import InferenceExecutor, InferenceQueueFullError
+from .koelectra_metrics import TimedJSONResponse
+from .koelectra_model_server import ModelServerClient
+from .koelectra_registry import ModelRegistry, SwapInProgressError, UnknownModelError
 from .koelectra_service import KoELECTRAService
+from .koelectra_singleflight import SingleFlight
+from .koelectra_stream import stream_sentiment
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/koelectra", tags=["koelectra"])
+router = APIRouter(
+    prefix="/koelectra",
+    tags=["koelectra"],
+    default_response_class=TimedJSONResponse  # JSON 직렬화 시간을 /metrics에 기록
+)
+
+# 설정 로드
+config = TransformerServiceConfig()
 
 # 서비스 인스턴스 (싱글톤)
-_koelectra_service = None
+_model_registry = None
+_koelectra_batchers: Dict[str, KoELECTRABatcher] = {}
+_inference_executor = None
+_single_flight = None
+_model_server_client = None
 
 
-def get_koelectra_service() -> KoELECTRAService:
-    """KoELECTRA 서비스 인스턴스 반환 (의존성 주입)"""
-    global _koelectra_service
-    if _koelectra_service is None:
-        _koelectra_service = KoELECTRAService()
-        # 서비스 시작 시 모델 로드
-        try:
-            _koelectra_service.load_model()
-        except FileNotFoundError as e:
-            logger.error(f"모델 파일을 찾을 수 없습니다: {str(e)}")
-            raise HTTPException(
-                status_code=503, 
-                detail="모델 파일이 없습니다. 모델을 다운로드하거나 모델 경로를 확인하세요. download_model.py를 실행하여 모델을 다운로드할 수 있습니다."
-            )
-        except Exception as e:
-            logger.error(f"모델 로딩 실패: {str(e)}")
-            raise HTTPException(
-                status_code=503,
-                detail=f"모델 로딩 실패: {str(e)}. 모델 파일이 손상되었거나 불완전할 수 있습니다."
-            )
-    return _koelectra_service
+def get_model_registry() -> ModelRegistry:
+    """모델 레지스트리 반환"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry(
+            models=config.models,
+            default_model=config.default_model,
+            memory_budget_mb=config.model_memory_budget_mb,
+            warmup=config.warmup_enabled
+        )
+    return _model_registry
+
+
+def get_model_name(
+    model: Optional[str] = Query(None, description="사용할 모델 이름 (기본: default_model, 목록은 /koelectra/models)")
+) -> str:
+    """요청의 모델 이름 확인 (등록되지 않은 이름은 404)"""
+    try:
+        return get_model_registry().resolve(model)
+    except UnknownModelError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+async def _acquire_service(name: str) -> KoELECTRAService:
+    """레지스트리에서 모델을 빌려 옴 (필요 시 로드, 실패 시 503)"""
+    try:
+        return await get_model_registry().acquire(name)
+    except FileNotFoundError as e:
+        logger.error(f"모델 파일을 찾을 수 없습니다: {str(e)}")
+        raise HTTPException(
+            status_code=503, 
+            detail="모델 파일이 없습니다. 모델을 다운로드하거나 모델 경로를 확인하세요. download_model.py를 실행하여 모델을 다운로드할 수 있습니다."
+        )
+    except Exception as e:
+        logger.error(f"모델 로딩 실패: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"모델 로딩 실패: {str(e)}. 모델 파일이 손상되었거나 불완전할 수 있습니다."
+        )
+
+
+async def get_koelectra_service(name: str = Depends(get_model_name)) -> AsyncIterator[KoELECTRAService]:
+    """요청한 모델의 KoELECTRA 서비스 반환 (의존성 주입, 요청 처리 중에는 축출되지 않음)"""
+    service = await _acquire_service(name)
+    try:
+        yield service
+    finally:
+        await get_model_registry().release(service)
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """추론 전용 실행기 반환 (의존성 주입)"""
+    global _inference_executor
+    if _inference_executor is None:
+        _inference_executor = InferenceExecutor(
+            max_workers=config.inference_workers,
+            max_queue_size=config.inference_queue_size,
+            retry_after=config.inference_retry_after
+        )
+    return _inference_executor
+
+
+def get_koelectra_batcher(
+    service: KoELECTRAService = Depends(get_koelectra_service),
+    executor: InferenceExecutor = Depends(get_inference_executor)
+) -> Optional[KoELECTRABatcher]:
+    """모델별 마이크로 배칭 집계기 반환 (비활성화 시 None)"""
+    if not config.micro_batch_enabled:
+        return None
+    batcher = _koelectra_batchers.get(service.name)
+    if batcher is not None and batcher.service is not service:
+        # 모델이 교체되었으면 다음 배치부터 새 모델 사용
+        batcher.rebind(KoELECTRAService(service.name))
+    if batcher is None:
+        batcher = _koelectra_batchers[service.name] = KoELECTRABatcher(
+            service,
+            executor,
+            max_batch_size=config.micro_batch_max_size,
+            max_wait_ms=config.micro_batch_max_wait_ms,
+            max_pending=config.micro_batch_max_pending,
+            retry_after=config.inference_retry_after
+        )
+    return batcher
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """동일 요청 합류기 반환 (비활성화 시 None)"""
+    global _single_flight
+    if not config.coalesce_enabled:
+        return None
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
+
+
+def get_model_server_client() -> ModelServerClient:
+    """준비 상태 확인용 모델 서버 클라이언트 반환 (단일 모델 서버 모드)"""
+    global _model_server_client
+    if _model_server_client is None:
+        _model_server_client = ModelServerClient(config.model_server_socket, timeout=3.0)
+    return _model_server_client
+
+
+def verify_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """관리 API 토큰 확인 (admin_token 미설정 시 관리 API 비활성화)"""
+    if not config.admin_token:
+        raise HTTPException(status_code=404, detail="관리 API가 비활성화되어 있습니다.")
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token.encode("utf-8"), config.admin_token.encode("utf-8")
+    ):
+        raise HTTPException(status_code=403, detail="관리 API 토큰이 올바르지 않습니다.")
+
+
+def resolve_swap_path(model_path: str) -> str:
+    """
+    교체할 모델 경로 확인 (model_swap_root 아래 또는 설정된 모델 경로만 허용)
+    
+    Returns:
+        심볼릭 링크를 해석한 실제 경로
+        
+    Raises:
+        HTTPException: 허용되지 않은 경로 (403)
+    """
+    path = os.path.realpath(model_path)
+    allowed = {
+        os.path.realpath(p)
+        for p in [KoELECTRAService.resolve_model_path(config.model_path), *config.models.values()]
+    }
+    if path in allowed:
+        return path
+    if config.model_swap_root:
+        root = os.path.realpath(config.model_swap_root)
+        if os.path.commonpath([root, path]) == root and path != root:
+            return path
+    raise HTTPException(status_code=403, detail=f"허용되지 않은 모델 경로입니다: {model_path}")
+
+
+async def shutdown_koelectra() -> None:
+    """마이크로 배칭 워커 및 추론 실행기 종료 (서비스 종료 시 호출)"""
+    global _inference_executor
+    for batcher in _koelectra_batchers.values():
+        await batcher.stop()
+    _koelectra_batchers.clear()
+    if _inference_executor is not None:
+        _inference_executor.shutdown()
+        _inference_executor = None
+
+
+def _overloaded(e: InferenceQueueFullError) -> HTTPException:
+    """추론 대기열 초과를 503 + Retry-After 응답으로 변환"""
+    logger.warning(f"추론 대기열 초과로 요청 거절: {str(e)}")
+    return HTTPException(
+        status_code=503,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)}
+    )
 
 
 # 요청/응답 모델
@@ -67,12 +227,41 @@ class BatchSentimentRequest(BaseModel):
         }
 
 
+class LongSentimentRequest(BaseModel):
+    """긴 문서 감성 분석 요청 모델"""
+    texts: List[str] = Field(..., description="분석할 문서 리스트", min_items=1, max_items=100)
+    pooling: Literal["mean", "weighted"] = Field(
+        "mean", description="윈도우 점수 집계 방식 (mean: 평균, weighted: 토큰 수 가중 평균)"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "texts": ["처음에는 지루했지만 후반부 전개가 정말 좋았어요. ..."],
+                "pooling": "weighted"
+            }
+        }
+
+
 class SentimentResponse(BaseModel):
     """감성 분석 응답 모델"""
     text: str
     sentiment: str
     confidence: dict
     score: float
+    model_version: Optional[str] = None
+
+
+class ModelSwapRequest(BaseModel):
+    """모델 교체 요청 모델"""
+    model_path: str = Field(..., description="새 모델 디렉토리 (컨테이너 내부 경로, model_swap_root 아래 또는 설정된 모델 경로만 허용)", min_length=1)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "model_path": "/app/app/koelectra/koelectra_model_v2"
+            }
+        }
 
 
 class BatchSentimentResponse(BaseModel):
@@ -81,10 +270,25 @@ class BatchSentimentResponse(BaseModel):
     total: int
 
 
+class LongSentimentResponse(SentimentResponse):
+    """긴 문서 감성 분석 응답 모델"""
+    windows: int = 0
+    tokens: int = 0
+
+
+class BatchLongSentimentResponse(BaseModel):
+    """긴 문서 배치 감성 분석 응답 모델"""
+    results: List[LongSentimentResponse]
+    total: int
+
+
 @router.post("/sentiment", response_model=SentimentResponse)
 async def analyze_sentiment(
     request: SentimentRequest,
-    service: KoELECTRAService = Depends(get_koelectra_service)
+    service: KoELECTRAService = Depends(get_koelectra_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    batcher: Optional[KoELECTRABatcher] = Depends(get_koelectra_batcher),
+    single_flight: Optional[SingleFlight] = Depends(get_single_flight)
 ):
     """
     단일 텍스트의 감성 분석
@@ -94,9 +298,34 @@ async def analyze_sentiment(
     Returns:
         감성 분석 결과 (positive/negative, 신뢰도 점수 포함)
     """
+    async def infer():
+        if batcher is not None:
+            # 동시 요청을 모아 한 번의 forward pass로 처리
+            return await batcher.submit(request.text)
+        return await executor.run(service.analyze_sentiment, request.text)
+    
+    def shared_infer():
+        # 공유 작업은 리더 요청이 취소(연결 종료 등)되어도 계속 실행되므로 자체 대여를 잡고,
+        # 작업이 끝날 때 반납하여 추론 중인 모델이 축출/교체 후 언로드되지 않도록 함
+        registry = get_model_registry()
+        registry.retain(service)
+        
+        async def run():
+            try:
+                return await infer()
+            finally:
+                await registry.release(service)
+        return run()
+    
     try:
-        result = service.analyze_sentiment(request.text)
-        return result
+        if single_flight is not None and request.text.strip():
+            # 같은 모델/텍스트의 추론이 진행 중이면 그 결과를 함께 사용
+            key = (service.get_model_identity(), SentimentCache.normalize(request.text))
+            result = await single_flight.do(key, shared_infer)
+            return {**result, "text": request.text.strip()}
+        return await infer()
+    except InferenceQueueFullError as e:
+        raise _overloaded(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -107,7 +336,8 @@ async def analyze_sentiment(
 @router.post("/sentiment/batch", response_model=BatchSentimentResponse)
 async def analyze_sentiment_batch(
     request: BatchSentimentRequest,
-    service: KoELECTRAService = Depends(get_koelectra_service)
+    service: KoELECTRAService = Depends(get_koelectra_service),
+    executor: InferenceExecutor = Depends(get_inference_executor)
 ):
     """
     여러 텍스트의 배치 감성 분석
@@ -118,8 +348,10 @@ async def analyze_sentiment_batch(
         배치 감성 분석 결과 리스트
     """
     try:
-        result = service.analyze_sentiment_batch(request.texts)
+        result = await executor.run(service.analyze_sentiment_batch, request.texts)
         return result
+    except InferenceQueueFullError as e:
+        raise _overloaded(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -127,9 +359,99 @@ async def analyze_sentiment_batch(
         raise HTTPException(status_code=500, detail=f"배치 감성 분석 중 오류 발생: {str(e)}")
 
 
+@router.post("/sentiment/long", response_model=BatchLongSentimentResponse)
+async def analyze_sentiment_long(
+    request: LongSentimentRequest,
+    service: KoELECTRAService = Depends(get_koelectra_service),
+    executor: InferenceExecutor = Depends(get_inference_executor)
+):
+    """
+    긴 문서의 슬라이딩 윈도우 감성 분석
+    
+    - **texts**: 분석할 문서 리스트 (최대 100개, 길이 제한 없음)
+    - **pooling**: 윈도우 점수 집계 방식 (mean / weighted)
+    
+    Returns:
+        문서별 집계 감성 분석 결과 (윈도우 수, 토큰 수 포함)
+    """
+    try:
+        result = await executor.run(service.analyze_sentiment_long, request.texts, request.pooling)
+        return result
+    except InferenceQueueFullError as e:
+        raise _overloaded(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"긴 문서 감성 분석 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"긴 문서 감성 분석 중 오류 발생: {str(e)}")
+
+
+@router.post(
+    "/sentiment/stream",
+    response_class=StreamingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {
+                    "schema": {"type": "string"},
+                    "example": '{"text": "정말 최고의 영화예요!"}\n{"text": "별로 재미없었습니다."}\n'
+                }
+            }
+        }
+    }
+)
+async def analyze_sentiment_stream(
+    request: Request,
+    name: str = Depends(get_model_name),
+    executor: InferenceExecutor = Depends(get_inference_executor)
+):
+    """
+    NDJSON 스트리밍 감성 분석 (개수 제한 없음)
+    
+    - 요청 본문: 한 줄에 하나씩 {"text": "..."} 객체 또는 JSON 문자열 (NDJSON / JSON Lines)
+    - 입력을 내부 배치 단위로 추론하여 완료되는 대로 결과를 전송합니다.
+    
+    Returns:
+        입력 순서대로 {"index": 순번, ...감성 분석 결과} NDJSON 스트림
+        (파싱 실패 줄은 sentiment "error"로 반환)
+    """
+    # 스트림이 끝날 때까지 모델을 빌려 두고 응답 전송 후 반납
+    # (본문 생성 중 예외가 나면 Starlette가 background를 건너뛰므로 생성기 finally에서도 반납, 한 번만 실행)
+    service = await _acquire_service(name)
+    released = False
+    
+    async def release() -> None:
+        nonlocal released
+        if not released:
+            released = True
+            await get_model_registry().release(service)
+    
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in stream_sentiment(
+                request.stream(),
+                service,
+                executor,
+                batch_size=config.stream_batch_size,
+                max_line_bytes=config.stream_max_line_bytes
+            ):
+                yield chunk
+        finally:
+            await release()
+    
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(release)
+    )
+
+
 @router.get("/model/info")
 async def get_model_info(
-    service: KoELECTRAService = Depends(get_koelectra_service)
+    service: KoELECTRAService = Depends(get_koelectra_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    batcher: Optional[KoELECTRABatcher] = Depends(get_koelectra_batcher)
 ):
     """
     모델 정보 조회
@@ -139,13 +461,104 @@ async def get_model_info(
     """
     try:
         info = service.get_model_info()
+        info["registry"] = get_model_registry().get_stats()
+        info["micro_batching"] = batcher.get_stats() if batcher is not None else None
+        info["inference_executor"] = executor.get_stats()
+        single_flight = get_single_flight()
+        info["single_flight"] = single_flight.get_stats() if single_flight is not None else None
         return info
     except Exception as e:
         logger.error(f"모델 정보 조회 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"모델 정보 조회 중 오류 발생: {str(e)}")
 
 
+@router.get("/models")
+async def list_models():
+    """
+    등록된 모델 목록 및 상주 상태 조회
+    
+    Returns:
+        메모리 한도/사용량과 모델별 상주 여부, 가중치 크기, 최근 사용 순위
+    """
+    return get_model_registry().get_stats()
+
+
+@router.post("/admin/models/swap", status_code=202, dependencies=[Depends(verify_admin_token)])
+async def swap_model(
+    request: ModelSwapRequest,
+    name: str = Depends(get_model_name)
+):
+    """
+    모델 무중단 교체 시작
+    
+    - **model_path**: 새 모델 디렉토리 (model_swap_root 아래 또는 model_path/models 경로, 그 외 403)
+    - **model** (query): 교체할 모델 이름 (기본: default_model)
+    
+    단일 모델 서버 모드(model_server_socket 설정)에서는 409를 반환합니다.
+    새 모델을 백그라운드에서 로드/워밍업한 뒤 원자적으로 교체합니다.
+    처리 중인 요청은 기존 모델로 끝나고, 기존 모델은 그 뒤에 해제됩니다.
+    진행 상태는 GET /koelectra/admin/models/swap으로 확인합니다.
+    """
+    if config.model_server_socket:
+        # 모델은 모델 서버 프로세스가 가지고 있으므로 워커 레지스트리를 바꿔도 실제 모델은 그대로임
+        raise HTTPException(
+            status_code=409,
+            detail="단일 모델 서버 모드에서는 모델을 교체할 수 없습니다. 모델 서버를 새 모델 경로로 재시작하세요."
+        )
+    model_path = resolve_swap_path(request.model_path)
+    try:
+        return get_model_registry().start_swap(name, model_path)
+    except SwapInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/admin/models/swap", dependencies=[Depends(verify_admin_token)])
+async def get_swap_status(name: str = Depends(get_model_name)):
+    """
+    최근 모델 교체 상태 조회
+    
+    Returns:
+        state (loading / warming / completed / failed), 이전/새 모델 버전, 소요 시간, 실패 사유
+    """
+    status = get_model_registry().get_swap_status(name)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"교체 기록이 없습니다: {name}")
+    return status
+
+
 @router.get("/health")
 async def health_check():
-    """헬스 체크"""
-    return {"status": "healthy", "service": "koelectra"}
+    """헬스 체크 (프로세스 생존 여부, 모델 준비 여부는 /koelectra/ready 참고)"""
+    executor = _inference_executor
+    return {
+        "status": "healthy",
+        "service": "koelectra",
+        "model_ready": KoELECTRAService().is_ready,
+        "inference_queue_depth": executor.queue_depth if executor is not None else 0
+    }
+
+
+@router.get("/ready")
+async def readiness_check():
+    """
+    준비 상태 체크
+    
+    모델 로드와 워밍업이 끝난 뒤에만 200을 반환하고, 그 전에는 503을 반환합니다.
+    단일 모델 서버 모드에서는 모델 서버가 응답하지 않아도 503을 반환합니다.
+    로딩/워밍업/첫 추론 시간을 함께 반환하므로 배포 시 트래픽 전환 기준으로 사용할 수 있습니다.
+    """
+    metrics = KoELECTRAService().get_startup_metrics()
+    if not metrics["ready"]:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "not_ready", "service": "koelectra", **metrics}
+        )
+    if config.model_server_socket:
+        try:
+            await asyncio.to_thread(get_model_server_client().ping)
+        except (OSError, RuntimeError) as e:
+            return JSONResponse(
+                status_code=503,
+                content={"status": "model_server_unavailable", "service": "koelectra", "error": str(e), **metrics}
+            )
+    return {"status": "ready", "service": "koelectra", **metrics}
@@ -1,50 +1,282 @@
 """
 KoELECTRA 감성 분석 서비스
 """
+import gc
 import os
-import torch
+import hashlib
+import random
+import sys
+import threading
+import time
+import numpy as np
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import TYPE_CHECKING, Dict, Optional, List, Union
 import logging
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+
+from ..config import TransformerServiceConfig
+from .koelectra_cache import SentimentCache
+from .koelectra_cascade import HashedNgramClassifier
+from .koelectra_metrics import (
+    BATCH_SIZE, CASCADE_AGREEMENT, CASCADE_REQUESTS, DEDUPLICATED, STAGE_SECONDS, TOKENS, process_memory
+)
+from .koelectra_model_server import ModelServerClient
+
+# torch에 의존하는 모듈(autotune, compile, mmap, quantization)과 torch는 PyTorch 경로에서만 import
+# (onnxruntime 백엔드나 모델 서버 워커만 쓰는 이미지에는 torch가 없어도 됨)
+if TYPE_CHECKING:
+    from .koelectra_compile import CompiledClassifier
 
 logger = logging.getLogger(__name__)
 
+# 설정 로드
+config = TransformerServiceConfig()
+
+# 모델 버전 지문에 포함할 파일 (모델 설정, 토크나이저, 가중치)
+_FINGERPRINT_PATTERNS = (
+    "config.json",
+    "tokenizer*.json",
+    "special_tokens_map.json",
+    "added_tokens.json",
+    "vocab.txt",
+    "*.model",
+    "*.safetensors",
+    "*.bin",
+    "*.index.json"
+)
+
 
 class KoELECTRAService:
     """
     KoELECTRA 모델을 사용한 감성 분석 서비스
-    싱글톤 패턴으로 모델을 한 번만 로드
+    모델 이름별 싱글톤 패턴으로 모델마다 한 번만 로드 (KoELECTRAService()는 기본 모델)
     """
-    _instance = None
+    _instances: Dict[str, "KoELECTRAService"] = {}
+    _instances_lock = threading.Lock()
+    
+    _name = None
+    _labels = ["negative", "positive"]
+    _footprint_mb = None
     _model = None
+    _weights_mmap = None
+    _session = None
     _tokenizer = None
     _is_loaded = False
     _model_path = None
+    _model_version = None
+    _quantization = "none"
+    _backend = "pytorch"
+    _compiled = None
+    _remote = None  # 모델 서버 클라이언트 (model_server_socket 설정 시)
+    _cache = None
+    
+    # CPU 자동 튜닝 결과 (배치 크기는 설정값보다 우선)
+    _autotune = None
+    _batch_size = None
+    
+    # 로딩/준비 상태 및 콜드 스타트 지표 (잠금은 모델별로 __new__에서 생성)
+    _load_error = None
+    _is_warmed = False
+    _warming = False
+    _load_seconds = None
+    _warmup_seconds = None
+    _first_inference_seconds = None
+    
+    # 패딩 효율 통계
+    _real_tokens = 0
+    _padded_tokens = 0
+    _batch_duplicates = 0
+    
+    # 캐스케이드 사전 분류기 및 통계
+    _cascade = None
+    _cascade_requests = 0
+    _cascade_answered = 0
+    _cascade_audited = 0
+    _cascade_agreed = 0
+    
+    def __new__(cls, name: Optional[str] = None):
+        """
+        Args:
+            name: 모델 이름 (None이면 default_model)
+        """
+        name = name or config.default_model
+        with cls._instances_lock:
+            instance = cls._instances.get(name)
+            if instance is None:
+                instance = cls._instances[name] = cls._create(name)
+        return instance
+    
+    @classmethod
+    def _create(cls, name: str) -> "KoELECTRAService":
+        """등록하지 않은 새 인스턴스 생성 (모델별 로딩/통계 잠금 포함)"""
+        instance = super().__new__(cls)
+        instance._name = name
+        instance._load_lock = threading.Lock()
+        instance._stats_lock = threading.Lock()
+        return instance
+    
+    @classmethod
+    def create_standby(cls, name: Optional[str] = None) -> "KoELECTRAService":
+        """
+        무중단 교체용 대기 인스턴스 생성
+        
+        replace로 등록하기 전까지 KoELECTRAService(name)은 기존 인스턴스를 반환하므로
+        기존 모델로 요청을 계속 처리하면서 새 모델을 로드/워밍업할 수 있습니다.
+        """
+        return cls._create(name or config.default_model)
+    
+    @classmethod
+    def replace(cls, instance: "KoELECTRAService") -> Optional["KoELECTRAService"]:
+        """
+        이름에 등록된 인스턴스를 원자적으로 교체
+        
+        Returns:
+            교체 전 인스턴스 (없으면 None) - 처리 중인 요청은 이 인스턴스로 끝까지 처리됨
+        """
+        with cls._instances_lock:
+            previous = cls._instances.get(instance.name)
+            cls._instances[instance.name] = instance
+        return previous
+    
+    @property
+    def name(self) -> str:
+        """모델 이름"""
+        return self._name
+    
+    @property
+    def model_version(self) -> Optional[str]:
+        """로드된 모델 버전"""
+        return self._model_version
+    
+    @property
+    def is_loaded(self) -> bool:
+        """모델 로드 여부 (워밍업 여부와 무관)"""
+        return self._is_loaded
     
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    @property
+    def labels(self) -> List[str]:
+        """출력 라벨 이름 (이진 분류는 negative/positive)"""
+        return self._labels
+    
+    @property
+    def memory_footprint_mb(self) -> Optional[float]:
+        """로드된 가중치 크기 (MB, 로드 전에는 None)"""
+        return self._footprint_mb
     
     def load_model(self, model_path: Optional[str] = None) -> None:
         """
         KoELECTRA 모델 및 토크나이저 로드
         
         Args:
-            model_path: 모델 경로 (None이면 기본 경로 사용)
+            model_path: 모델 경로 (None이면 설정값 또는 기본 경로 사용)
+        """
+        # 기본 모델이 아니면 models 설정에 등록된 경로 사용
+        if model_path is None and self._name != config.default_model:
+            model_path = config.models.get(self._name)
+            if model_path is None:
+                raise FileNotFoundError(f"등록되지 않은 모델입니다: {self._name}")
+        
+        # 시작 시 백그라운드 로딩과 첫 요청의 로딩이 겹쳐도 한 번만 로드
+        with self._load_lock:
+            if self._is_loaded:
+                logger.info("모델이 이미 로드되어 있습니다.")
+                return
+            
+            started = time.perf_counter()
+            try:
+                self._apply_autotune(model_path)
+                self._load_model(model_path)
+            except Exception as e:
+                self._load_error = str(e)
+                raise
+            self._load_error = None
+            self._load_seconds = round(time.perf_counter() - started, 3)
+            logger.info(f"모델 로딩 시간: {self._load_seconds}초")
+    
+    def unload(self) -> None:
         """
-        if self._is_loaded:
-            logger.info("모델이 이미 로드되어 있습니다.")
+        모델 메모리 해제 (레지스트리의 LRU 축출 시 호출)
+        
+        결과 캐시와 통계는 유지하며, 다음 load_model 호출 시 다시 로드합니다.
+        """
+        with self._load_lock:
+            if not self._is_loaded:
+                return
+            self._is_loaded = False
+            self._is_warmed = False
+            self._model = None
+            self._compiled = None
+            self._session = None
+            self._remote = None
+            self._weights_mmap = None
+            self._tokenizer = None
+            self._footprint_mb = None
+        gc.collect()
+        torch = sys.modules.get("torch")  # PyTorch 백엔드를 사용한 적이 있을 때만 로드되어 있음
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        logger.info(f"모델 언로드 완료: {self._name}")
+    
+    @staticmethod
+    def resolve_model_path(model_path: Optional[str] = None) -> str:
+        """모델 경로 결정 (인자 -> 설정값 -> 기본 경로)"""
+        if model_path is None:
+            model_path = config.model_path
+        if model_path is None:
+            # 기본 경로: 현재 파일 기준 상대 경로
+            base_dir = Path(__file__).parent
+            model_path = str(base_dir / "koelectra_model")
+        return model_path
+    
+    @classmethod
+    def resolve_autotune_file(cls, model_path: Optional[str] = None) -> str:
+        """자동 튜닝 결과 파일 경로 (기본값: 모델 경로 내 autotune.json)"""
+        return config.autotune_file or str(Path(cls.resolve_model_path(model_path)) / "autotune.json")
+    
+    def _apply_autotune(self, model_path: Optional[str]) -> None:
+        """
+        저장된 CPU 자동 튜닝 결과 적용 (모델 로드 전, inter-op 스레드 설정이 가능한 시점)
+        
+        autotune_mode가 "startup"이고 저장된 결과가 없으면 벤치마크를 실행해 저장합니다.
+        여러 워커가 동시에 시작하면 파일 잠금을 잡은 워커 하나만 벤치마크를 실행합니다.
+        """
+        if config.autotune_mode == "off" or config.model_server_socket:
+            return
+        if config.autotune_mode not in ("load", "startup"):
+            logger.warning(f"알 수 없는 자동 튜닝 모드입니다: {config.autotune_mode} (off 처리)")
+            return
+        if config.backend != "pytorch" or self._use_gpu():
+            logger.info("자동 튜닝은 PyTorch CPU 추론에서만 적용합니다.")
+            return
+        from .koelectra_autotune import apply_tuning, load_tuning, run_autotune, save_tuning, tuning_lock
+        
+        path = self.resolve_autotune_file(model_path)
+        best = load_tuning(path)
+        if best is None and config.autotune_mode == "startup":
+            # 워커마다 동시에 벤치마크하지 않도록 잠금을 잡은 워커만 측정하고, 나머지는 기다린 뒤 결과를 읽음
+            with tuning_lock(path):
+                best = load_tuning(path)
+                if best is None:
+                    logger.info("저장된 자동 튜닝 결과가 없어 벤치마크를 실행합니다...")
+                    report = run_autotune(
+                        model_path,
+                        batch_candidates=config.autotune_batch_sizes,
+                        samples=config.autotune_samples
+                    )
+                    save_tuning(report, path)
+                    best = report["best"]
+        if best is None:
             return
         
+        apply_tuning(best)
+        self._autotune = best
+        self._batch_size = best["batch_size"]
+    
+    def _load_model(self, model_path: Optional[str]) -> None:
+        """모델 경로 결정 후 토크나이저/모델/캐시 초기화"""
         try:
             # 모델 경로 설정
-            if model_path is None:
-                # 기본 경로: 현재 파일 기준 상대 경로
-                base_dir = Path(__file__).parent
-                model_path = str(base_dir / "koelectra_model")
-            
+            model_path = self.resolve_model_path(model_path)
             self._model_path = model_path
             
             if not os.path.exists(model_path):
@@ -55,33 +287,363 @@ class KoELECTRAService:
             # 토크나이저 로드
             logger.info("토크나이저 로딩 중...")
             self._tokenizer = AutoTokenizer.from_pretrained(model_path)
+            self._labels = self._load_labels(model_path)
             
-            # 모델 로드
-            logger.info("모델 로딩 중...")
-            self._model = AutoModelForSequenceClassification.from_pretrained(model_path)
-            
-            # 평가 모드로 설정
-            self._model.eval()
+            # 모델 버전 (최적화 실행 모드 산출물 캐시 키에도 사용)
+            self._model_version = config.model_version or self._compute_model_version(model_path)
             
-            # GPU 사용 가능 여부 확인
-            device = "cuda" if torch.cuda.is_available() and self._use_gpu() else "cpu"
-            if device == "cuda":
-                self._model = self._model.to(device)
-                logger.info(f"GPU 사용: {device}")
+            # 추론 백엔드별 모델 로드 (모델 서버 사용 시 워커는 토크나이저만 보유)
+            if config.model_server_socket:
+                self._connect_model_server()
+            elif config.backend == "onnxruntime":
+                self._load_onnx_session(model_path)
             else:
-                logger.info("CPU 사용")
+                if config.backend != "pytorch":
+                    logger.warning(f"알 수 없는 추론 백엔드입니다: {config.backend} (pytorch 사용)")
+                self._load_pytorch_model(model_path)
+            self._footprint_mb = self._measure_footprint_mb()
+            
+            self._cascade = self._load_cascade(model_path)
+            
+            # 결과 캐시 설정 (모델 식별자가 바뀌면 이전 결과는 무효화)
+            if config.sentiment_cache_enabled:
+                if self._cache is None:
+                    self._cache = SentimentCache(
+                        max_entries=config.sentiment_cache_max_entries,
+                        ttl_seconds=config.sentiment_cache_ttl_seconds,
+                        redis_enabled=config.sentiment_cache_redis_enabled
+                    )
+                self._cache.bind_model(self.get_model_identity())
             
             self._is_loaded = True
-            logger.info("모델 로딩 완료")
+            logger.info(f"모델 로딩 완료: {self._name} (버전: {self._model_version}, {self._footprint_mb}MB)")
             
         except Exception as e:
             logger.error(f"모델 로딩 실패: {str(e)}")
             raise
     
+    @staticmethod
+    def _load_labels(model_path: str) -> List[str]:
+        """모델 설정(id2label)의 라벨 이름 (이진 분류는 0: negative, 1: positive)"""
+        model_config = AutoConfig.from_pretrained(model_path)
+        if model_config.num_labels == 2:
+            return ["negative", "positive"]
+        return [model_config.id2label[i] for i in range(model_config.num_labels)]
+    
+    def _load_cascade(self, model_path: str) -> Optional[HashedNgramClassifier]:
+        """캐스케이드 사전 분류기 로드 (비활성화, 다중 분류 모델, 파일 없음이면 None)"""
+        if not config.cascade_enabled:
+            return None
+        if self._labels != ["negative", "positive"]:
+            logger.info(f"캐스케이드는 이진 감성 모델에만 적용합니다: {self._name}")
+            return None
+        path = Path(model_path) / config.cascade_file
+        if not path.exists():
+            logger.warning(
+                f"캐스케이드 분류기를 찾을 수 없습니다: {path}. "
+                "python -m app.koelectra.koelectra_cascade로 학습하세요."
+            )
+            return None
+        logger.info(f"캐스케이드 분류기 로드: {path} (임계값 {config.cascade_threshold})")
+        return HashedNgramClassifier.load(str(path))
+    
+    def _cascade_predict(self, text: str) -> Optional[Dict]:
+        """
+        캐스케이드 분류기 예측
+        
+        Returns:
+            신뢰도가 임계값 이상이면 감성 분석 결과, 아니면 None (KoELECTRA로 추론)
+        """
+        if self._cascade is None:
+            return None
+        positive = self._cascade.predict_proba(text)
+        answered = max(positive, 1.0 - positive) >= config.cascade_threshold
+        with self._stats_lock:
+            self._cascade_requests += 1
+            self._cascade_answered += int(answered)
+        CASCADE_REQUESTS.labels(result="answered" if answered else "deferred").inc()
+        return self._build_result(text, [1.0 - positive, positive]) if answered else None
+    
+    @staticmethod
+    def _should_audit() -> bool:
+        """캐스케이드 응답 중 KoELECTRA로도 추론하여 일치율을 측정할 표본 여부"""
+        return random.random() < config.cascade_audit_rate
+    
+    def _record_audit(self, cascade_label: str, result: Dict) -> None:
+        """캐스케이드 응답과 KoELECTRA 결과 일치 여부 기록"""
+        if result.get("sentiment") == "error":
+            return
+        with self._stats_lock:
+            self._cascade_audited += 1
+            self._cascade_agreed += int(cascade_label == result["sentiment"])
+            CASCADE_AGREEMENT.set(self._cascade_agreed / self._cascade_audited)
+    
+    def _get_cascade_stats(self) -> Optional[Dict]:
+        """캐스케이드 응답 비율과 표본 일치율"""
+        if self._cascade is None:
+            return None
+        with self._stats_lock:
+            return {
+                "threshold": config.cascade_threshold,
+                "requests": self._cascade_requests,
+                "answered": self._cascade_answered,
+                "answered_ratio": round(self._cascade_answered / self._cascade_requests, 4) if self._cascade_requests else 0.0,
+                "audited": self._cascade_audited,
+                "agreement": round(self._cascade_agreed / self._cascade_audited, 4) if self._cascade_audited else None
+            }
+    
+    def _measure_footprint_mb(self) -> float:
+        """로드된 가중치 크기 (MB, 양자화된 packed 가중치 포함, ONNX는 파일 크기, 모델 서버 사용 시 0)"""
+        if self._remote is not None:
+            return 0.0
+        if self._session is not None:
+            return round((Path(self._model_path) / config.onnx_model_file).stat().st_size / 1024 ** 2, 1)
+        import torch
+        
+        total = 0
+        for value in self._model.state_dict().values():
+            for tensor in value if isinstance(value, tuple) else (value,):
+                if isinstance(tensor, torch.Tensor):
+                    total += tensor.numel() * tensor.element_size()
+        return round(total / 1024 ** 2, 1)
+    
+    def _load_pytorch_model(self, model_path: str) -> None:
+        """PyTorch 모델 로드 (GPU 이동 및 양자화 포함)"""
+        import torch
+        from .koelectra_mmap import SAFETENSORS_FILE, load_mmap_model
+        from .koelectra_quantization import quantize_dynamic_int8
+        
+        logger.info("모델 로딩 중...")
+        self._weights_mmap = None
+        if config.weights_mmap and (Path(model_path) / SAFETENSORS_FILE).exists():
+            # 워커 간 가중치 페이지 공유를 위해 safetensors를 메모리 매핑으로 참조
+            self._model, self._weights_mmap = load_mmap_model(model_path)
+            logger.info("safetensors 가중치 메모리 매핑 로딩 완료")
+        else:
+            if config.weights_mmap:
+                logger.warning(f"{SAFETENSORS_FILE}이 없어 일반 로딩을 사용합니다.")
+            self._model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        self._session = None
+        self._backend = "pytorch"
+        
+        # 평가 모드로 설정
+        self._model.eval()
+        
+        # GPU 사용 가능 여부 확인
+        device = "cuda" if torch.cuda.is_available() and self._use_gpu() else "cpu"
+        if device == "cuda":
+            self._model = self._model.to(device)
+            logger.info(f"GPU 사용: {device}")
+        else:
+            logger.info("CPU 사용")
+        
+        # INT8 동적 양자화 (CPU 전용)
+        self._quantization = "none"
+        if config.quantization == "dynamic_int8":
+            if self._weights_mmap is not None:
+                logger.warning("양자화는 가중치를 새로 만들기 때문에 메모리 매핑 공유 효과가 사라집니다.")
+            if device == "cpu":
+                logger.info("Linear 레이어 INT8 동적 양자화 적용 중...")
+                self._model = quantize_dynamic_int8(self._model)
+                self._quantization = "dynamic_int8"
+            else:
+                logger.warning("INT8 동적 양자화는 CPU에서만 지원되어 적용하지 않습니다.")
+        elif config.quantization != "none":
+            logger.warning(f"알 수 없는 양자화 모드입니다: {config.quantization}")
+        
+        self._compiled = self._build_compiled(model_path)
+    
+    def _build_compiled(self, model_path: str) -> Optional["CompiledClassifier"]:
+        """
+        TorchScript / torch.compile 실행 모드 준비 (eager이거나 준비 실패 시 None)
+        
+        eager와 결과가 다르거나 추적/컴파일에 실패하면 경고 후 eager로 실행합니다.
+        """
+        mode = config.execution_mode
+        if mode == "eager":
+            return None
+        from .koelectra_compile import EXECUTION_MODES, CompiledClassifier
+        if mode not in EXECUTION_MODES:
+            logger.warning(f"알 수 없는 실행 모드입니다: {mode} (eager 사용)")
+            return None
+        
+        buckets = sorted({min(b, config.max_seq_length) for b in config.compile_seq_buckets} | {config.max_seq_length})
+        cache_dir = config.compile_cache_dir or str(Path(model_path) / "compiled")
+        try:
+            compiled = CompiledClassifier(
+                self._model,
+                mode,
+                buckets,
+                cache_dir,
+                artifact_key=f"{self._model_version}-{self._quantization}-{next(self._model.parameters()).device.type}",
+                pad_token_id=self._tokenizer.pad_token_id or 0
+            )
+            diff = compiled.verify()
+        except Exception as e:
+            logger.warning(f"{mode} 실행 모드 준비 실패 (eager 사용): {str(e)}")
+            return None
+        logger.info(f"{mode} 실행 모드 사용 (버킷 {buckets}, eager 대비 최대 오차 {diff:.6f})")
+        return compiled
+    
+    def _connect_model_server(self) -> None:
+        """
+        모델 서버 연결 (서버가 모델을 준비할 때까지 model_server_timeout 동안 재시도)
+        
+        모델 버전은 서버가 로드한 모델의 버전을 사용합니다.
+        """
+        client = ModelServerClient(config.model_server_socket, timeout=config.model_server_timeout)
+        deadline = time.monotonic() + config.model_server_timeout
+        while True:
+            try:
+                version = client.ping()["models"].get(self._name)
+                if version is not None:
+                    break
+                error = RuntimeError(f"모델 서버에 로드되지 않은 모델입니다: {self._name}")
+            except (OSError, RuntimeError) as e:
+                error = e
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"모델 서버 연결 실패: {config.model_server_socket} - {str(error)}")
+            time.sleep(0.5)
+        
+        self._remote = client
+        self._model_version = version
+        self._model = None
+        self._session = None
+        self._compiled = None
+        self._quantization = "none"
+        self._backend = "remote"
+        logger.info(f"모델 서버 사용: {config.model_server_socket} (버전: {version})")
+    
+    def infer_features(self, features: List[Dict]) -> List[Union[List[float], Exception]]:
+        """
+        패딩 전 토크나이저 출력으로 추론 (모델 서버가 여러 워커의 요청을 모아 호출)
+        
+        Args:
+            features: 패딩 전 토크나이저 출력 (input_ids, token_type_ids 등) 리스트
+            
+        Returns:
+            항목별 확률 또는 실패 예외
+        """
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load_model()을 먼저 호출하세요.")
+        return self._forward_features(features, self._batch_size or config.batch_size)
+    
+    def _load_onnx_session(self, model_path: str) -> None:
+        """ONNX Runtime 세션 생성 (export_onnx.py로 변환한 모델 필요)"""
+        import onnxruntime as ort
+        
+        onnx_path = Path(model_path) / config.onnx_model_file
+        if not onnx_path.exists():
+            raise FileNotFoundError(
+                f"ONNX 모델을 찾을 수 없습니다: {onnx_path}. export_onnx.py를 실행하여 변환하세요."
+            )
+        
+        logger.info(f"ONNX Runtime 세션 생성 중: {onnx_path}")
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if config.onnx_intra_op_threads > 0:
+            options.intra_op_num_threads = config.onnx_intra_op_threads
+        
+        self._session = ort.InferenceSession(
+            str(onnx_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._model = None
+        self._compiled = None
+        self._backend = "onnxruntime"
+        
+        if config.quantization != "none":
+            logger.warning("ONNX Runtime 백엔드에서는 quantization 설정을 적용하지 않습니다.")
+        self._quantization = "none"
+        logger.info("ONNX Runtime 사용 (CPUExecutionProvider)")
+    
+    def warmup(self) -> None:
+        """
+        대표적인 시퀀스 길이로 더미 추론을 실행하여 첫 요청 지연 제거
+        
+        warmup_seq_lengths의 각 길이에 대해 배치 크기 1과 warmup_batch_size로
+        warmup_rounds번씩 forward pass를 실행한 뒤 준비 완료 상태로 전환합니다.
+        """
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load_model()을 먼저 호출하세요.")
+        
+        started = time.perf_counter()
+        self._warming = True
+        try:
+            for length in config.warmup_seq_lengths:
+                length = min(length, config.max_seq_length)
+                for batch in sorted({1, max(1, config.warmup_batch_size)}):
+                    inputs = self._tokenizer(
+                        ["워밍업용 더미 문장입니다. " * length] * batch,
+                        return_tensors=self._return_tensors,
+                        padding="max_length",
+                        truncation=True,
+                        max_length=length
+                    )
+                    for _ in range(max(1, config.warmup_rounds)):
+                        self._forward(inputs)
+        finally:
+            self._warming = False
+        
+        self._warmup_seconds = round(time.perf_counter() - started, 3)
+        self._is_warmed = True
+        logger.info(f"모델 워밍업 완료: {self._warmup_seconds}초")
+    
+    @property
+    def is_ready(self) -> bool:
+        """트래픽을 받을 준비 여부 (로드 완료 + 워밍업 완료 또는 워밍업 비활성화)"""
+        return self._is_loaded and (self._is_warmed or not config.warmup_enabled)
+    
+    def get_startup_metrics(self) -> Dict:
+        """
+        콜드 스타트 지표 조회
+        
+        Returns:
+            준비 상태, 로딩/워밍업/첫 추론 시간(초), 로딩 실패 사유
+        """
+        return {
+            "ready": self.is_ready,
+            "loaded": self._is_loaded,
+            "warmed": self._is_warmed,
+            "load_seconds": self._load_seconds,
+            "warmup_seconds": self._warmup_seconds,
+            "first_inference_seconds": self._first_inference_seconds,
+            "error": self._load_error
+        }
+    
     def _use_gpu(self) -> bool:
         """GPU 사용 여부 확인 (환경 변수 또는 기본값)"""
         return os.getenv("USE_GPU", "false").lower() == "true"
     
+    @staticmethod
+    def _compute_model_version(model_path: str) -> str:
+        """
+        모델 설정/토크나이저/가중치 파일의 이름/크기/수정 시각으로 모델 버전 지문 계산
+        
+        같은 디렉토리에 나중에 생기는 autotune.json, cascade.npz 등은 결과에 영향을 주지 않으므로 제외하고,
+        ONNX 파일은 onnxruntime 백엔드일 때만 포함합니다.
+        """
+        patterns = list(_FINGERPRINT_PATTERNS)
+        if config.backend == "onnxruntime":
+            patterns.append(config.onnx_model_file)
+        files = {path for pattern in patterns for path in Path(model_path).glob(pattern)}
+        digest = hashlib.sha256()
+        for path in sorted(files):
+            if path.is_file():
+                stat = path.stat()
+                digest.update(f"{path.name}:{stat.st_size}:{int(stat.st_mtime)}".encode("utf-8"))
+        return digest.hexdigest()[:12]
+    
+    def get_model_identity(self) -> str:
+        """캐시 키에 사용하는 모델 식별자 (경로 + 버전 + 백엔드 + 양자화 모드)"""
+        return f"{self._model_path}@{self._model_version}+{self._backend}+{self._quantization}"
+    
+    @property
+    def _return_tensors(self) -> str:
+        """토크나이저 출력 형식 (PyTorch 모델은 텐서, ONNX Runtime/모델 서버는 numpy)"""
+        return "pt" if self._model is not None else "np"
+    
     def analyze_sentiment(self, text: str) -> Dict:
         """
         단일 텍스트의 감성 분석
@@ -107,56 +669,40 @@ class KoELECTRAService:
         if not text or not text.strip():
             raise ValueError("텍스트가 비어있습니다.")
         
+        text = text.strip()
+        
+        # 캐시 적중 시 토크나이징/추론 생략
+        cache_key = self._cache.make_key(text) if self._cache is not None else None
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return {"text": text, **cached}
+        
+        # 캐스케이드 분류기가 확신하면 KoELECTRA 추론 생략 (표본은 함께 추론하여 일치율 측정)
+        cascade_result = self._cascade_predict(text)
+        if cascade_result is not None and not self._should_audit():
+            return cascade_result
+        
         try:
-            # 텍스트 전처리
-            text = text.strip()
-            
             # 토크나이징
-            inputs = self._tokenizer(
-                text,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=512
-            )
-            
-            # GPU 사용 시 입력을 GPU로 이동
-            device = next(self._model.parameters()).device
-            inputs = {k: v.to(device) for k, v in inputs.items()}
-            
-            # 추론 실행
-            with torch.no_grad():
-                outputs = self._model(**inputs)
-                logits = outputs.logits
+            with STAGE_SECONDS.labels(stage="tokenize").time():
+                inputs = self._tokenizer(
+                    text,
+                    return_tensors=self._return_tensors,
+                    padding=True,
+                    truncation=True,
+                    max_length=config.max_seq_length
+                )
+            self._record_padding(inputs["attention_mask"])
             
-            # 소프트맥스 적용하여 확률 계산
-            probabilities = torch.nn.functional.softmax(logits, dim=-1)
+            probs = self._forward(inputs)[0]
+            result = self._build_result(text, probs)
             
-            # 결과 추출
-            probs = probabilities[0].cpu().tolist()
+            if cascade_result is not None:
+                self._record_audit(cascade_result["sentiment"], result)
             
-            # 라벨 매핑 (일반적으로 0: negative, 1: positive)
-            # 모델에 따라 다를 수 있으므로 확인 필요
-            negative_score = probs[0]
-            positive_score = probs[1]
-            
-            # 감성 결정
-            if positive_score > negative_score:
-                sentiment = "positive"
-                score = positive_score
-            else:
-                sentiment = "negative"
-                score = negative_score
-            
-            result = {
-                "text": text,
-                "sentiment": sentiment,
-                "confidence": {
-                    "positive": round(positive_score, 4),
-                    "negative": round(negative_score, 4)
-                },
-                "score": round(score, 4)
-            }
+            if cache_key is not None:
+                self._cache.set(cache_key, self._cacheable(result))
             
             logger.debug(f"감성 분석 결과: {result}")
             return result
@@ -165,12 +711,20 @@ class KoELECTRAService:
             logger.error(f"감성 분석 중 오류 발생: {str(e)}")
             raise
     
-    def analyze_sentiment_batch(self, texts: List[str]) -> Dict:
+    def analyze_sentiment_batch(self, texts: List[str], batch_size: Optional[int] = None) -> Dict:
         """
         여러 텍스트의 배치 감성 분석
         
+        전체 텍스트를 한 번에 토크나이징한 뒤 토큰 길이순으로 정렬하여
+        batch_size 단위 버킷마다 따로 패딩하고 forward pass를 실행합니다.
+        같은 텍스트(캐시 키와 같은 정규화 기준)는 한 번만 추론하고 결과를 각 위치에 복사합니다.
+        결과는 원래 순서로 복원됩니다. 빈 텍스트나 실패한 항목은 개별 에러 결과로
+        반환되며 나머지 배치 결과에는 영향을 주지 않습니다.
+        
         Args:
             texts: 분석할 텍스트 리스트
+            batch_size: 한 번의 forward pass에 넣을 최대 텍스트 수
+                (None이면 설정값 사용)
             
         Returns:
             배치 분석 결과
@@ -182,24 +736,481 @@ class KoELECTRAService:
         if not texts:
             raise ValueError("텍스트 리스트가 비어있습니다.")
         
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load_model()을 먼저 호출하세요.")
+        
+        if batch_size is None:
+            batch_size = self._batch_size or config.batch_size
+        batch_size = max(1, batch_size)
+        
+        results: List[Optional[Dict]] = [None] * len(texts)
+        
+        # 빈 텍스트는 토크나이징 전에 에러 결과로 처리
+        valid_indices = []
+        valid_texts = []
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = self._build_error_result(text, ValueError("텍스트가 비어있습니다."))
+            else:
+                valid_indices.append(i)
+                valid_texts.append(text.strip())
+        
+        # 캐시 적중 항목은 결과를 바로 채우고 미스 항목만 추론
+        cache_keys: List[str] = []
+        if self._cache is not None and valid_texts:
+            keys = [self._cache.make_key(text) for text in valid_texts]
+            miss_indices, miss_texts = [], []
+            for i, text, key, cached in zip(valid_indices, valid_texts, keys, self._cache.get_many(keys)):
+                if cached is not None:
+                    results[i] = {"text": text, **cached}
+                else:
+                    miss_indices.append(i)
+                    miss_texts.append(text)
+                    cache_keys.append(key)
+            valid_indices, valid_texts = miss_indices, miss_texts
+        
+        # 캐스케이드 분류기가 확신하는 항목은 결과를 바로 채움 (표본은 KoELECTRA로도 추론하여 일치율 측정)
+        audits: Dict[int, str] = {}
+        if self._cascade is not None and valid_texts:
+            deferred_indices, deferred_texts, deferred_keys = [], [], []
+            for pos, (i, text) in enumerate(zip(valid_indices, valid_texts)):
+                cascade_result = self._cascade_predict(text)
+                if cascade_result is not None:
+                    if not self._should_audit():
+                        results[i] = cascade_result
+                        continue
+                    audits[i] = cascade_result["sentiment"]
+                deferred_indices.append(i)
+                deferred_texts.append(text)
+                if cache_keys:
+                    deferred_keys.append(cache_keys[pos])
+            valid_indices, valid_texts, cache_keys = deferred_indices, deferred_texts, deferred_keys
+        
+        if valid_texts:
+            # 중복 텍스트는 첫 항목만 추론하고 원래 순서대로 결과 복사 (텍스트는 각 요청 원문 유지)
+            first_seen: Dict[str, int] = {}
+            unique_texts: List[str] = []
+            unique_keys: List[str] = []
+            owners: List[int] = []
+            for pos, text in enumerate(valid_texts):
+                normalized = SentimentCache.normalize(text)
+                owner = first_seen.get(normalized)
+                if owner is None:
+                    owner = first_seen[normalized] = len(unique_texts)
+                    unique_texts.append(text)
+                    if cache_keys:
+                        unique_keys.append(cache_keys[pos])
+                owners.append(owner)
+            
+            duplicates = len(valid_texts) - len(unique_texts)
+            if duplicates:
+                with self._stats_lock:
+                    self._batch_duplicates += duplicates
+                DEDUPLICATED.labels(kind="batch").inc(duplicates)
+            
+            unique_results = self._infer_batch(unique_texts, batch_size)
+            for i, text, owner in zip(valid_indices, valid_texts, owners):
+                results[i] = {**unique_results[owner], "text": text}
+            
+            if unique_keys:
+                self._cache.set_many([
+                    (key, self._cacheable(result))
+                    for key, result in zip(unique_keys, unique_results)
+                    if result.get("sentiment") != "error"
+                ])
+        
+        for i, cascade_label in audits.items():
+            self._record_audit(cascade_label, results[i])
+        
+        return {
+            "results": results,
+            "total": len(results)
+        }
+    
+    def analyze_sentiment_long(
+        self,
+        texts: List[str],
+        pooling: str = "mean",
+        batch_size: Optional[int] = None
+    ) -> Dict:
+        """
+        긴 문서의 슬라이딩 윈도우 감성 분석
+        
+        각 문서를 max_seq_length에 맞는 겹치는 토큰 윈도우로 나누고,
+        모든 문서의 윈도우를 한 번의 배치 추론으로 처리한 뒤 문서별로 점수를 집계합니다.
+        
+        Args:
+            texts: 분석할 문서 리스트
+            pooling: 윈도우 점수 집계 방식
+                "mean" (단순 평균) 또는 "weighted" (윈도우 토큰 수 가중 평균)
+            batch_size: 한 번의 forward pass에 넣을 최대 윈도우 수
+                (None이면 설정값 사용)
+            
+        Returns:
+            배치 분석 결과 (각 결과에 windows: 윈도우 수, tokens: 문서 토큰 수 포함)
+            {
+                "results": [결과 리스트],
+                "total": 총 개수
+            }
+        """
+        if not texts:
+            raise ValueError("텍스트 리스트가 비어있습니다.")
+        
+        if pooling not in ("mean", "weighted"):
+            raise ValueError(f"지원하지 않는 집계 방식입니다: {pooling} (mean 또는 weighted)")
+        
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load_model()을 먼저 호출하세요.")
+        
+        batch_size = max(1, batch_size or self._batch_size or config.batch_size)
+        results: List[Optional[Dict]] = [None] * len(texts)
+        
+        valid_indices = []
+        valid_texts = []
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = self._build_error_result(text, ValueError("텍스트가 비어있습니다."))
+            else:
+                valid_indices.append(i)
+                valid_texts.append(text.strip())
+        
+        if valid_texts:
+            # 특수 토큰 없이 전체 토크나이징 후 윈도우 분할
+            with STAGE_SECONDS.labels(stage="tokenize").time():
+                token_ids = self._tokenizer(
+                    valid_texts,
+                    add_special_tokens=False,
+                    truncation=False
+                )["input_ids"]
+            window = config.max_seq_length - self._tokenizer.num_special_tokens_to_add(pair=False)
+            step = max(1, window - config.long_doc_stride)
+            
+            features: List[Dict] = []
+            owners: List[int] = []
+            weights: List[int] = []
+            for doc, ids in enumerate(token_ids):
+                starts = list(range(0, max(len(ids) - window, 0) + 1, step))
+                if starts[-1] + window < len(ids):
+                    starts.append(len(ids) - window)
+                if len(starts) > config.long_doc_max_windows:
+                    logger.warning(
+                        f"윈도우 수 초과로 앞쪽 {config.long_doc_max_windows}개만 분석: "
+                        f"{len(starts)}개 ({len(ids)} 토큰)"
+                    )
+                    starts = starts[:config.long_doc_max_windows]
+                for start in starts:
+                    chunk = ids[start:start + window]
+                    input_ids = self._tokenizer.build_inputs_with_special_tokens(chunk)
+                    features.append({
+                        "input_ids": input_ids,
+                        "token_type_ids": self._tokenizer.create_token_type_ids_from_sequences(chunk),
+                        "attention_mask": [1] * len(input_ids)
+                    })
+                    owners.append(doc)
+                    weights.append(max(1, len(chunk)))
+            
+            # 모든 문서의 윈도우를 한 번에 버킷 추론
+            outputs = self._forward_features(features, batch_size)
+            
+            # 문서별 윈도우 점수 집계
+            doc_windows: List[List[int]] = [[] for _ in valid_texts]
+            for w, doc in enumerate(owners):
+                doc_windows[doc].append(w)
+            
+            for doc, (i, text) in enumerate(zip(valid_indices, valid_texts)):
+                windows = doc_windows[doc]
+                errors = [outputs[w] for w in windows if isinstance(outputs[w], Exception)]
+                if errors:
+                    logger.error(f"문서 분석 실패: {text[:50]}... - {str(errors[0])}")
+                    results[i] = self._build_error_result(text, errors[0])
+                    continue
+                
+                # 라벨 수만큼 클래스별 확률 집계 (다중 분류 모델 포함)
+                num_labels = len(self._labels)
+                if pooling == "weighted":
+                    total = sum(weights[w] for w in windows)
+                    probs = [
+                        sum(outputs[w][k] * weights[w] for w in windows) / total
+                        for k in range(num_labels)
+                    ]
+                else:
+                    probs = [sum(outputs[w][k] for w in windows) / len(windows) for k in range(num_labels)]
+                
+                result = self._build_result(text, probs)
+                result["windows"] = len(windows)
+                result["tokens"] = len(token_ids[doc])
+                results[i] = result
+        
+        return {
+            "results": results,
+            "total": len(results)
+        }
+    
+    def _infer_batch(self, texts: List[str], batch_size: int) -> List[Dict]:
+        """
+        전처리된 텍스트 리스트를 길이 버킷 단위로 추론
+        
+        Args:
+            texts: 공백 제거된 비어있지 않은 텍스트 리스트
+            batch_size: 버킷(한 번의 forward pass) 최대 크기
+            
+        Returns:
+            텍스트 순서대로 감성 분석 결과 (실패 항목은 에러 결과)
+        """
+        try:
+            # 패딩 없이 한 번에 토크나이징 (패딩은 버킷별로 적용)
+            with STAGE_SECONDS.labels(stage="tokenize").time():
+                encodings = self._tokenizer(
+                    texts,
+                    padding=False,
+                    truncation=True,
+                    max_length=config.max_seq_length
+                )
+            features = [
+                {k: encodings[k][j] for k in encodings.keys()}
+                for j in range(len(texts))
+            ]
+        except Exception as e:
+            logger.error(f"배치 토크나이징 실패, 개별 분석으로 전환: {str(e)}")
+            results = []
+            for text in texts:
+                try:
+                    results.append(self.analyze_sentiment(text))
+                except Exception as item_error:
+                    logger.error(f"텍스트 분석 실패: {text[:50]}... - {str(item_error)}")
+                    results.append(self._build_error_result(text, item_error))
+            return results
+        
         results = []
-        for text in texts:
+        for text, output in zip(texts, self._forward_features(features, batch_size)):
+            if isinstance(output, Exception):
+                logger.error(f"텍스트 분석 실패: {text[:50]}... - {str(output)}")
+                results.append(self._build_error_result(text, output))
+            else:
+                results.append(self._build_result(text, output))
+        return results
+    
+    def _forward_features(
+        self,
+        features: List[Dict],
+        batch_size: int
+    ) -> List[Union[List[float], Exception]]:
+        """
+        토큰 길이순 버킷으로 나누어 패딩/추론하고 입력 순서대로 확률 반환
+        
+        버킷 추론이 실패하면 해당 버킷의 항목을 하나씩 다시 추론하여
+        실패한 항목만 예외로 반환합니다.
+        
+        Args:
+            features: 패딩 전 토크나이저 출력 (input_ids, attention_mask 등) 리스트
+            batch_size: 버킷(한 번의 forward pass) 최대 크기
+            
+        Returns:
+            항목별 [negative, positive] 확률 또는 실패 예외
+        """
+        if self._remote is not None:
+            # 버킷 구성은 여러 워커의 요청을 함께 모으는 모델 서버가 담당
+            return self._forward_remote(features)
+        
+        outputs: List[Union[List[float], Exception, None]] = [None] * len(features)
+        
+        # 토큰 길이순 정렬로 비슷한 길이끼리 같은 버킷에 배치
+        order = list(range(len(features)))
+        if config.length_bucketing:
+            order.sort(key=lambda j: len(features[j]["input_ids"]))
+        
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
             try:
-                result = self.analyze_sentiment(text)
-                results.append(result)
+                for j, probs in zip(bucket, self._forward(self._pad([features[j] for j in bucket]))):
+                    outputs[j] = probs
+                continue
             except Exception as e:
-                logger.error(f"텍스트 분석 실패: {text[:50]}... - {str(e)}")
-                results.append({
-                    "text": text,
-                    "sentiment": "error",
-                    "confidence": {"positive": 0.0, "negative": 0.0},
-                    "score": 0.0,
-                    "error": str(e)
-                })
+                logger.error(f"배치 추론 실패 (버킷 {start // batch_size}), 개별 추론으로 전환: {str(e)}")
+            
+            for j in bucket:
+                try:
+                    outputs[j] = self._forward(self._pad([features[j]]))[0]
+                except Exception as e:
+                    outputs[j] = e
+        
+        return outputs
+    
+    def _pad(self, features: List[Dict]) -> Dict:
+        """버킷 단위 패딩 및 패딩 효율 기록"""
+        with STAGE_SECONDS.labels(stage="tokenize").time():
+            inputs = self._tokenizer.pad(
+                features,
+                padding=True,
+                return_tensors=self._return_tensors
+            )
+        self._record_padding(inputs["attention_mask"])
+        return inputs
+    
+    def _record_padding(self, attention_mask) -> None:
+        """패딩 효율 통계 누적 (실제 토큰 수 / 패딩 포함 토큰 수)"""
+        real = int(attention_mask.sum())
+        total = int(attention_mask.shape[0] * attention_mask.shape[1])
+        with self._stats_lock:
+            self._real_tokens += real
+            self._padded_tokens += total
+        TOKENS.labels(kind="real").inc(real)
+        TOKENS.labels(kind="padded").inc(total)
+    
+    def _forward(self, inputs: Dict) -> List[List[float]]:
+        """
+        토크나이징된 입력으로 추론을 실행하고 텍스트별 확률 리스트 반환
+        
+        Args:
+            inputs: 토크나이저 출력 (input_ids, attention_mask 등)
+            
+        Returns:
+            텍스트별 [negative, positive] 확률 리스트
+        """
+        # 워밍업 이후 첫 실제 추론 시간 기록
+        if self._first_inference_seconds is None and not self._warming:
+            started = time.perf_counter()
+            probs = self._run_model(inputs)
+            self._first_inference_seconds = round(time.perf_counter() - started, 3)
+            logger.info(f"첫 추론 시간: {self._first_inference_seconds}초")
+            return probs
+        return self._run_model(inputs)
+    
+    def _run_model(self, inputs: Dict) -> List[List[float]]:
+        """백엔드별 forward pass 실행 (워밍업 외에는 단계별 시간과 배치 크기 기록)"""
+        if not self._warming:
+            BATCH_SIZE.observe(inputs["input_ids"].shape[0])
+        
+        if self._remote is not None:
+            # 패딩을 제거한 실제 토큰만 모델 서버로 전송
+            lengths = inputs["attention_mask"].sum(-1).tolist()
+            features = [
+                {k: inputs[k][i][:length].tolist() for k in ("input_ids", "token_type_ids") if k in inputs}
+                for i, length in enumerate(lengths)
+            ]
+            outputs = self._forward_remote(features)
+            for output in outputs:
+                if isinstance(output, Exception):
+                    raise output
+            return outputs
+        
+        if self._session is not None:
+            return self._forward_onnx(inputs)
+        import torch
+        
+        # GPU 사용 시 입력을 GPU로 이동
+        device = next(self._model.parameters()).device
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+        
+        # 추론 실행
+        started = time.perf_counter()
+        with torch.no_grad():
+            if self._compiled is not None:
+                # 고정 형태 버킷으로 패딩하여 추적/컴파일된 모델 실행
+                logits = self._compiled(inputs)
+            else:
+                outputs = self._model(**inputs)
+                logits = outputs.logits
+        forwarded = time.perf_counter()
+        
+        # 소프트맥스 적용하여 확률 계산
+        probabilities = torch.nn.functional.softmax(logits, dim=-1)
+        probs = probabilities.cpu().tolist()
+        self._observe_model_stages(started, forwarded)
+        return probs
+    
+    def _observe_model_stages(self, started: float, forwarded: float) -> None:
+        """forward / postprocess 단계 시간 기록 (워밍업 제외)"""
+        if self._warming:
+            return
+        STAGE_SECONDS.labels(stage="forward").observe(forwarded - started)
+        STAGE_SECONDS.labels(stage="postprocess").observe(time.perf_counter() - forwarded)
+    
+    def _forward_remote(self, features: List[Dict]) -> List[Union[List[float], Exception]]:
+        """
+        모델 서버로 추론 요청 (서버에서 모델이 교체되었으면 버전과 캐시 식별자 갱신)
+        
+        연결 실패/타임아웃/프로토콜 오류는 로컬 버킷 실패와 같이 항목별 예외로 반환하여
+        합류한 다른 요청이나 스트리밍 응답 전체가 실패하지 않도록 합니다 (서버 상태는 /ready에서 확인).
+        """
+        started = time.perf_counter()
+        try:
+            probs, errors, version = self._remote.infer(
+                self._name,
+                [f["input_ids"] for f in features],
+                [f["token_type_ids"] for f in features] if features and "token_type_ids" in features[0] else None
+            )
+        except (OSError, ConnectionError, TimeoutError, RuntimeError, ValueError) as e:
+            logger.warning(f"모델 서버 추론 실패 ({len(features)}건): {str(e)}")
+            return [e] * len(features)
+        forwarded = time.perf_counter()
+        if version and version != self._model_version:
+            logger.info(f"모델 서버의 모델 버전 변경: {self._model_version} -> {version}")
+            self._model_version = version
+            if self._cache is not None:
+                self._cache.bind_model(self.get_model_identity())
+        self._observe_model_stages(started, forwarded)
+        return [RuntimeError(errors[i]) if i in errors else p for i, p in enumerate(probs)]
+    
+    def _forward_onnx(self, inputs: Dict) -> List[List[float]]:
+        """ONNX Runtime 세션으로 추론 실행"""
+        input_names = {i.name for i in self._session.get_inputs()}
+        feeds = {
+            k: np.asarray(v, dtype=np.int64)
+            for k, v in inputs.items()
+            if k in input_names
+        }
+        started = time.perf_counter()
+        logits = self._session.run(None, feeds)[0]
+        forwarded = time.perf_counter()
+        
+        # 소프트맥스 적용하여 확률 계산
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probs = (exp / exp.sum(axis=-1, keepdims=True)).tolist()
+        self._observe_model_stages(started, forwarded)
+        return probs
+    
+    def _device_name(self) -> Optional[str]:
+        """추론 장치 이름"""
+        if not self._is_loaded:
+            return None
+        if self._session is not None:
+            return "cpu"
+        if self._remote is not None:
+            return "remote"
+        return str(next(self._model.parameters()).device)
+    
+    def _build_result(self, text: str, probs: List[float]) -> Dict:
+        """확률 리스트로부터 감성 분석 결과 딕셔너리 생성"""
+        # 라벨 매핑 (이진 분류는 일반적으로 0: negative, 1: positive, 다중 분류는 모델 id2label)
+        # 모델에 따라 다를 수 있으므로 확인 필요
+        # 확률이 같으면 앞쪽 라벨(이진 분류는 negative) 선택
+        top = max(range(len(probs)), key=lambda i: probs[i])
         
         return {
-            "results": results,
-            "total": len(results)
+            "text": text,
+            "sentiment": self._labels[top],
+            "confidence": {
+                label: round(prob, 4) for label, prob in zip(self._labels, probs)
+            },
+            "score": round(probs[top], 4),
+            "model_version": self._model_version
+        }
+    
+    @staticmethod
+    def _cacheable(result: Dict) -> Dict:
+        """캐시 저장용 결과 (원본 텍스트 제외)"""
+        return {k: v for k, v in result.items() if k != "text"}
+    
+    def _build_error_result(self, text: str, error: Exception) -> Dict:
+        """배치 분석에서 실패한 항목의 에러 결과 딕셔너리 생성"""
+        return {
+            "text": text,
+            "sentiment": "error",
+            "confidence": {label: 0.0 for label in self._labels},
+            "score": 0.0,
+            "model_version": self._model_version,
+            "error": str(error)
         }
     
     def get_model_info(self) -> Dict:
@@ -210,7 +1221,53 @@ class KoELECTRAService:
             모델 정보 딕셔너리
         """
         return {
+            "name": self._name,
+            "labels": self._labels,
             "model_path": self._model_path,
+            "model_version": self._model_version,
+            "quantization": self._quantization,
             "status": "loaded" if self._is_loaded else "not_loaded",
-            "device": str(next(self._model.parameters()).device) if self._is_loaded else None
+            "backend": self._backend,
+            "weights_mmap": self._weights_mmap is not None,
+            "execution": self._compiled.get_stats() if self._compiled is not None else {"mode": "eager"},
+            "model_server": self._get_model_server_stats(),
+            "memory_footprint_mb": self._footprint_mb,
+            "memory": process_memory(),
+            "device": self._device_name(),
+            "max_seq_length": config.max_seq_length,
+            "length_bucketing": config.length_bucketing,
+            "padding": self._get_padding_stats(),
+            "batch_duplicates": self._batch_duplicates,
+            "cascade": self._get_cascade_stats(),
+            "cpu_tuning": self._get_cpu_tuning(),
+            "cache": self._cache.get_stats() if self._cache is not None else None,
+            "startup": self.get_startup_metrics()
+        }
+    
+    def _get_cpu_tuning(self) -> Dict:
+        """CPU 자동 튜닝 결과와 PyTorch 스레드 설정 (torch를 로드하지 않았으면 스레드 수는 None)"""
+        torch = sys.modules.get("torch")
+        return {
+            "autotune": self._autotune,
+            "num_threads": torch.get_num_threads() if torch is not None else None,
+            "num_interop_threads": torch.get_num_interop_threads() if torch is not None else None,
+            "batch_size": self._batch_size or config.batch_size
         }
+    
+    def _get_model_server_stats(self) -> Optional[Dict]:
+        """모델 서버 상태 (사용하지 않으면 None, 연결 실패 시 오류 메시지)"""
+        if self._remote is None:
+            return None
+        try:
+            return {"socket": config.model_server_socket, **self._remote.ping()}
+        except (OSError, RuntimeError) as e:
+            return {"socket": config.model_server_socket, "error": str(e)}
+    
+    def _get_padding_stats(self) -> Dict:
+        """패딩 효율 통계 (1.0에 가까울수록 패딩 낭비가 적음)"""
+        with self._stats_lock:
+            return {
+                "real_tokens": self._real_tokens,
+                "padded_tokens": self._padded_tokens,
+                "efficiency": round(self._real_tokens / self._padded_tokens, 4) if self._padded_tokens else None
+            }
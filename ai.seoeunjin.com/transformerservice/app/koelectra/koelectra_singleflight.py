@@ -0,0 +1,75 @@
+"""
+KoELECTRA 동일 요청 합류 (single-flight)
+같은 입력에 대한 추론이 진행 중이면 새 요청은 추론을 다시 실행하지 않고 진행 중인 결과를 함께 기다림
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from .koelectra_metrics import DEDUPLICATED
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    키별 진행 중 작업 공유
+
+    첫 요청(leader)이 작업을 태스크로 시작하고, 완료 전에 같은 키로 들어온 요청은
+    그 태스크의 결과(또는 예외)를 그대로 받습니다. 기다리던 요청 하나가 취소되어도
+    공유 작업은 취소되지 않으며, 작업이 끝나면 키를 제거하므로 결과를 보관하지 않습니다
+    (완료된 결과 재사용은 SentimentCache가 담당).
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        # 통계
+        self._leaders = 0
+        self._coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        키에 대한 작업 실행 또는 진행 중인 작업에 합류
+
+        Args:
+            key: 동일 요청 판별 키 (예: 모델 이름 + 정규화된 텍스트)
+            fn: 진행 중인 작업이 없을 때 호출하여 코루틴을 만드는 함수 (이 요청이 leader일 때만 동기적으로 호출되므로
+                공유 작업이 쓸 자원은 fn 안에서 확보하고 코루틴이 끝날 때 해제)
+
+        Returns:
+            공유 작업의 결과
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self._leaders += 1
+        else:
+            self._coalesced += 1
+            DEDUPLICATED.labels(kind="in_flight").inc()
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """완료된 작업의 키 제거 (기다리는 요청이 모두 취소된 경우에도 예외를 회수)"""
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"공유 작업 실패: {task.exception()}")
+
+    def get_stats(self) -> Dict:
+        """
+        합류 통계 조회
+
+        Returns:
+            실제 실행한 작업 수, 진행 중 작업에 합류한 요청 수, 현재 진행 중인 키 수
+        """
+        total = self._leaders + self._coalesced
+        return {
+            "executed": self._leaders,
+            "coalesced": self._coalesced,
+            "coalesced_ratio": round(self._coalesced / total, 4) if total else 0.0,
+            "in_flight": len(self._inflight)
+        }
@@ -0,0 +1,166 @@
+"""
+KoELECTRA NDJSON 스트리밍 감성 분석
+요청 본문(NDJSON/JSON Lines)을 줄 단위로 읽어 내부 배치로 추론하고 결과를 NDJSON으로 즉시 전송
+"""
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, List, Tuple, Union
+
+from .koelectra_executor import InferenceExecutor, InferenceQueueFullError
+from .koelectra_metrics import STAGE_SECONDS
+from .koelectra_service import KoELECTRAService
+
+logger = logging.getLogger(__name__)
+
+
+class _OversizedLine:
+    """최대 길이를 넘어 버려진 줄 표시"""
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int
+) -> AsyncIterator[Union[bytes, _OversizedLine]]:
+    """
+    바이트 스트림을 줄 단위로 분리
+
+    한 줄이 max_line_bytes를 넘으면(한 청크 안에서 끝나는 줄 포함) 버퍼에 쌓지 않고
+    다음 줄바꿈까지 버린 뒤 _OversizedLine을 반환하므로 메모리 사용량이 줄 길이 제한 안에서 유지됩니다.
+
+    Args:
+        chunks: 요청 본문 바이트 청크 스트림
+        max_line_bytes: 한 줄의 최대 바이트 수
+    """
+    buffer = b""
+    skipping = False
+    async for chunk in chunks:
+        # 이전 청크에서 남은 미완성 줄(최대 max_line_bytes)과 합친 뒤 오프셋으로 스캔하여
+        # 줄마다 남은 버퍼를 복사하지 않음 (남은 부분은 청크당 한 번만 잘라 냄)
+        data = buffer + chunk if buffer else chunk
+        start = 0
+        while True:
+            pos = data.find(b"\n", start)
+            if pos < 0:
+                break
+            if skipping:
+                skipping = False
+                yield _OversizedLine()
+            elif pos - start > max_line_bytes:
+                yield _OversizedLine()
+            else:
+                yield data[start:pos]
+            start = pos + 1
+        if skipping or len(data) - start > max_line_bytes:
+            skipping = True
+            buffer = b""
+        else:
+            buffer = data[start:]
+    if skipping:
+        yield _OversizedLine()
+    elif buffer.strip():
+        yield buffer
+
+
+def parse_line(line: Union[bytes, _OversizedLine], max_line_bytes: int) -> Union[str, Exception]:
+    """
+    NDJSON 한 줄에서 텍스트 추출
+
+    지원 형식: {"text": "..."} 객체 또는 "..." JSON 문자열
+
+    Returns:
+        텍스트 또는 파싱 실패 예외
+    """
+    if isinstance(line, _OversizedLine):
+        return ValueError(f"한 줄의 최대 크기({max_line_bytes} bytes)를 초과했습니다.")
+    try:
+        item = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        return ValueError(f"JSON 파싱 실패: {str(e)}")
+    if isinstance(item, dict):
+        item = item.get("text")
+    if not isinstance(item, str):
+        return ValueError('각 줄은 {"text": "..."} 객체 또는 JSON 문자열이어야 합니다.')
+    if not item.strip():
+        return ValueError("텍스트가 비어있습니다.")
+    return item
+
+
+async def _run_batch(
+    service: KoELECTRAService,
+    executor: InferenceExecutor,
+    texts: List[str]
+) -> List[dict]:
+    """배치 추론 (스트림 도중에는 거절 대신 대기열에 자리가 날 때까지 재시도)"""
+    while True:
+        try:
+            output = await executor.run(service.analyze_sentiment_batch, texts)
+            return output["results"]
+        except InferenceQueueFullError as e:
+            await asyncio.sleep(e.retry_after)
+
+
+async def _flush(
+    service: KoELECTRAService,
+    executor: InferenceExecutor,
+    pending: List[Tuple[int, Union[str, Exception]]]
+) -> bytes:
+    """대기 중인 항목을 추론하고 입력 순서대로 NDJSON 바이트로 변환"""
+    texts = [item for _, item in pending if isinstance(item, str)]
+    results = iter(await _run_batch(service, executor, texts)) if texts else iter(())
+
+    with STAGE_SECONDS.labels(stage="serialize").time():
+        lines = []
+        for index, item in pending:
+            if isinstance(item, str):
+                result = next(results)
+            else:
+                result = {
+                    "text": "",
+                    "sentiment": "error",
+                    "confidence": {label: 0.0 for label in service.labels},
+                    "score": 0.0,
+                    "model_version": service.model_version,
+                    "error": str(item)
+                }
+            lines.append(json.dumps({"index": index, **result}, ensure_ascii=False))
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def stream_sentiment(
+    chunks: AsyncIterator[bytes],
+    service: KoELECTRAService,
+    executor: InferenceExecutor,
+    batch_size: int,
+    max_line_bytes: int
+) -> AsyncIterator[bytes]:
+    """
+    NDJSON 입력을 batch_size 단위로 추론하여 NDJSON 결과를 순서대로 생성
+
+    Args:
+        chunks: 요청 본문 바이트 청크 스트림
+        service: KoELECTRA 서비스
+        executor: 추론 전용 실행기
+        batch_size: 내부 배치 크기
+        max_line_bytes: 한 줄의 최대 바이트 수
+
+    Yields:
+        각 입력 줄에 대한 결과 NDJSON ({"index": 입력 순번, ...감성 분석 결과})
+    """
+    batch_size = max(1, batch_size)
+    pending: List[Tuple[int, Union[str, Exception]]] = []
+    index = 0
+
+    async for line in iter_lines(chunks, max_line_bytes):
+        if not isinstance(line, _OversizedLine) and not line.strip():
+            continue
+        pending.append((index, parse_line(line, max_line_bytes)))
+        index += 1
+        if len(pending) >= batch_size:
+            yield await _flush(service, executor, pending)
+            pending = []
+
+    if pending:
+        yield await _flush(service, executor, pending)
+
+    logger.info(f"스트리밍 감성 분석 완료: {index}건")
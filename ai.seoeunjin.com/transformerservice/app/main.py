@@ -1,6 +1,7 @@
 """
 Transformer Service - FastAPI 애플리케이션
 """
+import asyncio
 import sys
 from pathlib import Path
 from fastapi import FastAPI
@@ -10,7 +11,7 @@ from fastapi.middleware.cors import CORSMiddleware
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from app.config import TransformerServiceConfig
-from app.koelectra import koelectra_router
+from app.koelectra import koelectra_router, koelectra_metrics
 from common.middleware import LoggingMiddleware
 from common.utils import setup_logging
 
@@ -41,26 +42,31 @@ app.add_middleware(LoggingMiddleware)
 
 # 라우터 등록
 app.include_router(koelectra_router.router)
+app.include_router(koelectra_metrics.router)
+
+
+async def prepare_koelectra_model():
+    """KoELECTRA 기본 모델 로드 및 워밍업 (레지스트리가 이벤트 루프를 막지 않도록 스레드에서 실행)"""
+    try:
+        service = await koelectra_router.get_model_registry().ensure_loaded()
+        logger.info(f"KoELECTRA 준비 완료: {service.get_startup_metrics()}")
+    except Exception as e:
+        # 실패 사유는 /koelectra/ready에 노출되며, 첫 요청 시 로딩을 재시도
+        logger.error(f"KoELECTRA 모델 준비 실패: {str(e)}")
 
 
 @app.on_event("startup")
 async def startup_event():
     """서비스 시작 시 실행"""
     logger.info(f"{config.service_name} v{config.service_version} started")
-    # KoELECTRA 모델 사전 로드
-    try:
-        from app.koelectra.koelectra_service import KoELECTRAService
-        service = KoELECTRAService()
-        service.load_model()
-        logger.info("KoELECTRA 모델 로딩 완료")
-    except Exception as e:
-        logger.error(f"KoELECTRA 모델 로딩 실패: {str(e)}")
-        # 모델 로딩 실패해도 서비스는 시작 (첫 요청 시 재시도)
+    # KoELECTRA 모델 사전 로드 (준비 완료 여부는 /koelectra/ready로 확인)
+    app.state.koelectra_prepare_task = asyncio.create_task(prepare_koelectra_model())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """서비스 종료 시 실행"""
+    await koelectra_router.shutdown_koelectra()
     logger.info(f"{config.service_name} shutting down")
 
 
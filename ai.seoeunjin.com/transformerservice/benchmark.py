@@ -0,0 +1,300 @@
+"""
+KoELECTRA 부하 테스트/벤치마크 스크립트
+FastAPI 앱을 프로세스 내(ASGI) 또는 HTTP로 호출하여 워크로드별 처리량, 지연 시간 분위수, 최대 RSS를 측정하고
+커밋/백엔드 간 비교를 위해 결과를 JSON으로 저장합니다.
+
+사용법:
+    python benchmark.py                                    # 프로세스 내 측정
+    python benchmark.py --url http://localhost:9000 --server-pid 1234
+    python benchmark.py --workloads single,concurrent --concurrency 32 --output result.json
+
+모든 워크로드가 같은 입력을 사용하므로 결과 캐시는 기본으로 끄고 측정합니다 (--cache로 캐시 포함 측정).
+HTTP 측정은 서버의 결과 캐시가 꺼져 있어야 실행합니다 (SENTIMENT_CACHE_ENABLED=false로 서버 실행).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.koelectra.koelectra_corpus import load_reviews
+
+WORKLOADS = ("single", "batch", "concurrent")
+
+# 코퍼스가 없을 때 사용할 리뷰 문장
+_FALLBACK_REVIEWS = [
+    "정말 재미있었어요",
+    "배우들 연기가 너무 좋았고 음악도 잘 어울렸습니다",
+    "기대보다 별로였어요. 스토리가 너무 뻔하고 지루했습니다",
+    "두 번 봐도 좋은 영화입니다. 강력 추천합니다!",
+    "중반부터 전개가 느려져서 아쉬웠지만 결말은 만족스러웠어요",
+]
+
+
+def build_corpus(count: int, seed: int = 42) -> List[str]:
+    """
+    길이가 다양한 한국어 리뷰 입력 생성
+
+    짧은 리뷰(원문 그대로) 60%, 중간 길이(2~4개 연결) 30%, 긴 리뷰(8~16개 연결) 10%로 구성합니다.
+
+    Args:
+        count: 생성할 텍스트 수
+        seed: 샘플링 시드 (같은 시드는 항상 같은 입력 생성)
+    """
+    reviews = load_reviews() or _FALLBACK_REVIEWS
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        r = rng.random()
+        if r < 0.6:
+            parts = 1
+        elif r < 0.9:
+            parts = rng.randint(2, 4)
+        else:
+            parts = rng.randint(8, 16)
+        texts.append(" ".join(rng.choice(reviews) for _ in range(parts)))
+    return texts
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """선형 보간 분위수 (q: 0~100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def peak_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """프로세스 최대 RSS (MB, /proc/<pid>/status의 VmHWM)"""
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if pid is None:
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return None
+
+
+def reset_peak_rss(pid: Optional[int] = None) -> bool:
+    """최대 RSS 기록 초기화 (Linux 4.0+, 권한이 없으면 False)"""
+    try:
+        with open(f"/proc/{pid or 'self'}/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def summarize(latencies: List[float], texts: int, errors: int, rejected: int, elapsed: float) -> Dict:
+    """요청 지연 시간(초) 리스트를 처리량/분위수 요약으로 변환"""
+    ms = [v * 1000 for v in latencies]
+    return {
+        "requests": len(latencies) + errors + rejected,
+        "texts": texts,
+        "errors": errors,
+        "rejected": rejected,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "texts_per_second": round(texts / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "mean": round(statistics.fmean(ms), 2) if ms else None,
+            "p50": round(percentile(ms, 50), 2) if ms else None,
+            "p95": round(percentile(ms, 95), 2) if ms else None,
+            "p99": round(percentile(ms, 99), 2) if ms else None,
+            "max": round(max(ms), 2) if ms else None
+        }
+    }
+
+
+async def _drive(client: httpx.AsyncClient, path: str, payloads: List[Dict], concurrency: int) -> Dict:
+    """payloads를 concurrency개 작업자로 전송하고 요청별 지연 시간 수집"""
+    queue: asyncio.Queue = asyncio.Queue()
+    for payload in payloads:
+        queue.put_nowait(payload)
+
+    latencies: List[float] = []
+    counts = {"texts": 0, "errors": 0, "rejected": 0}
+
+    async def worker():
+        while True:
+            try:
+                payload = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json=payload)
+            except httpx.HTTPError:
+                counts["errors"] += 1
+                continue
+            if response.status_code == 503:
+                counts["rejected"] += 1
+            elif response.status_code != 200:
+                counts["errors"] += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+                counts["texts"] += len(payload.get("texts", [payload.get("text")]))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, counts["texts"], counts["errors"], counts["rejected"], elapsed)
+
+
+async def run_workload(
+    client: httpx.AsyncClient,
+    name: str,
+    texts: List[str],
+    batch_size: int,
+    concurrency: int
+) -> Dict:
+    """
+    워크로드 실행
+
+    single: /sentiment 순차 호출, batch: /sentiment/batch 순차 호출,
+    concurrent: /sentiment 동시 호출 (마이크로 배칭 경로)
+    """
+    if name == "single":
+        return await _drive(client, "/koelectra/sentiment", [{"text": t} for t in texts], 1)
+    if name == "batch":
+        payloads = [{"texts": texts[i:i + batch_size]} for i in range(0, len(texts), batch_size)]
+        return await _drive(client, "/koelectra/sentiment/batch", payloads, 1)
+    if name == "concurrent":
+        return await _drive(client, "/koelectra/sentiment", [{"text": t} for t in texts], concurrency)
+    raise ValueError(f"알 수 없는 워크로드입니다: {name} ({', '.join(WORKLOADS)})")
+
+
+def _git_commit() -> Optional[str]:
+    """현재 git 커밋 해시 (저장소가 아니면 None)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(args) -> Dict:
+    """인자에 따라 클라이언트를 준비하고 모든 워크로드 실행"""
+    texts = build_corpus(args.samples, args.seed)
+    server_pid = args.server_pid
+
+    if args.url:
+        mode = "http"
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        mode = "in_process"
+        import app.main as main
+        from app.koelectra import koelectra_service
+        koelectra_service.config.sentiment_cache_enabled = args.cache
+        # ASGI 전송은 startup 이벤트를 실행하지 않으므로 모델 준비를 직접 실행
+        await main.prepare_koelectra_model()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=main.app), base_url="http://benchmark", timeout=args.timeout
+        )
+
+    report = {
+        "created_at": datetime.utcnow().isoformat(),
+        "commit": _git_commit(),
+        "mode": mode,
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "params": {
+            "samples": len(texts),
+            "batch_size": args.batch_size,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "cache": None
+        },
+        "workloads": {}
+    }
+
+    try:
+        info = await client.get("/koelectra/model/info")
+        if info.status_code == 200:
+            model = info.json()
+            report["model"] = {
+                key: model.get(key)
+                for key in ("model_path", "model_version", "backend", "quantization", "weights_mmap", "device")
+            }
+            # 실제 서버(또는 프로세스 내 서비스)의 캐시 상태 기록
+            report["params"]["cache"] = model.get("cache") is not None
+        if report["params"]["cache"] is None:
+            raise SystemExit("모델 정보를 조회할 수 없어 결과 캐시 상태를 확인할 수 없습니다.")
+        if report["params"]["cache"] and not args.cache:
+            # 같은 입력을 반복하므로 캐시가 켜져 있으면 추론이 아닌 캐시 적중을 측정하게 됨
+            raise SystemExit(
+                "서버의 결과 캐시가 켜져 있습니다. SENTIMENT_CACHE_ENABLED=false로 서버를 실행하거나 "
+                "캐시를 포함해 측정하려면 --cache를 지정하세요."
+            )
+
+        # 워밍업 (측정에 포함하지 않음)
+        await run_workload(client, "single", texts[:min(8, len(texts))], args.batch_size, 1)
+
+        for name in args.workloads:
+            peak_reset = reset_peak_rss(server_pid)
+            print(f"워크로드 실행 중: {name}")
+            result = await run_workload(client, name, texts, args.batch_size, args.concurrency)
+            result["peak_rss_mb"] = peak_rss_mb(server_pid) if mode == "in_process" or server_pid else None
+            result["peak_rss_scope"] = "workload" if peak_reset else "process_lifetime"
+            report["workloads"][name] = result
+            print(f"  {result['texts_per_second']} texts/s, p50 {result['latency_ms']['p50']}ms, "
+                  f"p99 {result['latency_ms']['p99']}ms, peak RSS {result['peak_rss_mb']}MB")
+    finally:
+        await client.aclose()
+        if mode == "in_process":
+            from app.koelectra import koelectra_router
+            await koelectra_router.shutdown_koelectra()
+
+    return report
+
+
+def _parse_workloads(value: str) -> List[str]:
+    names = [v.strip() for v in value.split(",") if v.strip()]
+    for name in names:
+        if name not in WORKLOADS:
+            raise argparse.ArgumentTypeError(f"알 수 없는 워크로드입니다: {name} ({', '.join(WORKLOADS)})")
+    return names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="KoELECTRA 부하 테스트/벤치마크")
+    parser.add_argument("--url", default=None, help="HTTP 측정 대상 (예: http://localhost:9000, 없으면 프로세스 내 측정)")
+    parser.add_argument("--server-pid", type=int, default=None, help="HTTP 측정 시 최대 RSS를 읽을 서버 프로세스 PID")
+    parser.add_argument("--workloads", type=_parse_workloads, default=list(WORKLOADS), help="single,batch,concurrent")
+    parser.add_argument("--samples", type=int, default=500, help="워크로드별 입력 텍스트 수")
+    parser.add_argument("--batch-size", type=int, default=32, help="batch 워크로드의 요청당 텍스트 수 (최대 100)")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent 워크로드의 동시 요청 수")
+    parser.add_argument("--seed", type=int, default=42, help="입력 샘플링 시드")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--cache", action="store_true", help="결과 캐시를 켠 상태로 측정 (기본: 캐시 없이 추론만 측정)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmark_results/<시각>-<커밋>.json)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        backend = report.get("model", {}).get("backend") or "unknown"
+        output = str(Path(__file__).parent / "benchmark_results" / f"{stamp}-{report['commit'] or 'nogit'}-{backend}.json")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✓ 결과 저장: {output}")
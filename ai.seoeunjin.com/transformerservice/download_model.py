@@ -27,7 +27,8 @@ try:
     # 모델 다운로드
     print("모델 다운로드 중... (시간이 걸릴 수 있습니다)")
     model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
-    model.save_pretrained(SAVE_PATH)
+    # safetensors 형식으로 저장 (WEIGHTS_MMAP=true 시 워커 간 메모리 매핑 공유)
+    model.save_pretrained(SAVE_PATH, safe_serialization=True)
     print("✓ 모델 다운로드 완료")
     
     print(f"\n모델이 성공적으로 다운로드되었습니다: {SAVE_PATH}")
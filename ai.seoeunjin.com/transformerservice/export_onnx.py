@@ -0,0 +1,69 @@
+"""
+KoELECTRA ONNX 변환 스크립트
+download_model.py로 받은 로컬 모델을 ONNX 형식으로 변환하여 모델 디렉토리에 저장합니다.
+BACKEND=onnxruntime 설정 시 이 파일을 사용합니다.
+"""
+import numpy as np
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from pathlib import Path
+
+# 모델 경로 (download_model.py 저장 경로와 동일)
+MODEL_PATH = Path(__file__).parent / "app" / "koelectra" / "koelectra_model"
+
+# ONNX 저장 경로 (TransformerServiceConfig.onnx_model_file 기본값)
+ONNX_PATH = MODEL_PATH / "model.onnx"
+
+# ONNX opset 버전
+OPSET_VERSION = 14
+
+print(f"ONNX 변환 시작: {MODEL_PATH}")
+print(f"저장 경로: {ONNX_PATH}")
+
+try:
+    # 모델 로드
+    print("모델 로딩 중...")
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
+    model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
+    model.eval()
+    
+    # 예제 입력 (배치/시퀀스 길이는 동적 축으로 변환)
+    sample = tokenizer(
+        ["이 영화 정말 재미있었어요!", "별로 재미없었습니다."],
+        return_tensors="pt",
+        padding=True
+    )
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+    
+    # ONNX 변환
+    print("ONNX 변환 중...")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(ONNX_PATH),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=OPSET_VERSION,
+            do_constant_folding=True
+        )
+    print("✓ ONNX 변환 완료")
+    
+    # PyTorch 결과와 비교 검증
+    print("ONNX Runtime 결과 검증 중...")
+    import onnxruntime as ort
+    session = ort.InferenceSession(str(ONNX_PATH), providers=["CPUExecutionProvider"])
+    ort_logits = session.run(None, {name: sample[name].numpy().astype(np.int64) for name in input_names})[0]
+    with torch.no_grad():
+        torch_logits = model(**sample).logits.numpy()
+    max_diff = float(np.abs(ort_logits - torch_logits).max())
+    print(f"✓ 최대 logits 차이: {max_diff:.6f}")
+    
+    print(f"\nONNX 모델이 성공적으로 저장되었습니다: {ONNX_PATH}")
+    
+except Exception as e:
+    print(f"❌ ONNX 변환 실패: {str(e)}")
+    print("\n참고: 먼저 download_model.py를 실행하여 모델을 다운로드하세요.")
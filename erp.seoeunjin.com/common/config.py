@@ -27,9 +27,19 @@ class DatabaseConfig(BaseSettings):
 
 class RedisConfig(BaseSettings):
     """Redis 설정 (필요시 사용)"""
+    redis_url: Optional[str] = None  # 설정 시 host/port/password 대신 사용 (Upstash 등)
     redis_host: str = "redis"
     redis_port: int = 6379
     redis_password: Optional[str] = None
+    redis_db: int = 0
+    redis_ssl_enabled: bool = False  # redis:// URL도 TLS로 강제 (rediss:// URL은 설정과 무관하게 TLS, Upstash는 rediss:// 사용)
+    
+    # 비동기 클라이언트 연결 풀 설정 (common.redis_client)
+    redis_max_connections: int = 50  # 풀 최대 연결 수 (초과 요청은 redis_pool_timeout 동안 대기)
+    redis_pool_timeout: float = 5.0  # 풀에서 연결을 기다리는 최대 시간 (초)
+    redis_socket_timeout: float = 5.0  # 명령 응답 타임아웃 (초)
+    redis_socket_connect_timeout: float = 5.0  # 연결 생성 타임아웃 (초)
+    redis_health_check_interval: int = 30  # 유휴 연결 재사용 전 PING 확인 주기 (초)
     
     class Config:
         env_file = ".env"
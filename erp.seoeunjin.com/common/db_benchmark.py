@@ -0,0 +1,130 @@
+"""
+데이터베이스 동시 쿼리 처리량 벤치마크
+동기 세션(이벤트 루프에서 직접 실행 / 스레드 풀 실행)과 비동기 세션(asyncpg)의 처리량/지연 시간 비교
+
+사용법 (로컬 PostgreSQL, DATABASE_URL 또는 DB_* 환경 변수 사용):
+    python -m common.db_benchmark --concurrency 50 --queries 2000 --sleep-ms 5
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from sqlalchemy import text
+
+from .database import get_async_session_factory, get_session_factory
+
+MODES = ("sync_blocking", "sync_threadpool", "async")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """정렬된 값의 q 백분위수 (최근접 순위)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))
+    return values[index]
+
+
+def _sync_query(statement) -> None:
+    """동기 세션으로 쿼리 1회 실행"""
+    db = get_session_factory()()
+    try:
+        db.execute(statement).fetchall()
+    finally:
+        db.close()
+
+
+async def _run_mode(mode: str, statement, concurrency: int, queries: int) -> Dict:
+    """
+    한 모드로 queries개의 쿼리를 concurrency개의 동시 작업으로 실행
+
+    Returns:
+        처리량(qps)과 쿼리 지연 시간 백분위수(ms)
+    """
+    latencies: List[float] = []
+    remaining = iter(range(queries))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            if mode == "async":
+                async with get_async_session_factory()() as db:
+                    (await db.execute(statement)).fetchall()
+            elif mode == "sync_threadpool":
+                await asyncio.to_thread(_sync_query, statement)
+            else:
+                # async def 핸들러에서 동기 세션을 그대로 쓰는 경우 (이벤트 루프 차단)
+                _sync_query(statement)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "queries": len(latencies),
+        "seconds": round(elapsed, 3),
+        "qps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2)
+    }
+
+
+async def run_benchmark(
+    concurrency: int = 50,
+    queries: int = 2000,
+    sleep_ms: float = 5.0,
+    modes: List[str] = MODES
+) -> Dict:
+    """
+    모드별 동시 쿼리 벤치마크 실행
+
+    Args:
+        concurrency: 동시 실행 작업 수
+        queries: 모드별 총 쿼리 수
+        sleep_ms: 쿼리마다 서버에서 대기할 시간 (I/O 대기 모사, 0이면 SELECT 1)
+        modes: 실행할 모드 (sync_blocking, sync_threadpool, async)
+
+    Returns:
+        설정과 모드별 결과
+    """
+    if sleep_ms > 0:
+        statement = text("SELECT pg_sleep(:seconds)").bindparams(seconds=sleep_ms / 1000)
+    else:
+        statement = text("SELECT 1")
+
+    # 풀 연결 생성 비용이 측정에 섞이지 않도록 모드별 1회 사전 실행
+    _sync_query(text("SELECT 1"))
+    async with get_async_session_factory()() as db:
+        await db.execute(text("SELECT 1"))
+
+    results = []
+    for mode in modes:
+        results.append(await _run_mode(mode, statement, concurrency, queries))
+    return {
+        "concurrency": concurrency,
+        "queries": queries,
+        "sleep_ms": sleep_ms,
+        "results": results
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동기/비동기 세션 동시 쿼리 처리량 비교")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 실행 작업 수")
+    parser.add_argument("--queries", type=int, default=2000, help="모드별 총 쿼리 수")
+    parser.add_argument("--sleep-ms", type=float, default=5.0, help="쿼리별 서버 대기 시간 (0이면 SELECT 1)")
+    parser.add_argument("--modes", default=",".join(MODES), help="실행할 모드 (쉼표 구분)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(
+        args.concurrency,
+        args.queries,
+        args.sleep_ms,
+        [m for m in args.modes.split(",") if m in MODES]
+    ))
+    print(json.dumps(report, ensure_ascii=False, indent=2))
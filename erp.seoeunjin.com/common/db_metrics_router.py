@@ -0,0 +1,18 @@
+"""
+데이터베이스 쿼리 통계 라우터
+common.db_metrics의 문장별 지연 시간 통계를 /metrics/db로 노출
+(get_engine/get_async_engine으로 DB를 사용하는 서비스에서만 등록)
+"""
+from fastapi import APIRouter
+
+from .db_metrics import query_stats
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics/db")
+async def database_metrics(top: int = 20, order_by: str = "total_ms"):
+    """
+    문장별 쿼리 지연 시간 통계
+    """
+    return query_stats.get_stats(top=top, order_by=order_by)
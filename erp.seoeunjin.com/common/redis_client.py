@@ -0,0 +1,257 @@
+"""
+비동기 Redis 클라이언트
+공유 연결 풀 기반 asyncio 클라이언트와 파이프라인 다중 조회/저장, Lua 비교 후 설정(CAS), pub/sub 헬퍼
+"""
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+import redis
+import redis.asyncio as aioredis
+
+from .config import RedisConfig
+
+logger = logging.getLogger(__name__)
+
+# 파이프라인 한 번에 보낼 키 수 (너무 큰 요청이 Redis를 오래 점유하지 않도록 분할)
+PIPELINE_CHUNK_SIZE = 500
+
+# 현재 값이 기대값과 같을 때만 설정 (기대값이 빈 문자열이면 키가 없을 때만 설정)
+_COMPARE_AND_SET = """
+local current = redis.call('GET', KEYS[1])
+if (current == false and ARGV[1] == '') or current == ARGV[1] then
+    if tonumber(ARGV[3]) > 0 then
+        redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+    else
+        redis.call('SET', KEYS[1], ARGV[2])
+    end
+    return 1
+end
+return 0
+"""
+
+# 현재 값이 기대값과 같을 때만 삭제 (소유한 잠금만 해제)
+_COMPARE_AND_DELETE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# decode_responses 여부별 공유 풀 (문자열 클라이언트 / 바이너리 직렬화용 클라이언트)
+_pools: Dict[bool, aioredis.BlockingConnectionPool] = {}
+_sync_pools: Dict[bool, redis.BlockingConnectionPool] = {}
+_config: Optional[RedisConfig] = None
+
+
+def _redis_config() -> RedisConfig:
+    global _config
+    if _config is None:
+        _config = RedisConfig()
+    return _config
+
+
+def _redis_url(config: RedisConfig) -> str:
+    """연결 URL (redis_url 우선, redis_ssl_enabled면 redis://를 rediss://로 바꿔 TLS 강제, 기본은 URL 스킴 그대로)"""
+    if config.redis_url:
+        url = config.redis_url
+    else:
+        auth = f":{config.redis_password}@" if config.redis_password else ""
+        url = f"redis://{auth}{config.redis_host}:{config.redis_port}/{config.redis_db}"
+    if config.redis_ssl_enabled and url.startswith("redis://"):
+        url = "rediss://" + url[len("redis://"):]
+    return url
+
+
+def _pool_kwargs(config: RedisConfig, url: str, decode_responses: bool) -> Dict:
+    """RedisConfig의 풀/타임아웃 설정 (동기/비동기 풀 공통)"""
+    kwargs = {
+        "max_connections": config.redis_max_connections,
+        "timeout": config.redis_pool_timeout,
+        "socket_timeout": config.redis_socket_timeout,
+        "socket_connect_timeout": config.redis_socket_connect_timeout,
+        "health_check_interval": config.redis_health_check_interval,
+        "decode_responses": decode_responses
+    }
+    if url.startswith("rediss://"):
+        kwargs["ssl_cert_reqs"] = "required"
+    return kwargs
+
+
+def get_pool(decode_responses: bool = True) -> aioredis.BlockingConnectionPool:
+    """
+    공유 연결 풀 반환 (최초 호출 시 생성, 연결은 명령 실행 시 생성)
+
+    Args:
+        decode_responses: 응답을 문자열로 디코딩할지 여부 (False면 bytes)
+    """
+    pool = _pools.get(decode_responses)
+    if pool is None:
+        config = _redis_config()
+        url = _redis_url(config)
+        pool = aioredis.BlockingConnectionPool.from_url(url, **_pool_kwargs(config, url, decode_responses))
+        _pools[decode_responses] = pool
+    return pool
+
+
+def get_async_redis(decode_responses: bool = True) -> aioredis.Redis:
+    """
+    공유 풀을 사용하는 비동기 Redis 클라이언트 반환
+    FastAPI에서 Depends()로 사용 가능 (클라이언트 생성 비용은 작고 연결은 풀에서 재사용)
+    """
+    return aioredis.Redis(connection_pool=get_pool(decode_responses))
+
+
+def get_sync_redis(decode_responses: bool = True) -> redis.Redis:
+    """
+    같은 설정의 동기 공유 풀 클라이언트 반환 (동기 함수용, 예: common.cache의 동기 함수 캐시)
+    """
+    pool = _sync_pools.get(decode_responses)
+    if pool is None:
+        config = _redis_config()
+        url = _redis_url(config)
+        pool = redis.BlockingConnectionPool.from_url(url, **_pool_kwargs(config, url, decode_responses))
+        _sync_pools[decode_responses] = pool
+    return redis.Redis(connection_pool=pool)
+
+
+async def close_async_redis() -> None:
+    """
+    애플리케이션 종료 훅: 공유 풀의 연결 정리
+    """
+    for pool in list(_pools.values()):
+        await pool.disconnect()
+    _pools.clear()
+    for sync_pool in list(_sync_pools.values()):
+        sync_pool.disconnect()
+    _sync_pools.clear()
+
+
+async def mget_many(keys: Sequence[str], client: Optional[aioredis.Redis] = None) -> List[Optional[str]]:
+    """
+    여러 키를 파이프라인으로 조회 (PIPELINE_CHUNK_SIZE개씩 MGET, 왕복 1회)
+
+    Args:
+        keys: 조회할 키
+        client: 사용할 클라이언트 (None이면 공유 풀 문자열 클라이언트)
+
+    Returns:
+        키 순서대로 값 (없으면 None)
+    """
+    if not keys:
+        return []
+    client = client or get_async_redis()
+    async with client.pipeline(transaction=False) as pipe:
+        for start in range(0, len(keys), PIPELINE_CHUNK_SIZE):
+            pipe.mget(list(keys[start:start + PIPELINE_CHUNK_SIZE]))
+        chunks = await pipe.execute()
+    return [value for chunk in chunks for value in chunk]
+
+
+async def mset_many(
+    mapping: Dict[str, str],
+    ttl_seconds: Optional[float] = None,
+    client: Optional[aioredis.Redis] = None
+) -> None:
+    """
+    여러 키를 파이프라인으로 저장 (TTL이 있으면 키별 SET PX, 없으면 청크별 MSET)
+
+    Args:
+        mapping: 키 -> 값
+        ttl_seconds: 만료 시간 (초, None이면 만료 없음)
+        client: 사용할 클라이언트 (None이면 공유 풀 문자열 클라이언트)
+    """
+    if not mapping:
+        return
+    client = client or get_async_redis()
+    items = list(mapping.items())
+    async with client.pipeline(transaction=False) as pipe:
+        if ttl_seconds:
+            ttl_ms = max(1, int(ttl_seconds * 1000))
+            for key, value in items:
+                pipe.set(key, value, px=ttl_ms)
+        else:
+            for start in range(0, len(items), PIPELINE_CHUNK_SIZE):
+                pipe.mset(dict(items[start:start + PIPELINE_CHUNK_SIZE]))
+        await pipe.execute()
+
+
+async def compare_and_set(
+    key: str,
+    expected: Optional[str],
+    value: str,
+    ttl_seconds: Optional[float] = None,
+    client: Optional[aioredis.Redis] = None
+) -> bool:
+    """
+    현재 값이 expected와 같을 때만 value로 원자적으로 설정 (Lua 스크립트, EVALSHA 캐시 사용)
+
+    Args:
+        key: 대상 키
+        expected: 기대하는 현재 값 (None이면 키가 없을 때만 설정)
+        value: 새 값
+        ttl_seconds: 설정 시 만료 시간 (초, None이면 만료 없음)
+        client: 사용할 클라이언트 (None이면 공유 풀 문자열 클라이언트)
+
+    Returns:
+        설정 여부
+    """
+    client = client or get_async_redis()
+    ttl_ms = max(1, int(ttl_seconds * 1000)) if ttl_seconds else 0
+    script = client.register_script(_COMPARE_AND_SET)
+    return bool(await script(keys=[key], args=[expected or "", value, ttl_ms]))
+
+
+async def compare_and_delete(key: str, expected: str, client: Optional[aioredis.Redis] = None) -> bool:
+    """
+    현재 값이 expected와 같을 때만 원자적으로 삭제 (잠금 소유자 확인 후 해제)
+
+    Returns:
+        삭제 여부
+    """
+    client = client or get_async_redis()
+    script = client.register_script(_COMPARE_AND_DELETE)
+    return bool(await script(keys=[key], args=[expected]))
+
+
+def compare_and_delete_sync(key: str, expected: str, client: redis.Redis) -> bool:
+    """compare_and_delete의 동기 버전"""
+    script = client.register_script(_COMPARE_AND_DELETE)
+    return bool(script(keys=[key], args=[expected]))
+
+
+async def publish(channel: str, message: str, client: Optional[aioredis.Redis] = None) -> int:
+    """
+    채널에 메시지 발행
+
+    Returns:
+        메시지를 받은 구독자 수
+    """
+    client = client or get_async_redis()
+    return await client.publish(channel, message)
+
+
+async def subscribe(*channels: str, client: Optional[aioredis.Redis] = None) -> AsyncIterator[Dict]:
+    """
+    채널 구독 (async for로 메시지 수신, 반복을 멈추면 구독 해제 후 연결 반환)
+
+    Args:
+        channels: 구독할 채널 (패턴은 "*" 포함 시 PSUBSCRIBE)
+
+    Yields:
+        {"channel": 채널, "data": 메시지} (구독 확인 메시지는 제외)
+    """
+    client = client or get_async_redis()
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    patterns = [c for c in channels if "*" in c]
+    names = [c for c in channels if "*" not in c]
+    try:
+        if names:
+            await pubsub.subscribe(*names)
+        if patterns:
+            await pubsub.psubscribe(*patterns)
+        async for message in pubsub.listen():
+            if message is None or message.get("type") not in ("message", "pmessage"):
+                continue
+            yield {"channel": message["channel"], "data": message["data"]}
+    finally:
+        await pubsub.aclose()